@@ -0,0 +1,141 @@
+"""
+Asyncio support for the web app: one event loop per process, on a background thread, that request
+handlers hand their I/O to.
+
+gather_io() awaits independent blocking calls (Supabase queries, CSV reads) concurrently on the
+loop's executor, so a handler that needs three queries waits for the slowest instead of the sum.
+BackgroundJobs runs long operations (CSV sync) as loop tasks that outlive the request, so a slow
+upload no longer holds a request worker. Blocking calls run in a copy of the caller's context,
+which keeps request phase timing (request_metrics.add_phase) attributed to the request.
+"""
+import asyncio
+import contextvars
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+IO_THREADS = int(os.environ.get("IO_THREADS", "32"))
+# IO_FANOUT=0 awaits gathered calls one after another (the old serial behaviour, for benchmarks)
+FANOUT = os.environ.get("IO_FANOUT", "1") != "0"
+
+_loop = None
+_loop_thread = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The process-wide I/O loop, started on first use."""
+    global _loop, _loop_thread
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                loop.set_default_executor(ThreadPoolExecutor(IO_THREADS, thread_name_prefix="io"))
+                _loop_thread = threading.Thread(target=loop.run_forever, name="io-loop", daemon=True)
+                _loop_thread.start()
+                _loop = loop
+    return _loop
+
+
+def run(coro, timeout: float = None):
+    """Run a coroutine on the I/O loop from synchronous code and return its result."""
+    loop = get_loop()
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError("aio.run() called from the I/O loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+
+async def to_thread(fn, *args):
+    """Await a blocking call on the loop's executor, in a copy of the current context."""
+    ctx = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(None, lambda: ctx.run(fn, *args))
+
+
+async def gather(calls):
+    """
+    Await zero-argument blocking callables concurrently (one after another when FANOUT is off) and
+    return their results in order; the first exception is raised once all have finished.
+    """
+    if not FANOUT:
+        return [await to_thread(call) for call in calls]
+    results = await asyncio.gather(*(to_thread(call) for call in calls), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+def gather_io(*calls) -> list:
+    """gather() from synchronous code: run independent blocking calls concurrently, results in order."""
+    if len(calls) < 2:
+        return [call() for call in calls]
+    return run(gather(calls))
+
+
+class JobBusy(Exception):
+    """A job is running for the key and cannot serve this request (see BackgroundJobs.start)."""
+
+    def __init__(self, job: dict):
+        super().__init__("A job is already running")
+        self.job = job
+
+
+class BackgroundJobs:
+    """
+    Long operations keyed by (kind, owner), run as tasks on the I/O loop. Starting a key that is
+    already running joins that job instead of running it twice; the last job per key is kept so its
+    result can be fetched after the request that started it has returned.
+    """
+
+    def __init__(self):
+        self._jobs = {}  # key -> job dict
+        self._futures = {}  # key -> concurrent.futures.Future of the running job
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def start(self, key, make_coro, info: dict = None, joins=None) -> dict:
+        """
+        Start make_coro() (or join the running job for key); returns the job snapshot, which includes
+        `info`. joins(running job snapshot) decides whether a running job also serves this request
+        (default: always); when it does not, JobBusy is raised and nothing is started.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job["state"] == "running":
+                if joins is not None and not joins(dict(job)):
+                    raise JobBusy(dict(job))
+                return dict(job)
+            job = {"id": next(self._ids), "state": "running", "started_at": time.time(), "finished_at": None,
+                   "result": None, **(info or {})}
+            self._jobs[key] = job
+            self._futures[key] = asyncio.run_coroutine_threadsafe(self._run(job, make_coro), get_loop())
+            return dict(job)
+
+    async def _run(self, job: dict, make_coro) -> None:
+        try:
+            result, state = await make_coro(), "done"
+        except Exception as e:
+            result, state = {"error": str(e)}, "failed"
+        with self._lock:
+            job.update(state=state, result=result, finished_at=time.time())
+
+    def wait(self, key, timeout: float = None):
+        """Wait up to timeout seconds (None: until done) for the job of key; returns its snapshot."""
+        with self._lock:
+            future = self._futures.get(key)
+        if future is not None:
+            try:
+                future.result(timeout)
+            except Exception:
+                # Timeouts leave the job running; job failures are recorded on the job itself
+                pass
+        return self.get(key)
+
+    def get(self, key):
+        """Snapshot of the last job for key, or None."""
+        with self._lock:
+            job = self._jobs.get(key)
+            return dict(job) if job is not None else None
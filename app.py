@@ -3,47 +3,190 @@ Web app for LinkedIn Auto Job Applier: form-based config and pipeline start/stop
 Supports Google sign-in via Supabase; config and applied jobs stored per user.
 """
 import os
+import atexit
+import copy
+import functools
 import json
-import csv
-import subprocess
-import sys
-import signal
+import threading
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, abort, request, jsonify
 from flask_cors import CORS
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
+# Vercel injects the project's environment variables; .env is only for local runs
+if os.environ.get("VERCEL") != "1":
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
 
 from config_io import (
     read_config_from_reference,
-    write_all_config,
     get_default_config,
     REFERENCE_DIR,
 )
-from auth_supabase import get_user_id_from_request, require_auth
-from supabase_client import get_supabase
+from auth_supabase import LOCAL_USER, get_user_id_from_request, query_token, token_rejected, get_auth_metrics
+from file_cache import file_cache
+from static_assets import StaticAssets
+import request_metrics
+from config_store import ConfigReadCache, ConfigWriteBehind, ConfigConflict, merge_sections, serialize_config
+from config_schema import ConfigError, field_types, validate_patch
 
 app = Flask(__name__, static_folder="static", static_url_path="")
 CORS(app)
 
+# Per-route latency, phase split and error counts for /metrics; PROFILE_SLOW_MS enables the sampling profiler
+_metrics = request_metrics.RequestMetrics()
+_profiler = None
+if os.environ.get("PROFILE_SLOW_MS"):
+    _profiler = request_metrics.SlowRequestProfiler(
+        float(os.environ["PROFILE_SLOW_MS"]),
+        float(os.environ.get("PROFILE_INTERVAL_MS", "5")),
+        os.environ.get("PROFILE_DIR") or ("/tmp/profiles" if os.environ.get("VERCEL") == "1" else "profiles"),
+    )
+request_metrics.init_app(app, _metrics, _profiler)
+
 # On Vercel, filesystem is read-only except /tmp; pipeline (subprocess) is not available
 IS_VERCEL = os.environ.get("VERCEL") == "1"
 CONFIG_JSON = os.path.join("/tmp" if IS_VERCEL else os.path.dirname(os.path.abspath(__file__)), "config.json")
 APPLIED_CSV = os.path.join(REFERENCE_DIR, "all excels", "all_applied_applications_history.csv")
-
-# Global subprocess handle for the bot (one at a time; not used on Vercel)
-_bot_process = None
+FAILED_CSV = os.path.join(REFERENCE_DIR, "all excels", "all_failed_applications_history.csv")
+# Per-user CSV sync watermarks (byte offset, inode, tail hash)
+SYNC_STATE_JSON = os.path.join(os.path.dirname(CONFIG_JSON), "sync_state.json")
+_sync_state = None
+# Seconds a sync request waits for its background job before answering 202. Serverless instances
+# may be frozen once the response is sent, so Vercel always waits for the sync to finish.
+SYNC_WAIT = float(os.environ.get("SYNC_WAIT", "25"))
+_sync_jobs = None
+# Where per-user config and job histories live: "supabase" (the hosted tables) or "sqlite" (one local
+# file at SQLITE_PATH, indexed like supabase/schema.sql). With sqlite, the signed-out dashboard keeps
+# its config and job histories in the same database, as the user LOCAL_USER (auth_supabase).
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "supabase").lower()
+SQLITE_PATH = os.environ.get("SQLITE_PATH") or os.path.join(os.path.dirname(CONFIG_JSON), "app.db")
+_storage = None
+
+# Per-user bot runs (isolated workdirs, concurrency cap, FIFO queue); not used on Vercel
+WORKDIRS_DIR = os.environ.get("PIPELINE_WORKDIRS") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "workdirs")
+_scheduler = None
+_lazy_lock = threading.Lock()
+# index.html plus hashed, precompressed app.css/app.js
+_static = StaticAssets(app.static_folder)
+# Seconds between SSE keep-alive comments on the log and state streams
+SSE_HEARTBEAT = 15
+# Upper bound for ?wait= on the long-poll status endpoint
+STATUS_MAX_WAIT = 60
+
+
+# Route-specific modules (Supabase client, CSV sync, export, pipeline) are imported on first use so a
+# serverless cold start only pays for Flask and the config helpers.
+
+def get_supabase():
+    """Shared Supabase client, or None when not configured; raises SupabaseUnavailable (see supabase_client.get_supabase)."""
+    from supabase_client import get_supabase as _get_supabase
+    return _get_supabase()
+
+
+def get_storage():
+    """
+    Per-user storage (storage.Storage) for STORAGE_BACKEND, or None when Supabase is not configured.
+    Raises supabase_client.SupabaseUnavailable while Supabase is configured but unreachable.
+    """
+    global _storage
+    if STORAGE_BACKEND == "sqlite":
+        if _storage is None:
+            with _lazy_lock:
+                if _storage is None:
+                    from storage_sqlite import SQLiteStorage
+                    _storage = SQLiteStorage(SQLITE_PATH)
+        return _storage
+    sb = get_supabase()
+    if not sb:
+        return None
+    from storage_supabase import SupabaseStorage
+    return SupabaseStorage(sb)
+
+
+def _error_response(e: Exception):
+    """JSON error for a failed request: 503 while Supabase is unavailable (retry later), else 500."""
+    from supabase_client import SupabaseUnavailable
+    return jsonify({"error": str(e)}), 503 if isinstance(e, SupabaseUnavailable) else 500
+
+
+def _reject_token():
+    """Abort the request with a 401: it presented a token that failed verification (e.g. expired)."""
+    abort(Response(json.dumps({"error": "Unauthorized", "message": "Invalid or expired token"}), 401,
+                   mimetype="application/json"))
+
+
+def _request_user(storage: bool = False):
+    """
+    Who this request acts as: the signed-in user, else LOCAL_USER. For storage (config and job
+    histories) signed-out requests only have a user with sqlite storage, and get None otherwise (they
+    use the reference files). A token that fails verification (e.g. expired) is answered 401 rather
+    than treated as signed out; call this outside the route's error handling, so it stays a 401.
+    """
+    user_id = get_user_id_from_request()
+    if user_id:
+        return user_id
+    if token_rejected():
+        _reject_token()
+    if storage and STORAGE_BACKEND != "sqlite":
+        return None
+    return LOCAL_USER
+
+
+def _require_storage_user(f):
+    """Like require_auth, but with sqlite storage a signed-out request acts as LOCAL_USER."""
+    @functools.wraps(f)
+    def wrapped(*args, **kwargs):
+        user_id = _request_user(storage=True)
+        if not user_id:
+            return jsonify({"error": "Unauthorized", "message": "Sign in required"}), 401
+        return f(user_id, *args, **kwargs)
+    return wrapped
+
+
+def _get_sync_state():
+    global _sync_state
+    if _sync_state is None:
+        with _lazy_lock:
+            if _sync_state is None:
+                from csv_tail import SyncStateStore
+                _sync_state = SyncStateStore(SYNC_STATE_JSON)
+    return _sync_state
+
+
+def _get_sync_jobs():
+    global _sync_jobs
+    if _sync_jobs is None:
+        with _lazy_lock:
+            if _sync_jobs is None:
+                from aio import BackgroundJobs
+                _sync_jobs = BackgroundJobs()
+    return _sync_jobs
+
+
+def _get_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        with _lazy_lock:
+            if _scheduler is None:
+                from pipeline_scheduler import PipelineScheduler
+                # No bot runs on Vercel, so no standby interpreter either
+                _scheduler = PipelineScheduler(REFERENCE_DIR, WORKDIRS_DIR, warm_start=False if IS_VERCEL else None)
+    return _scheduler
+
+
+def _read_json(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
 
 
 def _load_config() -> dict:
     if os.path.exists(CONFIG_JSON):
         try:
-            with open(CONFIG_JSON, "r", encoding="utf-8") as f:
-                return json.load(f)
+            # Callers merge into the result, so hand out a copy of the cached dict
+            return copy.deepcopy(file_cache.get(CONFIG_JSON, _read_json))
         except Exception:
             pass
     if IS_VERCEL or not os.path.isdir(REFERENCE_DIR):
@@ -52,260 +195,697 @@ def _load_config() -> dict:
 
 
 def _save_config(data: dict) -> None:
-    with open(CONFIG_JSON, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    try:
+        with request_metrics.timed("disk"), open(CONFIG_JSON, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+    finally:
+        file_cache.invalidate(CONFIG_JSON)
 
 
 @app.route("/")
 def index():
-    return send_from_directory(app.static_folder, "index.html")
+    """Dashboard shell (revalidated on each load; assets it links are hashed and cached for good)."""
+    return _static.shell_response()
+
+
+@app.route("/assets/<name>")
+def hashed_asset(name):
+    return _static.asset_response(name)
+
+
+def _fetch_config_row(user_id: str):
+    """(config, version) stored for user_id; (None, None) if there is no row."""
+    storage = get_storage()
+    if not storage:
+        return None, None
+    config, version = storage.fetch_config(user_id)
+    if config is None and user_id == LOCAL_USER:
+        # First use of sqlite storage signed out: start from config.json / the reference config
+        return _load_config(), None
+    return config, version
+
+
+def _cached_config_for_user(user_id: str):
+    """
+    (config, version, body, etag) for user_id: unflushed edits first, then the read cache, then
+    storage (defaults when there is no row). The config dict may be shared; do not mutate it.
+    Storage errors (e.g. SupabaseUnavailable) propagate rather than being answered with defaults.
+    """
+    pending = _config_writes.pending(user_id)
+    if pending:
+        return (*pending, *serialize_config(pending[0]))
+    cached = _config_cache.get(user_id)
+    if cached:
+        return cached
+    config, version = _fetch_config_row(user_id)
+    if version is None:
+        # No stored row: defaults (or the local file) are served but not cached, so the stored
+        # config shows up as soon as there is one
+        config = config or get_default_config()
+        return (config, 0, *serialize_config(config))
+    return _config_cache.put(user_id, config, version)
 
 
 def _get_config_for_user(user_id: str) -> dict:
-    """Load config from Supabase for user_id."""
-    sb = get_supabase()
-    if not sb:
-        return get_default_config()
-    try:
-        r = sb.table("user_config").select("config").eq("user_id", user_id).execute()
-        if r.data and len(r.data) > 0 and r.data[0].get("config"):
-            return r.data[0]["config"]
-    except Exception:
-        pass
-    return get_default_config()
+    """Load config for user_id."""
+    return copy.deepcopy(_cached_config_for_user(user_id)[0])
 
 
-def _upsert_config_for_user(user_id: str, config: dict) -> None:
-    """Save config to Supabase for user_id."""
-    from datetime import datetime, timezone
-    sb = get_supabase()
-    if not sb:
+def _upsert_config_for_user(user_id: str, config: dict, base_version=None, new_version: int = 1) -> None:
+    """
+    Save config to storage for user_id, only if the stored row is still at base_version (no row when
+    None). Raises ConfigConflict when another writer got there first.
+    """
+    storage = get_storage()
+    if not storage:
         return
     try:
-        sb.table("user_config").upsert(
-            {"user_id": user_id, "config": config, "updated_at": datetime.now(timezone.utc).isoformat()},
-            on_conflict="user_id",
-        ).execute()
+        storage.store_config(user_id, config, base_version, new_version)
     except Exception:
-        pass
+        _config_cache.invalidate(user_id)
+        raise
+    _config_cache.put(user_id, config, new_version)
+
+
+# Signed-in config reads; entries expire so writes from other instances show up within the TTL
+_config_cache = ConfigReadCache(
+    int(os.environ.get("CONFIG_CACHE_SIZE", "1024")), float(os.environ.get("CONFIG_CACHE_TTL", "30"))
+)
+# Config saves are merged in memory and written to storage at most once per interval per user.
+# Serverless instances may be frozen between requests, so Vercel writes through on every save.
+_config_writes = ConfigWriteBehind(
+    _fetch_config_row,
+    _upsert_config_for_user,
+    get_default_config,
+    interval=0 if IS_VERCEL else float(os.environ.get("CONFIG_FLUSH_INTERVAL", "2")),
+)
+atexit.register(_config_writes.flush_all)
 
 
 @app.route("/api/auth/env", methods=["GET"])
 def auth_env():
-    """Return public Supabase URL and anon key for frontend client (safe to expose)."""
+    """
+    Return public Supabase URL and anon key for frontend client (safe to expose), and the storage
+    backend (with sqlite, signed-out users can sync into the local database too).
+    """
     url = os.environ.get("SUPABASE_URL", "")
     anon = os.environ.get("SUPABASE_ANON_KEY", "")
-    return jsonify({"SUPABASE_URL": url, "SUPABASE_ANON_KEY": anon})
+    return jsonify({"SUPABASE_URL": url, "SUPABASE_ANON_KEY": anon, "STORAGE_BACKEND": STORAGE_BACKEND})
+
+
+def _config_response(body: bytes, etag: str, version=None):
+    """Config JSON with a strong ETag; a bodyless 304 when the client already has it."""
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+    else:
+        resp = Response(body, mimetype="application/json")
+    resp.set_etag(etag)
+    # Per user, and always revalidated
+    resp.headers["Cache-Control"] = "private, no-cache"
+    if version is not None:
+        resp.headers["X-Config-Version"] = str(version)
+    return resp
 
 
 @app.route("/api/config", methods=["GET"])
 def get_config():
-    """Return config: from Supabase if signed in, else from file/reference."""
+    """
+    Return config: from storage if signed in (via the read cache), else from file/reference (from
+    storage as LOCAL_USER with sqlite storage). Honours If-None-Match with a 304.
+    """
+    user_id = _request_user(storage=True)
     try:
-        user_id = get_user_id_from_request()
         if user_id:
-            config = _get_config_for_user(user_id)
-            return jsonify(config)
-        config = _load_config()
-        return jsonify(config)
+            _, version, body, etag = _cached_config_for_user(user_id)
+            return _config_response(body, etag, version)
+        return _config_response(*serialize_config(_load_config()))
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _error_response(e)
+
+
+_CONFIG_SCHEMA = None
+
+
+@app.route("/api/config/schema", methods=["GET"])
+def get_config_schema():
+    """Return the type of every config field ({section: {field: type}}), for building the form."""
+    global _CONFIG_SCHEMA
+    if _CONFIG_SCHEMA is None:
+        _CONFIG_SCHEMA = serialize_config(field_types())
+    return _config_response(*_CONFIG_SCHEMA)
+
+
+def _saved_response(config: dict, version=None):
+    """The saved config with its new ETag (and version), for the client's next If-Match."""
+    body, etag = serialize_config(config)
+    resp = Response(body, mimetype="application/json")
+    resp.set_etag(etag)
+    if version is not None:
+        resp.headers["X-Config-Version"] = str(version)
+    return resp
+
+
+def _precondition_failed(config: dict, version=None):
+    """412 for a save whose If-Match no longer matches: the current config, its ETag and version."""
+    body, etag = serialize_config(config)
+    resp = jsonify({"error": "Config was modified concurrently", "config": config, "version": version})
+    resp.status_code = 412
+    resp.set_etag(etag)
+    if version is not None:
+        resp.headers["X-Config-Version"] = str(version)
+    return resp
 
 
 @app.route("/api/config", methods=["PUT", "POST"])
 def save_config():
-    """Save config: to Supabase if signed in, else to file (merge with existing)."""
+    """
+    Save config: to storage if signed in (or with sqlite storage), else to file (merge with existing).
+    Known fields are coerced to their schema types; invalid values are rejected with a 400 listing them.
+    If-Match with the ETag of GET /api/config makes the save conditional (412 if it changed since);
+    X-Config-Version is informational only.
+    """
+    user_id = _request_user(storage=True)
     try:
-        user_id = get_user_id_from_request()
-        incoming = request.get_json() or {}
+        try:
+            incoming = validate_patch(request.get_json() or {})
+        except ConfigError as e:
+            return jsonify({"error": str(e), "fields": e.errors}), 400
         if user_id:
-            current = _get_config_for_user(user_id)
-            for section in ("personals", "questions", "search", "secrets", "settings"):
-                if section in incoming and isinstance(incoming[section], dict):
-                    current.setdefault(section, {}).update(incoming[section])
-            _upsert_config_for_user(user_id, current)
-            return jsonify(current)
+            try:
+                current, version = _config_writes.apply(user_id, incoming, request.if_match)
+            except ConfigConflict as e:
+                return _precondition_failed(e.current, e.version)
+            return _saved_response(current, version)
         current = _load_config()
-        for section in ("personals", "questions", "search", "secrets", "settings"):
-            if section in incoming and isinstance(incoming[section], dict):
-                current.setdefault(section, {}).update(incoming[section])
+        if request.if_match and not request.if_match.contains(serialize_config(current)[1]):
+            return _precondition_failed(current)
+        current = merge_sections(current, incoming)
         _save_config(current)
-        return jsonify(current)
+        return _saved_response(current)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _error_response(e)
 
 
 @app.route("/api/config/load-from-reference", methods=["POST"])
 def load_from_reference():
-    """Reload config from reference repo. Saves to Supabase if signed in, else to file. On Vercel returns defaults."""
+    """Reload config from reference repo. Saves to storage if signed in, else to file. On Vercel returns defaults."""
+    user_id = _request_user(storage=True)
     try:
         if IS_VERCEL or not os.path.isdir(REFERENCE_DIR):
             config = get_default_config()
         else:
             config = read_config_from_reference()
-        user_id = get_user_id_from_request()
         if user_id:
-            _upsert_config_for_user(user_id, config)
+            # Every section is replaced, so this goes through the same buffer as a regular save
+            _config_writes.apply(user_id, config)
         else:
             _save_config(config)
         return jsonify(config)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _error_response(e)
 
 
 @app.route("/api/applied-jobs", methods=["GET"])
 def get_applied_jobs():
-    """Return applied jobs: from Supabase if signed in, else from reference CSV if present."""
+    """
+    Return one page of jobs (newest first): from storage if signed in (or with sqlite storage), else
+    from the reference CSVs.
+    Query: limit, cursor (from next_cursor), source (applied, failed or all; default applied),
+    q (title/company substring; failure reason for failed attempts), company, date_from, date_to.
+    """
+    from applied_index import parse_query
+    from job_history import history_index
+    try:
+        params = parse_query(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    user_id = _request_user(storage=True)
     try:
-        user_id = get_user_id_from_request()
         if user_id:
-            sb = get_supabase()
-            if sb:
-                r = sb.table("applied_jobs").select(
-                    "job_id, title, company, hr_name, hr_link, job_link, external_job_link, date_applied"
-                ).eq("user_id", user_id).order("created_at", desc=True).execute()
-                jobs = [
-                    {
-                        "Job_ID": row.get("job_id"),
-                        "Title": row.get("title"),
-                        "Company": row.get("company"),
-                        "HR_Name": row.get("hr_name"),
-                        "HR_Link": row.get("hr_link"),
-                        "Job_Link": row.get("job_link"),
-                        "External_Job_link": row.get("external_job_link"),
-                        "Date_Applied": row.get("date_applied"),
-                    }
-                    for row in (r.data or [])
-                ]
-                return jsonify(jobs)
-            return jsonify([])
-        if os.path.exists(APPLIED_CSV):
-            jobs = []
-            with open(APPLIED_CSV, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    jobs.append({
-                        "Job_ID": row.get("Job ID"),
-                        "Title": row.get("Title"),
-                        "Company": row.get("Company"),
-                        "HR_Name": row.get("HR Name"),
-                        "HR_Link": row.get("HR Link"),
-                        "Job_Link": row.get("Job Link"),
-                        "External_Job_link": row.get("External Job link"),
-                        "Date_Applied": row.get("Date Applied"),
-                    })
-            return jsonify(jobs)
-        return jsonify([])
+            storage = get_storage()
+            if storage:
+                page = storage.history_page(user_id, params)
+            else:
+                page = {"jobs": [], "next_cursor": None}
+        else:
+            page = history_index(APPLIED_CSV, FAILED_CSV).query(
+                params["source"], params["limit"], params["cursor"], params["q"], params["company"],
+                params["date_from"], params["date_to"],
+            )
+        page["limit"] = params["limit"]
+        page["source"] = params["source"]
+        return jsonify(page)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _error_response(e)
+
+
+@app.route("/api/job-history/<job_id>", methods=["GET"])
+def get_job_history(job_id):
+    """
+    Whether a job was already attempted: its application and failed attempts, from storage if
+    signed in (or with sqlite storage), else from the in-memory index over the reference CSVs.
+    """
+    from job_history import HISTORIES, history_index
+    job_id = job_id.strip()
+    user_id = _request_user(storage=True)
+    try:
+        if user_id:
+            storage = get_storage()
+            found = storage.job_attempts(user_id, job_id) if storage else {source: [] for source in HISTORIES}
+        else:
+            found = history_index(APPLIED_CSV, FAILED_CSV).attempts(job_id)
+        return jsonify({"job_id": job_id, "attempted": any(found.values()), **found})
+    except Exception as e:
+        return _error_response(e)
+
+
+@app.route("/api/applied-jobs/stats", methods=["GET"])
+def applied_jobs_stats():
+    """
+    Return dashboard aggregates: total, today, this_week, per_day (last ?days=30, zero-filled) and
+    top_companies (?top=10). From the summary tables in storage if signed in (or with sqlite storage),
+    else from incrementally maintained counters over the reference CSV.
+    """
+    from applied_stats import parse_stats_query, summarize, local_stats
+    try:
+        params = parse_stats_query(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    user_id = _request_user(storage=True)
+    try:
+        if user_id:
+            storage = get_storage()
+            if storage:
+                return jsonify(storage.stats(user_id, params["days"], params["top"]))
+            return jsonify(summarize(0, {}, [], params["days"]))
+        return jsonify(local_stats(APPLIED_CSV).summary(params["days"], params["top"]))
+    except Exception as e:
+        return _error_response(e)
+
+
+@app.route("/api/applied-jobs/export", methods=["GET"])
+def export_applied_jobs():
+    """
+    Stream all applied jobs as NDJSON (default) or CSV (?format=csv): from storage if signed in (or
+    with sqlite storage), else from the reference CSV. Gzip-encoded when the client accepts it.
+    """
+    from export_stream import ENCODERS, CONTENT_TYPES, iter_csv_jobs, gzip_stream
+    fmt = (request.args.get("format") or "ndjson").lower()
+    if fmt not in ENCODERS:
+        return jsonify({"error": "format must be ndjson or csv"}), 400
+    user_id = _request_user(storage=True)
+    if user_id:
+        try:
+            storage = get_storage()
+        except Exception as e:
+            return _error_response(e)
+        if not storage:
+            return jsonify({"error": "Supabase not configured"}), 503
+        jobs = storage.iter_applied(user_id)
+    elif os.path.exists(APPLIED_CSV):
+        jobs = iter_csv_jobs(APPLIED_CSV)
+    else:
+        jobs = iter(())
+    body = ENCODERS[fmt](jobs)
+    headers = {
+        "Content-Disposition": f"attachment; filename=applied_jobs.{fmt}",
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "no-store",
+    }
+    # quality() honours q-values, so "gzip;q=0" (gzip refused) is not mistaken for acceptance
+    if request.accept_encodings.quality("gzip") > 0:
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    return Response(body, mimetype=CONTENT_TYPES[fmt], headers=headers)
+
+
+def _history_csv_for(user_id: str, reference_csv: str) -> str:
+    """The user's own copy of a bot CSV if they have run the pipeline here, else the shared reference CSV."""
+    path = os.path.join(_get_scheduler().workdir_for(user_id), "all excels", os.path.basename(reference_csv))
+    return path if os.path.exists(path) else reference_csv
+
+
+def _sync_history(storage, user_id: str, source: str, csv_path: str, force_full: bool) -> dict:
+    """
+    Upsert one history's rows appended since this user's last sync; the watermark advances only once
+    they are stored. Raises BulkUpsertError when a Supabase batch could not be written.
+    """
+    from csv_tail import CsvTail
+    from job_history import HISTORIES
+    history = HISTORIES[source]
+    skipped = 0
+
+    def rows(tail):
+        nonlocal skipped
+        for row in tail.rows():
+            record = history.to_record(user_id, row)
+            if record is None:
+                skipped += 1
+                continue
+            yield record
+
+    with CsvTail(csv_path, _get_sync_state().get(user_id, csv_path), force_full=force_full) as tail:
+        result = storage.upsert_history(user_id, source, rows(tail))
+    _get_sync_state().set(user_id, csv_path, tail.watermark)
+    synced = result["rows"]
+    return {
+        "synced": synced,
+        "new": 0 if tail.full else synced,
+        "resynced": synced if tail.full else 0,
+        "skipped": skipped + result["duplicates"],
+        "duplicates": result["duplicates"],
+        "batches": result["batches"],
+        "full_resync": tail.full,
+        "reason": tail.resync_reason,
+    }
+
+
+async def _sync_all(storage, user_id: str, paths: dict, force_full: bool):
+    """Sync every history concurrently; (status code, response body) in the shape of the sync route."""
+    import aio
+    from bulk_upsert import BulkUpsertError
+    sources = list(paths)
+    try:
+        done = await aio.gather([
+            functools.partial(_sync_history, storage, user_id, source, paths[source], force_full) for source in sources
+        ])
+    except BulkUpsertError as e:
+        # Watermarks of failed histories are not advanced, so the next sync retries those rows
+        return 502, {"error": str(e), **e.result}
+    except Exception as e:
+        return 500, {"error": str(e)}
+    results = dict(zip(sources, done))
+    applied = results.get("applied") or {
+        "synced": 0, "new": 0, "resynced": 0, "skipped": 0, "duplicates": 0, "batches": 0,
+        "full_resync": False, "reason": None,
+    }
+    return 200, {**applied, "failed": results.get("failed")}
 
 
 @app.route("/api/applied-jobs/sync", methods=["POST"])
-@require_auth
+@_require_storage_user
 def sync_applied_jobs(user_id):
-    """Read reference CSV and upsert rows into Supabase applied_jobs for this user."""
-    sb = get_supabase()
-    if not sb:
+    """
+    Upsert rows appended to the user's bot CSVs (the reference CSVs for LOCAL_USER, signed out with
+    sqlite storage) since this user's last sync: applications into
+    applied_jobs (reported at the top level) and failed attempts into failed_jobs ("failed").
+    Falls back to a full resync when a CSV was truncated/rotated/rewritten or ?full=1 is passed.
+    The sync runs as a background job (joined if one is already running for this user). The request
+    waits for it up to ?wait= seconds (SYNC_WAIT by default). If it is still running, the reply is
+    202 {job, state} and the result is available from GET on this route. ?full=1 while an incremental
+    sync is running is refused with 409 rather than joined.
+    """
+    try:
+        storage = get_storage()
+    except Exception as e:
+        return _error_response(e)
+    if not storage:
         return jsonify({"error": "Supabase not configured"}), 503
-    if not os.path.exists(APPLIED_CSV):
+    paths = {
+        "applied": _history_csv_for(user_id, APPLIED_CSV),
+        "failed": _history_csv_for(user_id, FAILED_CSV),
+    }
+    paths = {source: path for source, path in paths.items() if os.path.exists(path)}
+    if not paths:
         return jsonify({"error": "No applied jobs file found", "synced": 0}), 404
+    force_full = request.args.get("full") in ("1", "true")
     try:
-        rows = []
-        with open(APPLIED_CSV, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                rows.append({
-                    "user_id": user_id,
-                    "job_id": (row.get("Job ID") or "").strip(),
-                    "title": (row.get("Title") or "").strip(),
-                    "company": (row.get("Company") or "").strip(),
-                    "hr_name": (row.get("HR Name") or "").strip(),
-                    "hr_link": (row.get("HR Link") or "").strip(),
-                    "job_link": (row.get("Job Link") or "").strip(),
-                    "external_job_link": (row.get("External Job link") or "").strip(),
-                    "date_applied": (row.get("Date Applied") or "").strip(),
-                })
-        if not rows:
-            return jsonify({"synced": 0, "message": "CSV empty"})
-        sb.table("applied_jobs").upsert(rows, on_conflict="user_id,job_id").execute()
-        return jsonify({"synced": len(rows)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        wait = float(request.args["wait"]) if "wait" in request.args else SYNC_WAIT
+    except ValueError:
+        return jsonify({"error": "wait must be a number of seconds"}), 400
+    from aio import JobBusy
+    key = ("sync", user_id)
+    jobs = _get_sync_jobs()
+    try:
+        # A full resync request is only served by a running full resync, never by an incremental one
+        jobs.start(key, lambda: _sync_all(storage, user_id, paths, force_full), {"full": force_full},
+                   joins=lambda running: running["full"] or not force_full)
+    except JobBusy as e:
+        return jsonify({
+            "error": "An incremental sync is running; request the full resync again when it has finished",
+            "job": e.job["id"], "state": "running",
+        }), 409
+    return _sync_job_response(jobs.wait(key, None if IS_VERCEL else wait))
+
+
+@app.route("/api/applied-jobs/sync", methods=["GET"])
+@_require_storage_user
+def sync_applied_jobs_status(user_id):
+    """State of this user's last sync job: running (202), or its result as POST would have returned it."""
+    job = _get_sync_jobs().get(("sync", user_id))
+    if job is None:
+        return jsonify({"state": "idle"}), 404
+    return _sync_job_response(job)
+
+
+def _sync_job_response(job: dict):
+    if job["state"] == "running":
+        return jsonify({"job": job["id"], "state": "running"}), 202
+    if job["state"] == "failed":
+        return jsonify({"job": job["id"], **job["result"]}), 500
+    status, body = job["result"]
+    return jsonify({"job": job["id"], **body}), status
+
+
+@app.route("/api/cache/stats", methods=["GET"])
+def cache_stats():
+    """
+    Return counters for the file cache, the verified-JWT cache, and the config read cache and write
+    buffer, plus the compressed sizes of the static assets.
+    """
+    return jsonify({
+        "files": file_cache.stats(), "jwt": get_auth_metrics(),
+        "config": _config_cache.stats(), "config_writes": _config_writes.stats,
+        "static": _static.stats(),
+    })
+
+
+def _status_response(snapshot: dict):
+    resp = jsonify(snapshot)
+    resp.set_etag(str(snapshot["version"]))
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    Request counts, error counts, per-route latency histograms, auth/supabase/disk/subprocess time and
+    the resource use of running bots (by hashed user id) in Prometheus text format. Requires "Authorization: Bearer $METRICS_TOKEN" when that is set.
+    """
+    token = os.environ.get("METRICS_TOKEN")
+    if token and request.headers.get("Authorization", "") != "Bearer " + token:
+        return jsonify({"error": "Unauthorized"}), 401
+    text = _metrics.render()
+    if _scheduler is not None:
+        # Resource gauges of running bots; the scheduler is not created just to report none
+        text += _scheduler.telemetry.render()
+    return Response(text, mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/api/supabase/metrics", methods=["GET"])
+def supabase_metrics():
+    """Return Supabase circuit breaker state and per table-operation latency."""
+    from supabase_client import get_supabase_metrics
+    return jsonify(get_supabase_metrics())
 
 
 @app.route("/api/pipeline/status", methods=["GET"])
 def pipeline_status():
-    """Return whether the bot is running and optional PID. On Vercel pipeline is never running."""
+    """
+    Return this user's pipeline state (state, running, pid, exit_code, queue_position, version).
+    On Vercel pipeline is never running.
+    Long-poll: pass ?wait=<seconds> with ?version= or If-None-Match; returns 304 if nothing changed in time.
+    """
     if IS_VERCEL:
         return jsonify({"running": False, "vercel": True})
-    global _bot_process
-    if _bot_process is None:
-        return jsonify({"running": False})
-    if _bot_process.poll() is not None:
-        _bot_process = None
-        return jsonify({"running": False})
-    return jsonify({"running": True, "pid": _bot_process.pid})
+    user_id = _request_user()
+    known = request.args.get("version") or (request.headers.get("If-None-Match") or "").strip('W/"')
+    try:
+        wait = min(float(request.args.get("wait", 0)), STATUS_MAX_WAIT)
+    except ValueError:
+        wait = 0
+    state = _get_scheduler().state(user_id)
+    snapshot = _get_scheduler().status(user_id)
+    if known and known.isdigit() and int(known) == snapshot["version"]:
+        if wait > 0:
+            state.wait(int(known), wait)
+            snapshot = _get_scheduler().status(user_id)
+        if snapshot["version"] == int(known):
+            resp = Response(status=304)
+            resp.set_etag(known)
+            return resp
+    return _status_response(snapshot)
+
+
+@app.route("/api/pipeline/events", methods=["GET"])
+@query_token
+def pipeline_events():
+    """Server-Sent Events stream of this user's pipeline state transitions (first event is the current state)."""
+    if IS_VERCEL:
+        return Response(
+            f"event: state\ndata: {json.dumps({'running': False, 'vercel': True})}\n\nevent: end\ndata: {{}}\n\n",
+            mimetype="text/event-stream",
+        )
+    user_id = _request_user()
+    state = _get_scheduler().state(user_id)
+
+    def events():
+        version = None
+        while True:
+            if version is not None:
+                state.wait(version, SSE_HEARTBEAT)
+            snapshot = _get_scheduler().status(user_id)
+            if snapshot["version"] == version:
+                yield ": keep-alive\n\n"
+                continue
+            version = snapshot["version"]
+            yield f"id: {version}\nevent: state\ndata: {json.dumps(snapshot)}\n\n"
+
+    return Response(events(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 @app.route("/api/pipeline/start", methods=["POST"])
 def pipeline_start():
-    """Write config to reference, then start runAiBot.py. On Vercel returns 503 (run locally)."""
+    """
+    Write config into this user's workdir, then start runAiBot.py there, or queue the start when the
+    server is at its concurrency cap. On Vercel returns 503 (run locally).
+    """
     if IS_VERCEL:
         return jsonify({
             "error": "Pipeline cannot run on Vercel. Run the app locally to start/stop the bot.",
             "vercel": True,
         }), 503
-    global _bot_process
-    if _bot_process is not None and _bot_process.poll() is None:
-        return jsonify({"error": "Pipeline already running", "running": True}), 409
+    user_id = _request_user(storage=True)
+    owner = _request_user()
     body = request.get_json() or {}
     config = body.get("config") if isinstance(body.get("config"), dict) else None
+    if user_id:
+        # Persist buffered edits first so storage matches what this run uses, whichever config it gets
+        try:
+            if not _config_writes.flush(user_id, strict=True):
+                return jsonify({"error": "Config is still being saved; try again", "running": False}), 409
+        except ConfigConflict as e:
+            return jsonify({"error": str(e), "running": False}), 409
+        except Exception as e:
+            return _error_response(e)
     if not config:
-        config = _load_config()
-    try:
-        write_all_config(config)
-    except Exception as e:
-        return jsonify({"error": f"Failed to write config: {e}"}), 500
-
-    python = sys.executable
-    run_script = os.path.join(REFERENCE_DIR, "runAiBot.py")
-    if not os.path.exists(run_script):
-        return jsonify({"error": "reference/runAiBot.py not found"}), 500
-
+        try:
+            config = _get_config_for_user(user_id) if user_id else _load_config()
+        except Exception as e:
+            # Never start the bot on default config (and credentials) because storage is unreachable
+            return _error_response(e)
     try:
-        _bot_process = subprocess.Popen(
-            [python, run_script],
-            cwd=REFERENCE_DIR,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == "nt" else 0,
+        snapshot = _get_scheduler().start(owner, config)
+    except RuntimeError as e:
+        return jsonify({"error": str(e), "running": True}), 409
+    if snapshot["state"] == "failed":
+        return jsonify({**snapshot, "error": snapshot.get("error")}), 500
+    if snapshot["state"] == "running":
+        app.logger.info(
+            "Pipeline started for %s (pid %s); config sections rewritten: %s",
+            owner, snapshot.get("pid"), ", ".join(snapshot["config_changed"]) or "none",
         )
-        return jsonify({"running": True, "pid": _bot_process.pid})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return jsonify(snapshot), 202 if snapshot["state"] == "queued" else 200
 
 
 @app.route("/api/pipeline/stop", methods=["POST"])
 def pipeline_stop():
-    """Stop the running bot process."""
-    global _bot_process
-    if _bot_process is None:
+    """Stop this user's running bot, or remove it from the start queue."""
+    if not _get_scheduler().stop(_request_user()):
         return jsonify({"running": False, "message": "No pipeline was running"})
+    return jsonify({"running": False, "state": "stopped", "message": "Pipeline stopped"})
+
+
+@app.route("/api/pipeline/scheduler", methods=["GET"])
+def pipeline_scheduler():
+    """Server-wide concurrency cap and how many bots are running/queued."""
+    return jsonify(_get_scheduler().summary())
+
+
+@app.route("/api/pipeline/runs", methods=["GET"])
+def pipeline_runs():
+    """
+    This user's recent bot runs, newest first: start/stop time, duration, exit code, CPU seconds and
+    peak CPU %, memory, threads and child processes.
+    """
+    telemetry = _get_scheduler().telemetry
+    return jsonify({
+        "sampler": telemetry.reader_name, "interval": telemetry.interval,
+        "runs": telemetry.runs(_request_user()),
+    })
+
+
+@app.route("/api/pipeline/telemetry", methods=["GET"])
+def pipeline_telemetry():
+    """
+    Resource samples of one of this user's runs (?run= id; default the running or most recent one) as
+    rows of [ts, cpu_percent, rss_mb, threads, children]. Poll with ?since=<ts of the last row>.
+    """
+    telemetry = _get_scheduler().telemetry
+    user_id = _request_user()
     try:
-        if os.name == "nt":
-            _bot_process.terminate()
-        else:
-            os.kill(_bot_process.pid, signal.SIGTERM)
-        _bot_process.wait(timeout=10)
-    except subprocess.TimeoutExpired:
-        _bot_process.kill()
-    except Exception:
-        try:
-            _bot_process.kill()
-        except Exception:
-            pass
-    _bot_process = None
-    return jsonify({"running": False, "message": "Pipeline stopped"})
+        since = float(request.args["since"]) if "since" in request.args else None
+        run_id = int(request.args["run"]) if "run" in request.args else None
+    except ValueError:
+        return jsonify({"error": "since and run must be numbers"}), 400
+    run = telemetry.find(user_id, run_id) if run_id is not None else telemetry.latest(user_id)
+    if run is None:
+        return jsonify({"error": "No run found", "sampler": telemetry.reader_name}), 404
+    return jsonify({
+        "sampler": telemetry.reader_name, "interval": telemetry.interval,
+        "run": run.summary(), **run.series(since),
+    })
+
+
+def _log_offset() -> int:
+    """Resume offset from ?offset= or the SSE Last-Event-ID header (the last seq the client saw)."""
+    last_id = request.headers.get("Last-Event-ID")
+    if last_id and last_id.isdigit():
+        return int(last_id) + 1
+    try:
+        return max(0, int(request.args.get("offset", 0)))
+    except ValueError:
+        return 0
+
+
+@app.route("/api/pipeline/logs", methods=["GET"])
+def pipeline_logs():
+    """Return this user's buffered bot output lines from ?offset= (seq), plus next_offset to poll from."""
+    logs = _get_scheduler().logs(_request_user())
+    if logs is None:
+        return jsonify({"lines": [], "next_offset": 0, "dropped": 0, "finished": True})
+    return jsonify(logs.read(_log_offset()))
+
+
+@app.route("/api/pipeline/logs/stream", methods=["GET"])
+@query_token
+def pipeline_logs_stream():
+    """Server-Sent Events stream of this user's bot output; resumes from ?offset= or Last-Event-ID."""
+    logs = _get_scheduler().logs(_request_user())
+    offset = _log_offset()
+
+    def events():
+        nonlocal offset
+        if logs is None:
+            yield "event: end\ndata: {}\n\n"
+            return
+        while True:
+            chunk = logs.read(offset)
+            if chunk["dropped"]:
+                yield f"event: dropped\ndata: {json.dumps({'count': chunk['dropped']})}\n\n"
+            for line in chunk["lines"]:
+                yield f"id: {line['seq']}\ndata: {json.dumps(line)}\n\n"
+            offset = chunk["next_offset"]
+            if chunk["finished"]:
+                yield "event: end\ndata: {}\n\n"
+                return
+            if not chunk["lines"] and not logs.wait(offset, SSE_HEARTBEAT):
+                yield ": keep-alive\n\n"
+
+    return Response(events(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,168 @@
+"""
+Applied-jobs listing helpers: opaque keyset cursors, query parameter parsing, and an in-memory
+index over one of the bot's CSV histories so local pages are served without rescanning the file.
+"""
+import base64
+import bisect
+import json
+from datetime import date, timedelta
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Which history a listing serves: applications, failed attempts, or both merged newest first
+SOURCES = ("applied", "failed", "all")
+
+
+def csv_row_to_job(row: dict) -> dict:
+    """Map a bot CSV row to the API job shape."""
+    return {
+        "Job_ID": row.get("Job ID"),
+        "Title": row.get("Title"),
+        "Company": row.get("Company"),
+        "HR_Name": row.get("HR Name"),
+        "HR_Link": row.get("HR Link"),
+        "Job_Link": row.get("Job Link"),
+        "External_Job_link": row.get("External Job link"),
+        "Date_Applied": row.get("Date Applied"),
+    }
+
+
+def supabase_row_to_job(row: dict) -> dict:
+    """Map an applied_jobs table row to the API job shape."""
+    return {
+        "Job_ID": row.get("job_id"),
+        "Title": row.get("title"),
+        "Company": row.get("company"),
+        "HR_Name": row.get("hr_name"),
+        "HR_Link": row.get("hr_link"),
+        "Job_Link": row.get("job_link"),
+        "External_Job_link": row.get("external_job_link"),
+        "Date_Applied": row.get("date_applied"),
+    }
+
+
+def encode_cursor(data: dict) -> str:
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor from encode_cursor(); raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(data, dict):
+        raise ValueError("Invalid cursor")
+    return data
+
+
+def parse_query(args) -> dict:
+    """
+    Validate listing parameters from request.args.
+    Returns limit, source, cursor (decoded or None), q, company, date_from, date_to (ISO dates or None).
+    Raises ValueError with a user-facing message on bad input.
+    """
+    try:
+        limit = int(args.get("limit") or DEFAULT_PAGE_SIZE)
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    source = (args.get("source") or "applied").strip().lower()
+    if source not in SOURCES:
+        raise ValueError("source must be applied, failed or all")
+    out = {
+        "limit": limit,
+        "source": source,
+        "cursor": decode_cursor(args["cursor"]) if args.get("cursor") else None,
+        "q": (args.get("q") or "").strip() or None,
+        "company": (args.get("company") or "").strip() or None,
+    }
+    for key in ("date_from", "date_to"):
+        value = (args.get(key) or "").strip()
+        if value:
+            try:
+                value = date.fromisoformat(value[:10]).isoformat()
+            except ValueError:
+                raise ValueError(f"{key} must be YYYY-MM-DD")
+        out[key] = value or None
+    return out
+
+
+def next_day(iso_date: str) -> str:
+    """Exclusive upper bound for an inclusive date_to filter."""
+    return (date.fromisoformat(iso_date) + timedelta(days=1)).isoformat()
+
+
+class AppliedJobsIndex:
+    """
+    Jobs from one CSV history, newest (last appended) first; extend() adds rows appended since.
+    Positions are row numbers in file order; a local cursor is the position to continue below.
+    """
+
+    def __init__(self, jobs: list = (), date_key: str = "Date_Applied", text_keys: tuple = ("Title", "Company")):
+        self.date_key = date_key
+        self.text_keys = text_keys
+        self.jobs = []
+        self._text = []
+        self._date = []
+        self._by_company = {}
+        self._by_job = {}
+        self.extend(jobs)
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def extend(self, jobs) -> None:
+        """Append jobs in file order. self.jobs grows last, so concurrent readers never see a partial row."""
+        for job in jobs:
+            pos = len(self.jobs)
+            self._text.append(tuple((job.get(k) or "").lower() for k in self.text_keys))
+            self._date.append((job.get(self.date_key) or "")[:10])
+            company = (job.get("Company") or "").strip().lower()
+            if company:
+                self._by_company.setdefault(company, []).append(pos)
+            job_id = (job.get("Job_ID") or "").strip()
+            if job_id:
+                self._by_job.setdefault(job_id, []).append(pos)
+            self.jobs.append(job)
+
+    def find(self, job_id: str) -> list:
+        """Every row for a job_id, in file order."""
+        return [self.jobs[pos] for pos in self._by_job.get(job_id.strip(), ()) if pos < len(self.jobs)]
+
+    def _candidates(self, before: int, company: str):
+        """Positions below `before`, newest first, narrowed by company when given."""
+        if company is None:
+            return range(before - 1, -1, -1)
+        positions = self._by_company.get(company.lower(), [])
+        return reversed(positions[:bisect.bisect_left(positions, before)])
+
+    def matches(self, before: int, q: str = None, company: str = None, date_from: str = None, date_to: str = None):
+        """Positions below `before` that pass the filters, newest first."""
+        needle = q.lower() if q else None
+        for pos in self._candidates(before, company):
+            if needle and not any(needle in text for text in self._text[pos]):
+                continue
+            d = self._date[pos]
+            if (date_from and d < date_from) or (date_to and d > date_to):
+                continue
+            yield pos
+
+    def query(self, limit: int, cursor: dict = None, q: str = None, company: str = None,
+              date_from: str = None, date_to: str = None) -> dict:
+        before = len(self.jobs)
+        if cursor is not None:
+            before = min(int(cursor.get("p", before)), before)
+        page = []
+        next_pos = None
+        for pos in self.matches(before, q, company, date_from, date_to):
+            if len(page) == limit:
+                next_pos = page[-1]
+                break
+            page.append(pos)
+        return {
+            "jobs": [self.jobs[p] for p in page],
+            "next_cursor": encode_cursor({"p": next_pos}) if next_pos is not None else None,
+        }
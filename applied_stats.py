@@ -0,0 +1,140 @@
+"""
+Aggregates for the applied-jobs dashboard: applications per day, top companies, totals.
+Local mode keeps counters per CSV and feeds them only the rows appended since the last read
+(CsvTail watermark), so serving stats never rescans the history. In Supabase the same counters
+live in summary tables maintained by triggers on applied_jobs (see supabase/schema.sql).
+"""
+import re
+import threading
+from collections import Counter
+from datetime import date, timedelta
+
+from csv_tail import CsvTail
+
+DEFAULT_DAYS = 30
+MAX_DAYS = 366
+DEFAULT_TOP = 10
+MAX_TOP = 100
+
+_DAY = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+def applied_day(value: str):
+    """ISO day of a 'YYYY-MM-DD ...' Date Applied value, or None if it has no valid date."""
+    value = (value or "").strip()
+    if not _DAY.match(value):
+        return None
+    try:
+        return date.fromisoformat(value[:10]).isoformat()
+    except ValueError:
+        return None
+
+
+def parse_stats_query(args) -> dict:
+    """days (window of per-day counts) and top (number of companies). Raises ValueError."""
+    try:
+        days = int(args.get("days") or DEFAULT_DAYS)
+        top = int(args.get("top") or DEFAULT_TOP)
+    except ValueError:
+        raise ValueError("days and top must be integers")
+    if days < 1 or top < 1:
+        raise ValueError("days and top must be positive")
+    return {"days": min(days, MAX_DAYS), "top": min(top, MAX_TOP)}
+
+
+def window_start(days: int, today: date = None) -> date:
+    """First day whose count is needed: the start of the per-day window or of this week, if earlier."""
+    today = today or date.today()
+    return min(today - timedelta(days=days - 1), today - timedelta(days=today.weekday()))
+
+
+def summarize(total: int, per_day: dict, top_companies: list, days: int, today: date = None) -> dict:
+    """
+    Response shape shared by both backends. per_day maps ISO day -> count (days outside the window
+    are ignored); top_companies is [(company, count)] already ordered by count.
+    """
+    today = today or date.today()
+    week_start = today - timedelta(days=today.weekday())
+    window = [(today - timedelta(days=i)).isoformat() for i in range(days - 1, -1, -1)]
+    return {
+        "total": total,
+        "today": per_day.get(today.isoformat(), 0),
+        "this_week": sum(per_day.get((week_start + timedelta(days=i)).isoformat(), 0)
+                         for i in range(today.weekday() + 1)),
+        "per_day": [{"date": d, "count": per_day.get(d, 0)} for d in window],
+        "top_companies": [{"company": c, "count": n} for c, n in top_companies],
+    }
+
+
+class AppliedStats:
+    """
+    Counters over bot CSV rows (dicts keyed by the CSV header), one per Job ID like the stored
+    histories (unique on user_id, job_id): a repeated Job ID is skipped, the first row wins, as
+    bulk_upsert.unique_batches does within a sync.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.duplicates = 0
+        self.per_day = Counter()
+        self.per_company = Counter()
+        self._job_ids = set()
+
+    def add(self, row: dict) -> None:
+        job_id = (row.get("Job ID") or "").strip()
+        if not job_id:
+            return
+        if job_id in self._job_ids:
+            self.duplicates += 1
+            return
+        self._job_ids.add(job_id)
+        self.total += 1
+        day = applied_day(row.get("Date Applied"))
+        if day:
+            self.per_day[day] += 1
+        company = (row.get("Company") or "").strip()
+        if company:
+            self.per_company[company] += 1
+
+    def summary(self, days: int = DEFAULT_DAYS, top: int = DEFAULT_TOP, today: date = None) -> dict:
+        return summarize(self.total, self.per_day, self.per_company.most_common(top), days, today)
+
+
+class LocalStatsTracker:
+    """AppliedStats for one CSV, brought up to date with only the appended rows on each refresh()."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.stats = AppliedStats()
+        self._watermark = None
+        self._lock = threading.Lock()
+
+    def summary(self, days: int = DEFAULT_DAYS, top: int = DEFAULT_TOP) -> dict:
+        with self._lock:
+            self._refresh()
+            return self.stats.summary(days, top)
+
+    def _refresh(self) -> None:
+        try:
+            tail = CsvTail(self.path, self._watermark)
+        except FileNotFoundError:
+            self.stats, self._watermark = AppliedStats(), None
+            return
+        with tail:
+            stats = AppliedStats() if tail.full else self.stats
+            for row in tail.rows():
+                stats.add(row)
+            self.stats, self._watermark = stats, tail.watermark
+
+
+_trackers = {}
+_trackers_lock = threading.Lock()
+
+
+def local_stats(path: str) -> LocalStatsTracker:
+    """Process-wide tracker for a CSV path."""
+    with _trackers_lock:
+        tracker = _trackers.get(path)
+        if tracker is None:
+            tracker = _trackers[path] = LocalStatsTracker(path)
+        return tracker
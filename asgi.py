@@ -0,0 +1,19 @@
+"""
+ASGI entry point: the same Flask routes served by an asyncio server, e.g.
+
+    pip install -r requirements-asgi.txt
+    uvicorn asgi:app --workers 2
+
+Connections (keep-alive, slow clients, the SSE streams) are handled by the server's event loop
+instead of one WSGI thread each; every request still runs in a worker thread, and hands its
+independent Supabase calls and CSV syncs to the app's I/O loop (aio.py) as it does under WSGI.
+"""
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError as e:
+    # Optional: the WSGI app (python app.py, Vercel) does not need it
+    raise ImportError("ASGI mode needs asgiref and an ASGI server: pip install -r requirements-asgi.txt") from e
+
+from app import app as flask_app
+
+app = WsgiToAsgi(flask_app)
@@ -1,32 +1,88 @@
 """
 Supabase JWT verification and user id extraction for API routes.
 """
+import hashlib
 import os
-import jwt
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
-from flask import request, jsonify
+from flask import current_app, g, request, jsonify
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
+from request_metrics import add_phase
+
+if os.environ.get("VERCEL") != "1":
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
 
 SUPABASE_JWT_SECRET = os.environ.get("SUPABASE_JWT_SECRET")
+# Who signed-out requests act as: the shared local pipeline slot (the reference repo), and with sqlite
+# storage the owner of the local config and job histories
+LOCAL_USER = "local"
 
+# Verified tokens: sha256(token) -> (sub, exp). Entries are only trusted until the token's exp.
+JWT_CACHE_SIZE = int(os.environ.get("JWT_CACHE_SIZE", "1024"))
+# How long to trust a verified token that carries no exp claim
+JWT_CACHE_TTL_NO_EXP = 60
+_token_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_metrics = {"hits": 0, "misses": 0, "rejected": 0, "verify_count": 0, "verify_seconds": 0.0}
+_NOT_SET = object()
 
-def get_user_id_from_request():
+
+def _token_from_request():
     """
-    Read Authorization: Bearer <token>, verify Supabase JWT, return user id (uuid) or None.
+    Bearer token from the Authorization header, or ?access_token= on GET routes marked with
+    query_token (EventSource streams, which cannot set headers). Anywhere else a query token is
+    ignored, so tokens stay out of access logs and Referer headers of regular and state-changing calls.
     """
-    if not SUPABASE_JWT_SECRET:
-        return None
     auth = request.headers.get("Authorization")
-    if not auth or not auth.startswith("Bearer "):
+    if auth and auth.startswith("Bearer "):
+        return auth[7:].strip() or None
+    if request.method != "GET" or not getattr(current_app.view_functions.get(request.endpoint), "query_token", False):
         return None
-    token = auth[7:].strip()
+    return (request.args.get("access_token") or "").strip() or None
+
+
+def get_user_id_from_request():
+    """
+    Read Authorization: Bearer <token>, verify Supabase JWT, return user id (uuid) or None.
+    Memoized per request on flask.g; verified tokens are cached until they expire.
+    """
+    cached = g.get("_auth_user_id", _NOT_SET)
+    if cached is not _NOT_SET:
+        return cached
+    user_id = _user_id_for_token(_token_from_request()) if SUPABASE_JWT_SECRET else None
+    g._auth_user_id = user_id
+    return user_id
+
+
+def token_rejected() -> bool:
+    """True when the request presents a token that fails verification (invalid or expired)."""
+    return bool(SUPABASE_JWT_SECRET) and _token_from_request() is not None and get_user_id_from_request() is None
+
+
+def _user_id_for_token(token):
+    """Return the token's sub, from the verified-token cache when possible; None if missing/invalid/expired."""
     if not token:
         return None
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    now = time.time()
+    with _cache_lock:
+        entry = _token_cache.get(digest)
+        if entry is not None:
+            if entry[1] > now:
+                _token_cache.move_to_end(digest)
+                _metrics["hits"] += 1
+                return entry[0]
+            del _token_cache[digest]
+        _metrics["misses"] += 1
+    # Imported on first verification so routes without auth do not pay for PyJWT at cold start
+    import jwt
+    t0 = time.perf_counter()
     try:
         payload = jwt.decode(
             token,
@@ -35,9 +91,38 @@ def get_user_id_from_request():
             audience="authenticated",
             options={"verify_aud": False},
         )
-        return payload.get("sub")
     except Exception:
-        return None
+        payload = None
+    elapsed = time.perf_counter() - t0
+    add_phase("auth", elapsed)
+    with _cache_lock:
+        _metrics["verify_count"] += 1
+        _metrics["verify_seconds"] += elapsed
+        if payload is None or not payload.get("sub"):
+            _metrics["rejected"] += 1
+            return None
+        exp = payload.get("exp")
+        expires = float(exp) if isinstance(exp, (int, float)) else now + JWT_CACHE_TTL_NO_EXP
+        _token_cache[digest] = (payload["sub"], expires)
+        _token_cache.move_to_end(digest)
+        while len(_token_cache) > JWT_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return payload["sub"]
+
+
+def get_auth_metrics() -> dict:
+    """Verified-token cache counters and JWT verification latency."""
+    with _cache_lock:
+        m = dict(_metrics)
+        m["entries"] = len(_token_cache)
+    m["verify_avg_ms"] = round(m["verify_seconds"] * 1000 / m["verify_count"], 4) if m["verify_count"] else 0.0
+    return m
+
+
+def query_token(f):
+    """Decorator (below @app.route): also accept the token as ?access_token= on this GET route."""
+    f.query_token = True
+    return f
 
 
 def require_auth(f):
@@ -0,0 +1,245 @@
+"""
+Benchmark: end-to-end API throughput and latency, fully offline.
+
+Runs app.app in-process (one Flask test client per worker thread) against each storage backend:
+"supabase" is FakeSupabase, wrapped in the same instrumented client the app uses, and "sqlite" is a
+fresh SQLite database in the temp dir. Each size gets a synthetic all_applied_applications_history.csv
+(plus a failed-attempts history a tenth its size). Each scenario is driven at the given concurrency.
+The output is JSON with throughput, p50/p99 latency and peak RSS for each (rows, backend, scenario),
+so runs can be diffed for regressions.
+
+    python benchmarks/bench_api.py [--rows 1000,100000] [--backends supabase,sqlite] [--concurrency 8]
+                                   [--requests 500] [--latency 0.005] [--scenarios config_get,applied_jobs_local]
+                                   [--out result.json]
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jwt  # noqa: E402
+
+import app as web  # noqa: E402
+import auth_supabase  # noqa: E402
+from benchmarks.fake_supabase import FakeSupabase  # noqa: E402
+from csv_tail import SyncStateStore  # noqa: E402
+from pipeline_scheduler import PipelineScheduler  # noqa: E402
+from storage import BACKENDS  # noqa: E402
+from storage_sqlite import SQLiteStorage  # noqa: E402
+from supabase_client import _InstrumentedClient  # noqa: E402
+
+CSV_HEADER = ["Job ID", "Title", "Company", "HR Name", "HR Link", "Job Link", "External Job link", "Date Applied"]
+FAILED_CSV_HEADER = ["Job ID", "Job Link", "Resume Tried", "Date listed", "Date Tried", "Assumed Reason", "Stack Trace",
+                     "External Job link", "Screenshot Name"]
+JWT_SECRET = "bench-secret-" + "x" * 32
+
+
+def write_history_csv(path: str, n: int) -> None:
+    """Write n synthetic applications, oldest first, like the bot appends them."""
+    start = datetime(2024, 1, 1, 9, 0, 0)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(CSV_HEADER)
+        for i in range(n):
+            job_id = 4000000000 + i
+            w.writerow([
+                job_id,
+                f"Software Engineer {i % 97}",
+                f"Company {i % 503}",
+                "",
+                "",
+                f"https://www.linkedin.com/jobs/view/{job_id}",
+                "Easy Applied",
+                (start + timedelta(minutes=7 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+            ])
+
+
+def write_failed_csv(path: str, n: int) -> None:
+    """Write n synthetic failed attempts, interleaved in time with write_history_csv's applications."""
+    start = datetime(2024, 1, 1, 9, 3, 0)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(FAILED_CSV_HEADER)
+        for i in range(n):
+            job_id = 5000000000 + i
+            w.writerow([
+                job_id,
+                f"https://www.linkedin.com/jobs/view/{job_id}",
+                "resume.pdf",
+                "2024-01-01",
+                (start + timedelta(minutes=70 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+                "Could not answer question" if i % 3 else "Timed out",
+                "Traceback (most recent call last):\n  ...",
+                "Easy Applied",
+                f"failed_{i}.png",
+            ])
+
+
+def _token(user_id: str) -> str:
+    return jwt.encode({"sub": user_id, "exp": int(time.time()) + 86400}, JWT_SECRET, algorithm="HS256")
+
+
+# name -> (method, path, signed in, json body)
+SCENARIOS = {
+    "config_get_local": ("GET", "/api/config", False, None),
+    "config_get": ("GET", "/api/config", True, None),
+    "config_put": ("PUT", "/api/config", True, {"personals": {"current_city": "Bench City"}}),
+    "applied_jobs_local": ("GET", "/api/applied-jobs?limit=50", False, None),
+    "applied_jobs_local_search": ("GET", "/api/applied-jobs?limit=50&q=Engineer%207", False, None),
+    "applied_jobs_stats_local": ("GET", "/api/applied-jobs/stats", False, None),
+    "history_local_all": ("GET", "/api/applied-jobs?limit=50&source=all", False, None),
+    "job_lookup_local": ("GET", "/api/job-history/4000000007", False, None),
+    "sync_full": ("POST", "/api/applied-jobs/sync?full=1", True, None),
+    "sync_noop": ("POST", "/api/applied-jobs/sync", True, None),
+    "applied_jobs": ("GET", "/api/applied-jobs?limit=50", True, None),
+    "applied_jobs_stats": ("GET", "/api/applied-jobs/stats", True, None),
+    "history_all": ("GET", "/api/applied-jobs?limit=50&source=all", True, None),
+    "job_lookup": ("GET", "/api/job-history/4000000007", True, None),
+    "pipeline_status": ("GET", "/api/pipeline/status", False, None),
+}
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * (len(sorted_values) - 1) + 0.5))]
+
+
+def run_scenario(name: str, n: int, concurrency: int, tokens: list, warmup: int) -> dict:
+    method, path, signed_in, body = SCENARIOS[name]
+    local = threading.local()
+
+    def one(i: int):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = web.app.test_client()
+        headers = {"Authorization": "Bearer " + tokens[i % len(tokens)]} if signed_in else {}
+        t0 = time.perf_counter()
+        resp = client.open(path, method=method, headers=headers, json=body)
+        resp.get_data()
+        elapsed = time.perf_counter() - t0
+        resp.close()
+        return elapsed, resp.status_code
+
+    for i in range(warmup):
+        one(i)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        t0 = time.perf_counter()
+        results = list(pool.map(one, range(n)))
+        wall = time.perf_counter() - t0
+    latencies = sorted(r[0] * 1000 for r in results)
+    errors = sum(1 for r in results if r[1] >= 400)
+    return {
+        "scenario": name,
+        "requests": n,
+        "errors": errors,
+        "throughput_rps": round(n / wall, 1),
+        "p50_ms": round(_percentile(latencies, 0.50), 3),
+        "p99_ms": round(_percentile(latencies, 0.99), 3),
+        "mean_ms": round(sum(latencies) / n, 3),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def bench_size(rows: int, backend: str, args, scenarios: list) -> list:
+    tmp = tempfile.mkdtemp(prefix=f"bench-api-{rows}-{backend}-")
+    reference = os.path.join(tmp, "reference")
+    os.makedirs(os.path.join(reference, "all excels"))
+    csv_path = os.path.join(reference, "all excels", "all_applied_applications_history.csv")
+    failed_path = os.path.join(reference, "all excels", "all_failed_applications_history.csv")
+    t0 = time.perf_counter()
+    write_history_csv(csv_path, rows)
+    # Roughly one failed attempt per ten applications
+    write_failed_csv(failed_path, rows // 10)
+    generated = time.perf_counter() - t0
+
+    fake = _InstrumentedClient(FakeSupabase(latency=args.latency))
+    web.get_supabase = lambda: fake
+    web.STORAGE_BACKEND = backend
+    web._storage = SQLiteStorage(os.path.join(tmp, "app.db")) if backend == "sqlite" else None
+    web._config_cache.invalidate()
+    web.APPLIED_CSV = csv_path
+    web.FAILED_CSV = failed_path
+    web.CONFIG_JSON = os.path.join(tmp, "config.json")
+    web._sync_state = SyncStateStore(os.path.join(tmp, "sync_state.json"))
+    web._scheduler = PipelineScheduler(reference, os.path.join(tmp, "workdirs"))
+    users = [f"00000000-0000-0000-0000-{rows:06d}{i:06d}" for i in range(args.users or args.concurrency)]
+    tokens = [_token(u) for u in users]
+
+    results = []
+    for name in scenarios:
+        if name == "sync_full":
+            # One full import per user; later scenarios read what it stored
+            result = run_scenario(name, len(tokens), args.concurrency, tokens, 0)
+        else:
+            result = run_scenario(name, args.requests, args.concurrency, tokens, args.warmup)
+        result.update({"rows": rows, "backend": backend, "csv_seconds": round(generated, 3)})
+        results.append(result)
+        print(f"{rows:>8} rows  {backend:<8} {name:<26} {result['throughput_rps']:>9} req/s  "
+              f"p50 {result['p50_ms']:>8} ms  p99 {result['p99_ms']:>8} ms", file=sys.stderr)
+    web._config_writes.flush_all()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="1000,100000", help="comma-separated CSV sizes, e.g. 1000,100000,1000000")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--users", type=int, default=0, help="distinct signed-in users (default: concurrency)")
+    parser.add_argument("--backends", default="supabase", help="comma-separated storage backends: " + ", ".join(BACKENDS))
+    parser.add_argument("--latency", type=float, default=0.005, help="seconds per simulated Supabase call")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed requests before each scenario")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error("unknown scenarios: " + ", ".join(unknown))
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    if any(b not in BACKENDS for b in backends):
+        parser.error("backends must be among: " + ", ".join(BACKENDS))
+    auth_supabase.SUPABASE_JWT_SECRET = JWT_SECRET
+    web.app.logger.disabled = True
+
+    results = []
+    for rows in (int(x) for x in args.rows.split(",")):
+        for backend in backends:
+            results.extend(bench_size(rows, backend, args, scenarios))
+    report = {
+        "python": platform.python_version(),
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "latency": args.latency,
+        "backends": backends,
+        "results": results,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
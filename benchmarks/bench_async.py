@@ -0,0 +1,164 @@
+"""
+Benchmark: the async I/O mode (aio.py) against the serial behaviour, fully offline.
+
+Runs the app in-process against FakeSupabase with a fixed per-call latency, like bench_api.py.
+1. Fan-out: the signed-in routes that issue independent queries (stats: 3, history source=all: 2,
+   job lookup: 2) with aio.FANOUT off (awaited one after another) and on (awaited together).
+2. Starvation: a fixed pool of request workers (a WSGI server's threads) gets --slow full syncs
+   followed by quick requests. With syncs held inline (?wait without a bound) the quick requests
+   queue behind them; with ?wait=0 the syncs run on the I/O loop and the workers stay free. The quick
+   requests' latency includes the time spent waiting for a worker.
+
+    python benchmarks/bench_async.py [--rows 20000] [--latency 0.01] [--requests 200]
+                                     [--concurrency 8] [--workers 4] [--slow 4] [--out result.json]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aio  # noqa: E402
+import app as web  # noqa: E402
+import auth_supabase  # noqa: E402
+from benchmarks.bench_api import (  # noqa: E402
+    JWT_SECRET, _percentile, _token, run_scenario, write_failed_csv, write_history_csv,
+)
+from benchmarks.fake_supabase import FakeSupabase  # noqa: E402
+from csv_tail import SyncStateStore  # noqa: E402
+from supabase_client import _InstrumentedClient  # noqa: E402
+
+FANOUT_SCENARIOS = ("applied_jobs_stats", "history_all", "job_lookup")
+QUICK_PATH = "/api/pipeline/status"
+
+
+def setup(rows: int, latency: float) -> str:
+    tmp = tempfile.mkdtemp(prefix=f"bench-async-{rows}-")
+    reference = os.path.join(tmp, "reference")
+    os.makedirs(os.path.join(reference, "all excels"))
+    csv_path = os.path.join(reference, "all excels", "all_applied_applications_history.csv")
+    failed_path = os.path.join(reference, "all excels", "all_failed_applications_history.csv")
+    write_history_csv(csv_path, rows)
+    write_failed_csv(failed_path, rows // 10)
+    fake = _InstrumentedClient(FakeSupabase(latency=latency))
+    web.get_supabase = lambda: fake
+    web.APPLIED_CSV = csv_path
+    web.FAILED_CSV = failed_path
+    web.CONFIG_JSON = os.path.join(tmp, "config.json")
+    web._sync_state = SyncStateStore(os.path.join(tmp, "sync_state.json"))
+    # Syncs complete inside the request unless a scenario passes ?wait=
+    web.SYNC_WAIT = None
+    return tmp
+
+
+def bench_fanout(args, tokens: list) -> list:
+    results = []
+    for fanout in (False, True):
+        aio.FANOUT = fanout
+        for name in FANOUT_SCENARIOS:
+            result = run_scenario(name, args.requests, args.concurrency, tokens, args.warmup)
+            result["fanout"] = fanout
+            results.append(result)
+            print(f"fanout={'on ' if fanout else 'off'}  {name:<20} {result['throughput_rps']:>9} req/s  "
+                  f"p50 {result['p50_ms']:>8} ms  p99 {result['p99_ms']:>8} ms", file=sys.stderr)
+    return results
+
+
+def bench_starvation(args, mode: str, users: list) -> dict:
+    """--slow full syncs, then --quick quick requests, on a pool of --workers request threads."""
+    local = threading.local()
+    suffix = "" if mode == "inline" else "&wait=0"
+
+    def request(method: str, path: str, token: str = None):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = web.app.test_client()
+        headers = {"Authorization": "Bearer " + token} if token else {}
+        resp = client.open(path, method=method, headers=headers)
+        resp.get_data()
+        resp.close()
+        return resp.status_code
+
+    def quick(submitted: float):
+        request("GET", QUICK_PATH)
+        return time.perf_counter() - submitted
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        t0 = time.perf_counter()
+        syncs = [pool.submit(request, "POST", "/api/applied-jobs/sync?full=1" + suffix, _token(user))
+                 for user in users]
+        quicks = [pool.submit(quick, time.perf_counter()) for _ in range(args.quick)]
+        latencies = sorted(f.result() * 1000 for f in quicks)
+        statuses = [f.result() for f in syncs]
+    # Background syncs finish on the I/O loop; wait so the next run starts from a quiet process
+    jobs = web._get_sync_jobs()
+    for user in users:
+        jobs.wait(("sync", user), None)
+    syncs_done = time.perf_counter() - t0
+    result = {
+        "mode": mode,
+        "workers": args.workers,
+        "slow_syncs": args.slow,
+        "sync_statuses": sorted(set(statuses)),
+        "quick_requests": args.quick,
+        "quick_p50_ms": round(_percentile(latencies, 0.50), 3),
+        "quick_p99_ms": round(_percentile(latencies, 0.99), 3),
+        "all_done_s": round(syncs_done, 3),
+    }
+    print(f"starvation {mode:<10} quick p50 {result['quick_p50_ms']:>9} ms  p99 {result['quick_p99_ms']:>9} ms  "
+          f"syncs {result['sync_statuses']}", file=sys.stderr)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="applications in the synthetic CSV")
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds per simulated Supabase call")
+    parser.add_argument("--requests", type=int, default=200, help="requests per fan-out scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=4, help="request worker threads in the starvation test")
+    parser.add_argument("--slow", type=int, default=4, help="full syncs submitted before the quick requests")
+    parser.add_argument("--quick", type=int, default=50, help="quick requests submitted after the syncs")
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    auth_supabase.SUPABASE_JWT_SECRET = JWT_SECRET
+    web.app.logger.disabled = True
+    setup(args.rows, args.latency)
+    users = [f"00000000-0000-0000-0000-{i:012d}" for i in range(max(args.concurrency, args.slow * 2))]
+    tokens = [_token(u) for u in users]
+
+    # Import every user's history once, so the fan-out reads have rows to page through
+    run_scenario("sync_full", len(tokens), args.concurrency, tokens, 0)
+    report = {
+        "python": platform.python_version(),
+        "rows": args.rows,
+        "latency": args.latency,
+        "io_threads": aio.IO_THREADS,
+        "fanout": bench_fanout(args, tokens[:args.concurrency]),
+    }
+    aio.FANOUT = True
+    report["starvation"] = [
+        bench_starvation(args, "inline", users[:args.slow]),
+        bench_starvation(args, "background", users[args.slow:args.slow * 2]),
+    ]
+    serial = {r["scenario"]: r["p50_ms"] for r in report["fanout"] if not r["fanout"]}
+    report["fanout_speedup_p50"] = {
+        r["scenario"]: round(serial[r["scenario"]] / max(r["p50_ms"], 1e-9), 2) for r in report["fanout"] if r["fanout"]
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
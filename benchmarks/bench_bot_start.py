@@ -0,0 +1,114 @@
+"""
+Benchmark: pipeline start latency with and without warm start, fully offline.
+
+Each run starts a synthetic runAiBot.py through PipelineScheduler. The bot imports --modules (the
+bot's real dependencies by default, see bot_standby.DEFAULT_WARM_MODULES) and then prints its first
+line, which stands for its first action. Latency runs from the start() call to that line's
+timestamp in the run's log buffer. Runs are sequential, --idle seconds apart, so in warm mode the
+replacement standby has finished importing before the next start.
+
+    python benchmarks/bench_bot_start.py [--runs 10] [--idle 2] [--modules flask,jinja2] [--out result.json]
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bot_standby  # noqa: E402
+from pipeline_scheduler import PipelineScheduler  # noqa: E402
+
+# Used when none of the bot's dependencies are installed here: slow-importing packages the app has
+FALLBACK_MODULES = ("flask", "werkzeug", "jinja2", "email.mime.multipart", "http.server", "xml.dom.minidom")
+
+BOT_SCRIPT = """\
+import importlib
+for name in {modules!r}:
+    importlib.import_module(name)
+print("first action", flush=True)
+"""
+
+
+def _importable(name: str) -> bool:
+    try:
+        importlib.import_module(name)
+        return True
+    except Exception:
+        return False
+
+
+def run_mode(warm: bool, reference: str, tmp: str, args) -> dict:
+    scheduler = PipelineScheduler(reference, os.path.join(tmp, "workdirs"), max_concurrent=1, warm_start=warm)
+    latencies, warm_runs = [], 0
+    for i in range(args.runs):
+        time.sleep(args.idle)
+        t0 = time.time()
+        snapshot = scheduler.start("bench", {})
+        if snapshot["state"] != "running":
+            raise RuntimeError(f"bot did not start: {snapshot}")
+        warm_runs += bool(snapshot.get("warm"))
+        logs = scheduler.logs("bench")
+        if not logs.wait(0, 60):
+            raise RuntimeError("bot printed nothing within 60s")
+        first = logs.read(0, 1)["lines"][0]
+        latencies.append((first["ts"] - t0) * 1000)
+        scheduler.state("bench").wait(snapshot["version"], 60)
+        while scheduler.running_count():
+            time.sleep(0.01)
+    scheduler.close_standby()
+    latencies.sort()
+    return {
+        "mode": "warm" if warm else "cold",
+        "runs": args.runs,
+        "warm_runs": warm_runs,
+        "p50_ms": round(latencies[len(latencies) // 2], 1),
+        "min_ms": round(latencies[0], 1),
+        "max_ms": round(latencies[-1], 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--idle", type=float, default=2.0, help="seconds between runs")
+    parser.add_argument("--modules", help="comma-separated modules the synthetic bot imports")
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    if args.modules:
+        modules = [m.strip() for m in args.modules.split(",") if m.strip()]
+    else:
+        modules = [m for m in bot_standby.DEFAULT_WARM_MODULES if _importable(m)] or list(FALLBACK_MODULES)
+    # The standby preloads exactly what the synthetic bot imports
+    os.environ["PIPELINE_WARM_MODULES"] = ",".join(modules)
+
+    tmp = tempfile.mkdtemp(prefix="bench-bot-start-")
+    reference = os.path.join(tmp, "reference")
+    os.makedirs(os.path.join(reference, "config"))
+    with open(os.path.join(reference, "runAiBot.py"), "w", encoding="utf-8") as f:
+        f.write(BOT_SCRIPT.format(modules=modules))
+
+    results = [run_mode(False, reference, tmp, args), run_mode(True, reference, tmp, args)]
+    for r in results:
+        print(f"{r['mode']:<5} p50 {r['p50_ms']:>8} ms  min {r['min_ms']:>8} ms  max {r['max_ms']:>8} ms",
+              file=sys.stderr)
+    report = {
+        "python": platform.python_version(),
+        "modules": modules,
+        "results": results,
+        "speedup_p50": round(results[0]["p50_ms"] / max(results[1]["p50_ms"], 1e-9), 2),
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: throughput of bulk_upsert() against an in-memory fake Supabase table.
+
+Simulates per-request latency and random failures, and sweeps batch size / in-flight batches.
+
+    python benchmarks/bench_bulk_upsert.py [--rows 50000] [--latency 0.05] [--fail-rate 0.02]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bulk_upsert import bulk_upsert  # noqa: E402
+from benchmarks.fake_supabase import FakeSupabase  # noqa: E402
+
+
+def synthetic_rows(n: int, user_id: str = "bench-user", dup_every: int = 50):
+    """Yield applied_jobs rows; every dup_every-th row repeats an earlier job_id."""
+    for i in range(n):
+        job = i - 1 if dup_every and i and i % dup_every == 0 else i
+        yield {
+            "user_id": user_id,
+            "job_id": str(4000000000 + job),
+            "title": f"Software Engineer {job % 97}",
+            "company": f"Company {job % 503}",
+            "hr_name": "",
+            "hr_link": "",
+            "job_link": f"https://www.linkedin.com/jobs/view/{4000000000 + job}",
+            "external_job_link": "Easy Applied",
+            "date_applied": "2025-01-01 12:00:00",
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per simulated request")
+    parser.add_argument("--fail-rate", type=float, default=0.02)
+    parser.add_argument("--batch-sizes", default="250,500,1000")
+    parser.add_argument("--in-flight", default="1,4,8")
+    args = parser.parse_args()
+
+    results = []
+    for batch_size in (int(x) for x in args.batch_sizes.split(",")):
+        for in_flight in (int(x) for x in args.in_flight.split(",")):
+            sb = FakeSupabase(latency=args.latency, fail_rate=args.fail_rate)
+            stats = bulk_upsert(
+                sb, "applied_jobs", synthetic_rows(args.rows), "user_id,job_id",
+                batch_size=batch_size, max_in_flight=in_flight, backoff=0.01,
+            )
+            stats.update({"batch_size": batch_size, "in_flight": in_flight, "stored": len(sb.rows("applied_jobs"))})
+            results.append(stats)
+    print(json.dumps({"rows": args.rows, "latency": args.latency, "fail_rate": args.fail_rate, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
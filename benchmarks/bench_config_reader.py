@@ -0,0 +1,68 @@
+"""
+Benchmark: in-process ast config reader vs the legacy subprocess reader.
+
+Writes the default config into a temporary reference/config/ tree, then times both
+readers and checks they return the same dict. file_cache is invalidated before every ast run,
+so ast_ms is the parse cost; ast_cached_ms is the same read served from the cache.
+
+    python benchmarks/bench_config_reader.py [--runs 20]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config_io  # noqa: E402
+from file_cache import file_cache  # noqa: E402
+
+
+def _time(fn, runs: int, setup=None) -> list:
+    """Sorted wall times in ms; setup() runs untimed before each call."""
+    samples = []
+    for _ in range(runs):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return sorted(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_io.REFERENCE_DIR = tmp
+        config_io.CONFIG_DIR = os.path.join(tmp, "config")
+        os.makedirs(config_io.CONFIG_DIR)
+        config_io.write_all_config(config_io.get_default_config())
+
+        in_process = config_io.read_config_from_reference()
+        via_subprocess = config_io._read_config_via_subprocess()
+
+        misses = file_cache.stats()["misses"]
+        ast_ms = _time(config_io.read_config_from_reference, args.runs, setup=file_cache.invalidate)
+        parsed = file_cache.stats()["misses"] - misses
+        cached_ms = _time(config_io.read_config_from_reference, args.runs)
+        sub_ms = _time(config_io._read_config_via_subprocess, args.runs)
+
+    report = {
+        "runs": args.runs,
+        "same_result": in_process == via_subprocess,
+        "ast_ms": {"p50": ast_ms[len(ast_ms) // 2], "max": ast_ms[-1]},
+        "ast_files_parsed": parsed,
+        "ast_cached_ms": {"p50": cached_ms[len(cached_ms) // 2], "max": cached_ms[-1]},
+        "subprocess_ms": {"p50": sub_ms[len(sub_ms) // 2], "max": sub_ms[-1]},
+    }
+    report["speedup"] = round(report["subprocess_ms"]["p50"] / max(report["ast_ms"]["p50"], 1e-9), 1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
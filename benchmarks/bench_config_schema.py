@@ -0,0 +1,90 @@
+"""
+Micro-benchmark: validating and rendering a full config through the compiled schema.
+
+Times config_schema.render_config (validate + render all five sections), validate_patch on a
+full form payload (strings, as the browser sends them) and write_all_config into a temp dir when
+nothing changed. As a baseline it also times an uncompiled walk of SCHEMA that looks up each
+field's coercer and formats its line one at a time.
+Exits with status 1 when the median render is over budget.
+
+    python benchmarks/bench_config_schema.py [--runs 2000] [--budget-us 200]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config_io  # noqa: E402
+import config_schema  # noqa: E402
+
+
+def _time_us(fn, runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    samples.sort()
+    return {"p50": round(samples[len(samples) // 2], 1), "p99": round(samples[int(len(samples) * 0.99)], 1)}
+
+
+def _render_uncompiled(config: dict) -> dict:
+    """Baseline: per-field type dispatch and string building, no precomputed templates."""
+    out = {}
+    for section, fields in config_schema.SCHEMA.items():
+        data = config.get(section) or {}
+        lines = []
+        for field in fields:
+            coerce, to_source = config_schema._TYPES[field.type]
+            lines.append(f"{field.name} = {to_source(coerce(data.get(field.name, field.default)))}")
+        out[section] = config_schema.HEADERS[section] + "\n".join(lines) + "\n"
+    return out
+
+
+def _form_payload(config: dict) -> dict:
+    """The config as the dashboard form posts it: numbers and lists as strings."""
+    payload = {}
+    for section, values in config.items():
+        payload[section] = {
+            k: ", ".join(v) if isinstance(v, list) else v if isinstance(v, bool) else str(v)
+            for k, v in values.items()
+        }
+    return payload
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--budget-us", type=float, default=200.0, help="max median render_config time")
+    args = parser.parse_args()
+
+    config = config_io.get_default_config()
+    config["personals"].update(first_name="Ada", last_name="Lovelace", current_city="London")
+    config["search"]["companies"] = [f"Company {i}" for i in range(50)]
+    config["questions"]["cover_letter"] = "Dear hiring manager,\n" * 20
+    payload = _form_payload(config)
+    assert _render_uncompiled(config) == config_schema.render_config(config)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_io.write_all_config(config, tmp)
+        report = {
+            "runs": args.runs,
+            "fields": sum(len(f) for f in config_schema.SCHEMA.values()),
+            "render_config_us": _time_us(lambda: config_schema.render_config(config), args.runs),
+            "render_uncompiled_us": _time_us(lambda: _render_uncompiled(config), args.runs),
+            "validate_form_payload_us": _time_us(lambda: config_schema.validate_patch(payload), args.runs),
+            "write_all_config_unchanged_us": _time_us(lambda: config_io.write_all_config(config, tmp), args.runs // 10 or 1),
+        }
+    report["speedup"] = round(report["render_uncompiled_us"]["p50"] / max(report["render_config_us"]["p50"], 1e-9), 2)
+    report["budget_us"] = args.budget_us
+    report["ok"] = report["render_config_us"]["p50"] <= args.budget_us
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
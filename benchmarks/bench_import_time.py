@@ -0,0 +1,101 @@
+"""
+Benchmark: cold-start import time of the web app, with a regression budget.
+
+Imports app.py in fresh interpreters under `-X importtime`, serves `/` and `/api/auth/env`,
+and reports the median total import time, the slowest modules (self time), and any
+route-specific modules (Supabase, JWT, CSV sync, pipeline) that were loaded anyway.
+Exits with status 1 when over budget or when a deferred module was imported.
+
+    python benchmarks/bench_import_time.py [--runs 5] [--budget-ms 350] [--local]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must not be imported by a cold start that only serves / and /api/auth/env
+DEFERRED = (
+    "jwt", "supabase", "postgrest", "httpx", "dotenv",
+    "supabase_client", "csv_tail", "bulk_upsert", "export_stream", "applied_index",
+    "pipeline_scheduler", "pipeline_logs", "pipeline_events", "bot_telemetry", "aio", "asyncio",
+    "storage", "storage_supabase", "storage_sqlite", "sqlite3",
+)
+
+PROBE = """
+import json, sys
+import app
+client = app.app.test_client()
+client.get("/")
+client.get("/api/auth/env")
+print(json.dumps(sorted(sys.modules)))
+"""
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _run_once(env: dict) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    self_us, total_us = {}, None
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        self_time, cumulative, indent, name = int(m.group(1)), int(m.group(2)), m.group(3), m.group(4)
+        self_us[name] = self_us.get(name, 0) + self_time
+        if name == "app" and len(indent) == 1:
+            total_us = cumulative
+    return {"total_us": total_us, "self_us": self_us, "modules": json.loads(proc.stdout.strip().splitlines()[-1])}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=350.0, help="max median import time of app.py")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--local", action="store_true", help="measure a local start instead of Vercel (VERCEL=1)")
+    args = parser.parse_args()
+
+    env = {k: v for k, v in os.environ.items() if k != "VERCEL"}
+    if not args.local:
+        env["VERCEL"] = "1"
+    runs = [_run_once(env) for _ in range(args.runs)]
+    runs.sort(key=lambda r: r["total_us"])
+    median = runs[len(runs) // 2]
+
+    loaded = sorted(
+        name for name in DEFERRED
+        if any(m == name or m.startswith(name + ".") for m in median["modules"])
+    )
+    if args.local:
+        # Locally .env is loaded at startup by design
+        loaded = [name for name in loaded if name != "dotenv"]
+    total_ms = median["total_us"] / 1000
+    slowest = sorted(median["self_us"].items(), key=lambda kv: kv[1], reverse=True)[:args.top]
+    report = {
+        "runs": args.runs,
+        "mode": "local" if args.local else "vercel",
+        "import_ms": {
+            "min": runs[0]["total_us"] / 1000,
+            "p50": total_ms,
+            "max": runs[-1]["total_us"] / 1000,
+        },
+        "budget_ms": args.budget_ms,
+        "slowest_self_ms": {name: us / 1000 for name, us in slowest},
+        "deferred_modules_loaded": loaded,
+    }
+    report["ok"] = total_ms <= args.budget_ms and not loaded
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
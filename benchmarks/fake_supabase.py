@@ -0,0 +1,306 @@
+"""
+In-memory stand-in for the supabase-py client surface used by the app, for offline benchmarks.
+Supports table().select/eq/gt/gte/lt/lte/ilike/or_/order/limit/range/upsert/insert/update/delete().execute()
+with optional per-call latency and random failures.
+"""
+import copy
+import heapq
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+
+class FakeAPIError(Exception):
+    pass
+
+
+def _split_top(expr: str) -> list:
+    """Split a PostgREST filter list on commas outside parentheses and double quotes."""
+    parts, depth, quoted, buf, i = [], 0, False, "", 0
+    while i < len(expr):
+        ch = expr[i]
+        if quoted and ch == "\\":
+            buf += expr[i:i + 2]
+            i += 2
+            continue
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0 and not quoted:
+            parts.append(buf)
+            buf = ""
+        else:
+            buf += ch
+        i += 1
+    if buf:
+        parts.append(buf)
+    return parts
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return value
+
+
+def _compile_filter(expr: str):
+    """Compile one PostgREST logic-tree term like and(a.eq.1,or(b.lt.2,c.ilike.*x*)) to a predicate."""
+    for op, combine in (("and(", all), ("or(", any)):
+        if expr.startswith(op) and expr.endswith(")"):
+            preds = [_compile_filter(p) for p in _split_top(expr[len(op):-1])]
+            return lambda r, preds=preds, combine=combine: combine(p(r) for p in preds)
+    column, op, value = expr.split(".", 2)
+    value = _unquote(value)
+    if op == "ilike":
+        needle = value.strip("*%").lower()
+        return lambda r: r.get(column) is not None and needle in str(r.get(column)).lower()
+    compare = {
+        "eq": lambda a, b: a == b, "neq": lambda a, b: a != b,
+        "lt": lambda a, b: a < b, "lte": lambda a, b: a <= b,
+        "gt": lambda a, b: a > b, "gte": lambda a, b: a >= b,
+    }[op]
+    return lambda r: r.get(column) is not None and compare(str(r.get(column)), value)
+
+
+class _Response:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeTable:
+    """Rows plus lazily built hash indexes, so large tables do not make the fake the bottleneck."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows = []
+        self.lock = threading.Lock()
+        self._unique = {}  # conflict columns -> {key tuple: row}; kept up to date by inserts
+        self._by_value = {}  # column -> {value: [rows]}; dropped on every write
+
+    def unique_index(self, keys: tuple) -> dict:
+        index = self._unique.get(keys)
+        if index is None:
+            index = self._unique[keys] = {tuple(r.get(k) for k in keys): r for r in self.rows}
+        return index
+
+    def rows_where(self, column: str, value) -> list:
+        index = self._by_value.get(column)
+        if index is None:
+            index = self._by_value[column] = {}
+            for r in self.rows:
+                index.setdefault(r.get(column), []).append(r)
+        return index.get(value, [])
+
+    def append(self, row: dict) -> None:
+        self.rows.append(row)
+        for keys, index in self._unique.items():
+            index[tuple(row.get(k) for k in keys)] = row
+        self._by_value.clear()
+
+    def changed(self, keys_changed: bool = True) -> None:
+        """Forget indexes after rows were modified (unique indexes survive if no key column changed)."""
+        if keys_changed:
+            self._unique.clear()
+        self._by_value.clear()
+
+
+class FakeQuery:
+    def __init__(self, client, table: FakeTable):
+        self._client = client
+        self._table = table
+        self._op = None
+        self._payload = None
+        self._on_conflict = None
+        self._columns = None
+        self._filters = []
+        self._eq = None  # first (column, value) equality filter, answered from an index
+        self._order = []
+        self._limit = None
+        self._range = None
+
+    # Operations
+    def select(self, columns: str = "*", count=None):
+        self._op = self._op or "select"
+        cols = [c.strip() for c in columns.split(",")]
+        self._columns = None if "*" in cols else cols
+        return self
+
+    def upsert(self, rows, on_conflict: str = "", **kwargs):
+        self._op, self._payload, self._on_conflict = "upsert", rows, on_conflict
+        return self
+
+    def insert(self, rows, **kwargs):
+        self._op, self._payload = "insert", rows
+        return self
+
+    def update(self, values: dict, **kwargs):
+        self._op, self._payload = "update", values
+        return self
+
+    def delete(self, **kwargs):
+        self._op = "delete"
+        return self
+
+    # Filters
+    def _add(self, column, fn):
+        self._filters.append(lambda r: fn(r.get(column)))
+        return self
+
+    def eq(self, column, value):
+        if self._eq is None and isinstance(value, (str, int)):
+            self._eq = (column, value)
+        return self._add(column, lambda v: v == value)
+
+    def neq(self, column, value):
+        return self._add(column, lambda v: v != value)
+
+    def gt(self, column, value):
+        return self._add(column, lambda v: v is not None and v > value)
+
+    def gte(self, column, value):
+        return self._add(column, lambda v: v is not None and v >= value)
+
+    def lt(self, column, value):
+        return self._add(column, lambda v: v is not None and v < value)
+
+    def lte(self, column, value):
+        return self._add(column, lambda v: v is not None and v <= value)
+
+    def ilike(self, column, pattern):
+        needle = pattern.strip("%*").lower()
+        return self._add(column, lambda v: v is not None and needle in str(v).lower())
+
+    def in_(self, column, values):
+        values = set(values)
+        return self._add(column, lambda v: v in values)
+
+    def or_(self, filters: str, **kwargs):
+        pred = _compile_filter(f"or({filters})")
+        self._filters.append(pred)
+        return self
+
+    def order(self, column, desc: bool = False, **kwargs):
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, n: int, **kwargs):
+        self._limit = n
+        return self
+
+    def range(self, start: int, end: int, **kwargs):
+        self._range = (start, end)
+        return self
+
+    # Execution
+    def _match(self, row) -> bool:
+        return all(f(row) for f in self._filters)
+
+    def execute(self):
+        self._client._before_call()
+        t = self._table
+        with t.lock:
+            if self._op == "select":
+                return _Response(self._select())
+            if self._op in ("upsert", "insert"):
+                return _Response(self._write())
+            if self._op == "update":
+                out = []
+                for row in self._candidates():
+                    if self._match(row):
+                        row.update(copy.deepcopy(self._payload))
+                        out.append(dict(row))
+                t.changed()
+                return _Response(out)
+            if self._op == "delete":
+                out = [r for r in t.rows if self._match(r)]
+                t.rows = [r for r in t.rows if not self._match(r)]
+                t.changed()
+                return _Response(out)
+        raise FakeAPIError(f"unsupported operation {self._op!r}")
+
+    def _candidates(self) -> list:
+        if self._eq is not None:
+            return list(self._table.rows_where(*self._eq))
+        return self._table.rows
+
+    def _select(self):
+        rows = [r for r in self._candidates() if self._match(r)]
+        directions = {desc for _, desc in self._order}
+        if len(directions) == 1:
+            # One composite key; only the first page is needed when limit is set without range
+            columns, desc = [c for c, _ in self._order], directions.pop()
+            key = lambda r: tuple((r.get(c) is None, r.get(c)) for c in columns)  # noqa: E731
+            if self._limit is not None and not self._range:
+                rows = (heapq.nlargest if desc else heapq.nsmallest)(self._limit, rows, key=key)
+            else:
+                rows.sort(key=key, reverse=desc)
+        else:
+            for column, desc in reversed(self._order):
+                rows.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+        if self._range:
+            rows = rows[self._range[0]:self._range[1] + 1]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        if self._columns:
+            rows = [{c: r.get(c) for c in self._columns} for r in rows]
+        return [dict(r) for r in rows]
+
+    def _write(self):
+        payload = self._payload if isinstance(self._payload, list) else [self._payload]
+        keys = [c.strip() for c in (self._on_conflict or "").split(",") if c.strip()]
+        t = self._table
+        if keys:
+            batch_keys = [tuple(r.get(k) for k in keys) for r in payload]
+            if len(set(batch_keys)) != len(batch_keys):
+                raise FakeAPIError("ON CONFLICT DO UPDATE command cannot affect row a second time")
+            index = t.unique_index(tuple(keys))
+        out = []
+        now = datetime.now(timezone.utc).isoformat()
+        for row in payload:
+            row = copy.deepcopy(row)
+            existing = index.get(tuple(row.get(k) for k in keys)) if keys else None
+            if existing is not None and self._op == "upsert":
+                existing.update(row)
+                t.changed(keys_changed=False)
+                out.append(dict(existing))
+                continue
+            row.setdefault("id", str(uuid.uuid4()))
+            row.setdefault("created_at", now)
+            t.append(row)
+            out.append(dict(row))
+        return out
+
+
+class FakeSupabase:
+    """Drop-in for the object returned by supabase_client.get_supabase()."""
+
+    def __init__(self, latency: float = 0.0, fail_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.calls = 0
+        self._tables = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+    def _before_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+            fail = self._rng.random() < self.fail_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise FakeAPIError("simulated Supabase failure")
+
+    def table(self, name: str) -> FakeQuery:
+        with self._lock:
+            t = self._tables.setdefault(name, FakeTable(name))
+        return FakeQuery(self, t)
+
+    def rows(self, name: str) -> list:
+        return list(self._tables[name].rows) if name in self._tables else []
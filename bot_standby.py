@@ -0,0 +1,71 @@
+"""
+Warm standby for bot runs (PIPELINE_WARM_START=1): an interpreter that has already imported the bot's
+heavy third-party dependencies and waits for one start command on stdin, a JSON line
+{"cwd": workdir, "script": path of runAiBot.py}. It then runs the script as __main__ from that
+directory, as `python runAiBot.py` would, and exits with its status.
+
+Nothing of the bot itself (config/, modules/) is imported before the command arrives, so every run
+reads the config written for it. If stdin closes first (the web app exited), the standby exits.
+"""
+import importlib
+import json
+import os
+import runpy
+import sys
+
+# What runAiBot.py and its modules/ import that is slow to load; PIPELINE_WARM_MODULES overrides
+DEFAULT_WARM_MODULES = (
+    "undetected_chromedriver",
+    "selenium.webdriver",
+    "selenium.webdriver.common.by",
+    "selenium.webdriver.common.keys",
+    "selenium.webdriver.common.action_chains",
+    "selenium.webdriver.support.ui",
+    "selenium.webdriver.support.expected_conditions",
+    "selenium.common.exceptions",
+    "openai",
+    "pyautogui",
+    "requests",
+)
+
+
+def warm_modules() -> list:
+    env = os.environ.get("PIPELINE_WARM_MODULES")
+    if env is None:
+        return list(DEFAULT_WARM_MODULES)
+    return [name.strip() for name in env.split(",") if name.strip()]
+
+
+def preload(modules) -> list:
+    """Import what can be imported; the bot reports anything missing itself when it runs."""
+    loaded = []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            # Not installed, or failing at import (e.g. pyautogui without a display)
+            continue
+        loaded.append(name)
+    return loaded
+
+
+def main() -> int:
+    # Nothing is imported from this file's directory; the bot's own directory takes its place
+    sys.path.pop(0)
+    preload(warm_modules())
+    line = sys.stdin.buffer.readline()
+    if not line.strip():
+        return 0
+    command = json.loads(line)
+    script = os.path.abspath(command["script"])
+    os.chdir(command["cwd"])
+    # Same import path as `python runAiBot.py`: the real directory of the script first
+    sys.path.insert(0, os.path.dirname(os.path.realpath(script)))
+    sys.argv = [script] + list(command.get("args", ()))
+    sys.stdin = open(os.devnull)
+    runpy.run_path(script, run_name="__main__")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
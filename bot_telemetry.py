@@ -0,0 +1,328 @@
+"""
+Resource telemetry for bot runs: CPU, memory, threads and child processes of each runAiBot.py process
+tree (the bot plus its chromedriver and Chrome children), sampled at a fixed interval into a bounded
+ring buffer per run, and a per-user history of finished runs with their peaks.
+
+Process trees are read with psutil when it is installed, else from /proc (Linux); elsewhere runs
+are still recorded (start/stop, exit code), just without samples.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+
+# Seconds between samples of every running bot
+SAMPLE_INTERVAL = float(os.environ.get("PIPELINE_SAMPLE_INTERVAL", "2"))
+# Samples kept per run (the oldest are dropped); one hour at the default interval
+SAMPLE_SLOTS = int(os.environ.get("PIPELINE_SAMPLE_SLOTS", "1800"))
+# Finished runs kept per user
+RUN_HISTORY = int(os.environ.get("PIPELINE_RUN_HISTORY", "50"))
+SAMPLE_FIELDS = ("ts", "cpu_percent", "rss_mb", "threads", "children")
+
+_MB = 1024 * 1024
+
+
+# Process tree readers: root pids -> {root: {pid: (cpu seconds, rss bytes, threads)}}; a root that has
+# exited maps to an empty dict.
+
+def _read_psutil(psutil, roots) -> dict:
+    trees = {}
+    for root in roots:
+        tree = {}
+        try:
+            procs = psutil.Process(root)
+            procs = [procs] + procs.children(recursive=True)
+        except psutil.Error:
+            procs = []
+        for proc in procs:
+            try:
+                with proc.oneshot():
+                    times = proc.cpu_times()
+                    tree[proc.pid] = (times.user + times.system, proc.memory_info().rss, proc.num_threads())
+            except psutil.Error:
+                # Exited between listing and reading, or not ours to inspect
+                continue
+        trees[root] = tree
+    return trees
+
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _procfs_table() -> dict:
+    """pid -> (ppid, cpu seconds, rss bytes, threads) for every readable process in /proc."""
+    table = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name is in parentheses and may itself contain spaces or parentheses
+        fields = stat[stat.rfind(b")") + 2:].split()
+        try:
+            table[int(name)] = (
+                int(fields[1]),
+                (int(fields[11]) + int(fields[12])) / _CLK_TCK,
+                int(fields[21]) * _PAGE_SIZE,
+                int(fields[17]),
+            )
+        except (IndexError, ValueError):
+            continue
+    return table
+
+
+def _read_procfs(roots) -> dict:
+    table = _procfs_table()
+    children = {}
+    for pid, (ppid, *_) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    trees = {}
+    for root in roots:
+        tree = {}
+        stack = [root] if root in table else []
+        while stack:
+            pid = stack.pop()
+            tree[pid] = table[pid][1:]
+            stack.extend(children.get(pid, ()))
+        trees[root] = tree
+    return trees
+
+
+def tree_reader():
+    """(name, reader) for this platform: psutil, then /proc, else (None, None)."""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        return "psutil", lambda roots: _read_psutil(psutil, roots)
+    if os.path.isdir("/proc/self") and os.path.exists("/proc/self/stat"):
+        return "procfs", _read_procfs
+    return None, None
+
+
+class RunTelemetry:
+    """One bot run: when it started and ended, its exit code, and a ring buffer of samples."""
+
+    def __init__(self, run_id: int, pid: int, slots: int = SAMPLE_SLOTS):
+        self.run_id = run_id
+        self.pid = pid
+        self.started_at = time.time()
+        self.stopped_at = None
+        self.exit_code = None
+        self.state = "running"
+        # (ts, cpu %, rss bytes, threads, children) per sample
+        self.samples = deque(maxlen=slots)
+        self.sample_count = 0
+        self.cpu_seconds = 0.0
+        self.peak_cpu_percent = 0.0
+        self.peak_rss = 0
+        self.peak_threads = 0
+        self.peak_children = 0
+        self._lock = threading.Lock()
+        # Last cpu time seen per pid of the tree, and when the previous sample was taken
+        self._cpu = {}
+        self._last = time.monotonic()
+
+    def rebase(self, tree: dict, now: float) -> None:
+        """Count CPU from this reading on, e.g. past the preload of a warm standby that was handed the run."""
+        self._cpu = {pid: cpu for pid, (cpu, _, _) in tree.items()}
+        self._last = now
+
+    def record(self, tree: dict, now: float) -> None:
+        """Add a sample from a {pid: (cpu seconds, rss bytes, threads)} reading of the run's tree."""
+        elapsed = now - self._last
+        self._last = now
+        # Processes first seen in this reading were started since the last one, so all their time is new
+        busy = sum(max(0.0, cpu - self._cpu.get(pid, 0.0)) for pid, (cpu, _, _) in tree.items())
+        self._cpu = {pid: cpu for pid, (cpu, _, _) in tree.items()}
+        cpu_percent = round(100.0 * busy / elapsed, 1) if elapsed > 0 else 0.0
+        rss = sum(r for _, r, _ in tree.values())
+        threads = sum(t for _, _, t in tree.values())
+        children = max(0, len(tree) - 1)
+        with self._lock:
+            self.samples.append((round(time.time(), 3), cpu_percent, rss, threads, children))
+            self.sample_count += 1
+            self.cpu_seconds += busy
+            self.peak_cpu_percent = max(self.peak_cpu_percent, cpu_percent)
+            self.peak_rss = max(self.peak_rss, rss)
+            self.peak_threads = max(self.peak_threads, threads)
+            self.peak_children = max(self.peak_children, children)
+
+    def finish(self, state: str, exit_code: int) -> None:
+        with self._lock:
+            self.state = state
+            self.exit_code = exit_code
+            self.stopped_at = time.time()
+
+    def summary(self) -> dict:
+        with self._lock:
+            end = self.stopped_at or time.time()
+            last = self.samples[-1] if self.samples else None
+            return {
+                "run_id": self.run_id,
+                "pid": self.pid,
+                "state": self.state,
+                "started_at": self.started_at,
+                "stopped_at": self.stopped_at,
+                "duration_s": round(end - self.started_at, 3),
+                "exit_code": self.exit_code,
+                "samples": self.sample_count,
+                "cpu_seconds": round(self.cpu_seconds, 3),
+                "peak_cpu_percent": self.peak_cpu_percent,
+                "peak_rss_mb": round(self.peak_rss / _MB, 1),
+                "peak_threads": self.peak_threads,
+                "peak_children": self.peak_children,
+                "last": self._row(last) if last else None,
+            }
+
+    def latest_sample(self):
+        with self._lock:
+            return self.samples[-1] if self.samples else None
+
+    @staticmethod
+    def _row(sample: tuple) -> list:
+        ts, cpu_percent, rss, threads, children = sample
+        return [ts, cpu_percent, round(rss / _MB, 1), threads, children]
+
+    def series(self, since: float = None) -> dict:
+        """Samples newer than `since` (unix time) as rows of SAMPLE_FIELDS."""
+        with self._lock:
+            rows = [self._row(s) for s in self.samples if since is None or s[0] > since]
+            dropped = self.sample_count - len(self.samples)
+        return {"fields": list(SAMPLE_FIELDS), "samples": rows, "dropped": dropped}
+
+
+class TelemetrySampler:
+    """
+    Tracks bot runs by user. One daemon thread samples every running tree each interval (a single
+    /proc scan covers all of them) and exits when nothing is running.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL, slots: int = SAMPLE_SLOTS, history: int = RUN_HISTORY):
+        self.interval = interval
+        self.slots = slots
+        self.history = history
+        self.reader_name, self._reader = tree_reader()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._run_ids = 0
+        self._active = {}  # user_id -> RunTelemetry of the running bot
+        self._runs = {}  # user_id -> deque of finished RunTelemetry, newest last
+
+    def track(self, user_id: str, pid: int, warm: bool = False) -> RunTelemetry:
+        """
+        Start recording a run; it is first sampled one interval after it started. A `warm` run (a
+        standby that was handed the run) is read once now, so its first sample excludes the preload.
+        """
+        baseline = None
+        if warm and self._reader is not None:
+            try:
+                baseline = self._reader([pid]).get(pid) or {}, time.monotonic()
+            except Exception:
+                # Without a baseline the first sample includes the preload
+                pass
+        with self._lock:
+            self._run_ids += 1
+            run = RunTelemetry(self._run_ids, pid, self.slots)
+            if baseline is not None:
+                run.rebase(*baseline)
+            self._active[user_id] = run
+            if self._reader is not None and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._loop, name="bot-telemetry", daemon=True)
+                self._thread.start()
+        return run
+
+    def finish(self, user_id: str, pid: int, state: str, exit_code: int) -> None:
+        """Close the run of `pid` and move it to the user's history."""
+        with self._lock:
+            run = self._active.get(user_id)
+            if run is None or run.pid != pid:
+                return
+            del self._active[user_id]
+            run.finish(state, exit_code)
+            self._runs.setdefault(user_id, deque(maxlen=self.history)).append(run)
+
+    def runs(self, user_id: str) -> list:
+        """Summaries of the user's runs, newest first (the running one, if any, first)."""
+        with self._lock:
+            runs = list(self._runs.get(user_id, ()))
+            if user_id in self._active:
+                runs.append(self._active[user_id])
+        return [run.summary() for run in reversed(runs)]
+
+    def latest(self, user_id: str):
+        """The user's running run, else their most recent finished one, else None."""
+        with self._lock:
+            run = self._active.get(user_id)
+            finished = self._runs.get(user_id)
+            return run or (finished[-1] if finished else None)
+
+    def find(self, user_id: str, run_id: int):
+        with self._lock:
+            runs = list(self._runs.get(user_id, ())) + ([self._active[user_id]] if user_id in self._active else [])
+        return next((run for run in runs if run.run_id == run_id), None)
+
+    def active(self) -> dict:
+        """user_id -> summary of every running bot."""
+        with self._lock:
+            active = dict(self._active)
+        return {user_id: run.summary() for user_id, run in active.items()}
+
+    def sample(self) -> None:
+        """Take one sample of every running tree."""
+        with self._lock:
+            runs = list(self._active.values())
+        if not runs:
+            return
+        trees = self._reader([run.pid for run in runs])
+        now = time.monotonic()
+        for run in runs:
+            tree = trees.get(run.pid)
+            # An exited root is left to finish(); a zombie awaiting reaping reads as an empty tree
+            if tree:
+                run.record(tree, now)
+
+    def _loop(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+            try:
+                self.sample()
+            except Exception:
+                # A failed read loses one sample, never the sampler
+                pass
+
+    def render(self) -> str:
+        """
+        Latest sample of every running bot as Prometheus gauges, labelled by a hash of the user id
+        (user_hash), so the endpoint does not publish who is running the bot.
+        """
+        gauges = (
+            ("bot_cpu_percent", "CPU use of the bot's process tree, percent of one core.", 1),
+            ("bot_rss_bytes", "Resident memory of the bot's process tree.", 2),
+            ("bot_threads", "Threads in the bot's process tree.", 3),
+            ("bot_child_processes", "Processes under the bot (chromedriver, Chrome).", 4),
+        )
+        with self._lock:
+            active = sorted(self._active.items())
+        latest = [(user_id, run.latest_sample()) for user_id, run in active]
+        latest = [(user_id, sample) for user_id, sample in latest if sample is not None]
+        out = []
+        for name, help_text, i in gauges:
+            out += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            out += [f'{name}{{user_hash="{user_hash(user_id)}"}} {sample[i]}' for user_id, sample in latest]
+        return "\n".join(out) + "\n"
+
+
+def user_hash(user_id: str) -> str:
+    """Stable pseudonymous label for a user: the first 12 hex digits of sha256(user_id)."""
+    return hashlib.sha256(str(user_id).encode("utf-8")).hexdigest()[:12]
@@ -0,0 +1,99 @@
+"""
+Chunked, pipelined bulk upsert into a Supabase table.
+Rows are consumed lazily, de-duplicated on the conflict key, sent in fixed-size batches with a
+few batches in flight at once, and failed batches are retried with exponential backoff.
+"""
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+
+
+class BulkUpsertError(Exception):
+    """Raised when one or more batches still fail after all retries."""
+
+    def __init__(self, message: str, result: dict):
+        super().__init__(message)
+        self.result = result
+
+
+def unique_batches(rows, key_columns: tuple, batch_size: int, stats: dict):
+    """Yield lists of unique rows; duplicates of an already seen key are dropped (first one wins)."""
+    seen = set()
+    batch = []
+    for row in rows:
+        key = tuple(row.get(c) for c in key_columns)
+        if key in seen:
+            stats["duplicates"] += 1
+            continue
+        seen.add(key)
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bulk_upsert(
+    sb,
+    table: str,
+    rows,
+    on_conflict: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+) -> dict:
+    """
+    Upsert an iterable of row dicts into `table`. Returns counts and throughput.
+    Raises BulkUpsertError (with the same counts on .result) if any batch could not be written.
+    """
+    key_columns = tuple(c.strip() for c in on_conflict.split(","))
+    stats = {"rows": 0, "duplicates": 0, "batches": 0, "retries": 0, "failed_batches": 0}
+    errors = []
+
+    def send(batch):
+        for attempt in range(retries + 1):
+            try:
+                sb.table(table).upsert(batch, on_conflict=on_conflict).execute()
+                return len(batch), attempt
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                errors.append(e)
+                time.sleep(backoff * (2 ** attempt) * (0.5 + random.random()))
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="bulk-upsert") as pool:
+        pending = set()
+
+        def collect(done):
+            for fut in done:
+                try:
+                    n, attempts = fut.result()
+                    stats["rows"] += n
+                    stats["retries"] += attempts
+                except Exception as e:
+                    stats["failed_batches"] += 1
+                    errors.append(e)
+
+        for batch in unique_batches(rows, key_columns, batch_size, stats):
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(pool.submit(send, batch))
+            stats["batches"] += 1
+        done, _ = wait(pending)
+        collect(done)
+
+    elapsed = time.perf_counter() - t0
+    stats["seconds"] = round(elapsed, 4)
+    stats["rows_per_sec"] = round(stats["rows"] / elapsed, 1) if elapsed > 0 else 0.0
+    if stats["failed_batches"]:
+        raise BulkUpsertError(f"{stats['failed_batches']} batch(es) failed: {errors[-1]}", stats)
+    return stats
@@ -0,0 +1,334 @@
+"""
+Declarative schema of the bot's config: every field once, with its section, type and default.
+Compiled at import into per-field coercers, one render template per config/<section>.py and the
+field lists the readers use, so validating and rendering a full config is a single pass of
+precomputed functions.
+"""
+import math
+import re
+from collections import namedtuple
+
+Field = namedtuple("Field", "name type default")
+
+# Field types: str, int (whole number), number (int or float), bool, list (of strings)
+SCHEMA = {
+    "personals": (
+        Field("first_name", "str", ""),
+        Field("middle_name", "str", ""),
+        Field("last_name", "str", ""),
+        Field("phone_number", "str", ""),
+        Field("current_city", "str", ""),
+        Field("street", "str", ""),
+        Field("state", "str", ""),
+        Field("zipcode", "str", ""),
+        Field("country", "str", ""),
+        Field("ethnicity", "str", "Decline"),
+        Field("gender", "str", "Decline"),
+        Field("disability_status", "str", "Decline"),
+        Field("veteran_status", "str", "Decline"),
+    ),
+    "questions": (
+        Field("default_resume_path", "str", "all resumes/default/resume.pdf"),
+        Field("years_of_experience", "str", "5"),
+        Field("require_visa", "str", "No"),
+        Field("website", "str", ""),
+        Field("linkedIn", "str", ""),
+        Field("us_citizenship", "str", "U.S. Citizen/Permanent Resident"),
+        Field("desired_salary", "int", 120000),
+        Field("current_ctc", "int", 800000),
+        Field("notice_period", "int", 30),
+        Field("linkedin_headline", "str", ""),
+        Field("linkedin_summary", "str", ""),
+        Field("cover_letter", "str", ""),
+        Field("user_information_all", "str", ""),
+        Field("recent_employer", "str", "Not Applicable"),
+        Field("confidence_level", "str", "8"),
+        Field("pause_before_submit", "bool", True),
+        Field("pause_at_failed_question", "bool", True),
+        Field("overwrite_previous_answers", "bool", False),
+    ),
+    "search": (
+        Field("search_terms", "list", ["Software Engineer", "Software Developer"]),
+        Field("search_location", "str", "United States"),
+        Field("switch_number", "int", 30),
+        Field("randomize_search_order", "bool", False),
+        Field("sort_by", "str", ""),
+        Field("date_posted", "str", "Past week"),
+        Field("salary", "str", ""),
+        Field("easy_apply_only", "bool", True),
+        Field("experience_level", "list", []),
+        Field("job_type", "list", []),
+        Field("on_site", "list", []),
+        Field("companies", "list", []),
+        Field("location", "list", []),
+        Field("industry", "list", []),
+        Field("job_function", "list", []),
+        Field("job_titles", "list", []),
+        Field("benefits", "list", []),
+        Field("commitments", "list", []),
+        Field("under_10_applicants", "bool", False),
+        Field("in_your_network", "bool", False),
+        Field("fair_chance_employer", "bool", False),
+        Field("pause_after_filters", "bool", True),
+        Field("about_company_bad_words", "list", []),
+        Field("about_company_good_words", "list", []),
+        Field("bad_words", "list", []),
+        Field("security_clearance", "bool", False),
+        Field("did_masters", "bool", True),
+        Field("current_experience", "int", 5),
+    ),
+    "secrets": (
+        Field("username", "str", "username@example.com"),
+        Field("password", "str", "example_password"),
+        Field("use_AI", "bool", False),
+        Field("ai_provider", "str", "openai"),
+        Field("llm_api_url", "str", "https://api.openai.com/v1/"),
+        Field("llm_api_key", "str", "not-needed"),
+        Field("llm_model", "str", "gpt-5-mini"),
+        Field("llm_spec", "str", "openai"),
+        Field("stream_output", "bool", False),
+    ),
+    "settings": (
+        Field("close_tabs", "bool", False),
+        Field("follow_companies", "bool", False),
+        Field("run_non_stop", "bool", False),
+        Field("alternate_sortby", "bool", True),
+        Field("cycle_date_posted", "bool", True),
+        Field("stop_date_cycle_at_24hr", "bool", True),
+        Field("generated_resume_path", "str", "all resumes/"),
+        Field("file_name", "str", "all excels/all_applied_applications_history.csv"),
+        Field("failed_file_name", "str", "all excels/all_failed_applications_history.csv"),
+        Field("logs_folder_path", "str", "logs/"),
+        Field("click_gap", "number", 1),
+        Field("run_in_background", "bool", False),
+        Field("disable_extensions", "bool", False),
+        Field("safe_mode", "bool", True),
+        Field("smooth_scroll", "bool", False),
+        Field("keep_screen_awake", "bool", True),
+        Field("stealth_mode", "bool", True),
+        Field("showAiErrorAlerts", "bool", False),
+    ),
+}
+
+SECTIONS = tuple(SCHEMA)
+
+_BANNER = """'''
+Author:     Sai Vignesh Golla
+{linkedin}Copyright (C) 2024 Sai Vignesh Golla
+License:    GNU Affero General Public License
+GitHub:     https://github.com/GodsScion/Auto_job_applier_linkedIn
+'''
+
+"""
+_LINKEDIN = "LinkedIn:   https://www.linkedin.com/in/saivigneshgolla/\n"
+_EASY_APPLY = "# >>>>>>>>>>> Easy Apply Questions & Inputs <<<<<<<<<<<\n\n"
+
+# Text above the assignments in each config/<section>.py, as the reference repo ships them
+HEADERS = {
+    "personals": _BANNER.format(linkedin=_LINKEDIN) + _EASY_APPLY,
+    "questions": _BANNER.format(linkedin="") + _EASY_APPLY,
+    "search": _BANNER.format(linkedin="") + "# LINKEDIN SEARCH PREFERENCES\n\n",
+    "secrets": _BANNER.format(linkedin=""),
+    "settings": _BANNER.format(linkedin=""),
+}
+
+
+class ConfigError(ValueError):
+    """Config values that do not match the schema; `errors` maps "section.field" to a message."""
+
+    def __init__(self, errors: dict):
+        super().__init__("Invalid config: " + "; ".join(f"{k}: {v}" for k, v in errors.items()))
+        self.errors = errors
+
+
+# Coercers turn accepted input (including the strings an HTML form sends) into the field's type,
+# or raise ValueError with a user-facing message.
+
+_INT = re.compile(r"^[+-]?\d+$")
+_TRUE = {"true", "1", "yes", "on"}
+_FALSE = {"false", "0", "no", "off", ""}
+
+
+def _to_str(v):
+    if v is None:
+        return ""
+    if isinstance(v, str):
+        return v
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        return str(v)
+    raise ValueError("expected text")
+
+
+def _to_int(v):
+    if isinstance(v, bool):
+        raise ValueError("expected a whole number")
+    if isinstance(v, int):
+        return v
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    if isinstance(v, str) and _INT.match(v.strip()):
+        return int(v.strip())
+    raise ValueError("expected a whole number")
+
+
+def _to_number(v):
+    if isinstance(v, bool):
+        raise ValueError("expected a number")
+    if isinstance(v, int):
+        return v
+    if isinstance(v, str):
+        s = v.strip()
+        if _INT.match(s):
+            return int(s)
+        try:
+            v = float(s)
+        except ValueError:
+            raise ValueError("expected a number")
+    if isinstance(v, float) and math.isfinite(v):
+        return v
+    raise ValueError("expected a number")
+
+
+def _to_bool(v):
+    if isinstance(v, bool):
+        return v
+    if isinstance(v, int) and v in (0, 1):
+        return bool(v)
+    if isinstance(v, str):
+        s = v.strip().lower()
+        if s in _TRUE:
+            return True
+        if s in _FALSE:
+            return False
+    raise ValueError("expected true or false")
+
+
+def _to_list(v):
+    if v is None:
+        return []
+    if isinstance(v, str):
+        return [s.strip() for s in re.split(r"[\n,]+", v) if s.strip()]
+    if isinstance(v, (list, tuple)):
+        out = []
+        for item in v:
+            if isinstance(item, str):
+                out.append(item)
+            elif isinstance(item, (int, float)) and not isinstance(item, bool):
+                out.append(str(item))
+            else:
+                raise ValueError("expected a list of text values")
+        return out
+    raise ValueError("expected a list of text values")
+
+
+def _repr_bool(v) -> str:
+    return "True" if v else "False"
+
+
+def _repr_list(v) -> str:
+    return "[" + ", ".join(repr(x) for x in v) + "]"
+
+
+# type -> (coercer, Python source for a coerced value)
+_TYPES = {
+    "str": (_to_str, repr),
+    "int": (_to_int, str),
+    "number": (_to_number, repr),
+    "bool": (_to_bool, _repr_bool),
+    "list": (_to_list, _repr_list),
+}
+
+_Compiled = namedtuple("_Compiled", "names fields template default_sources")
+
+
+def _compile(section: str, fields: tuple) -> _Compiled:
+    # (name, coercer, to_source) per field, in file order
+    compiled = tuple((f.name,) + _TYPES[f.type] for f in fields)
+    template = HEADERS[section].replace("%", "%%") + "".join(f"{f.name} = %s\n" for f in fields)
+    default_sources = {f.name: _TYPES[f.type][1](f.default) for f in fields}
+    return _Compiled(frozenset(f.name for f in fields), compiled, template, default_sources)
+
+
+_COMPILED = {section: _compile(section, fields) for section, fields in SCHEMA.items()}
+
+# Reader field lists: section -> field names in file order
+FIELD_NAMES = {section: [f.name for f in fields] for section, fields in SCHEMA.items()}
+
+
+def default_config() -> dict:
+    """A fresh default config (lists are copied, so callers may mutate it)."""
+    return {
+        section: {f.name: list(f.default) if f.type == "list" else f.default for f in fields}
+        for section, fields in SCHEMA.items()
+    }
+
+
+def field_types() -> dict:
+    """section -> {field: type}, for clients that build config forms."""
+    return {section: {f.name: f.type for f in fields} for section, fields in SCHEMA.items()}
+
+
+def validate_patch(patch: dict) -> dict:
+    """
+    Coerce the known fields of a (partial) config to their types; unknown sections and fields pass
+    through unchanged. Returns a new dict; raises ConfigError listing every invalid field.
+    """
+    if not isinstance(patch, dict):
+        raise ConfigError({"config": "expected an object of sections"})
+    out, errors = {}, {}
+    for section, data in patch.items():
+        compiled = _COMPILED.get(section)
+        if compiled is None or not isinstance(data, dict):
+            out[section] = data
+            continue
+        clean = {}
+        for name, coerce, _ in compiled.fields:
+            if name in data:
+                try:
+                    clean[name] = coerce(data[name])
+                except ValueError as e:
+                    errors[f"{section}.{name}"] = str(e)
+        for key, value in data.items():
+            if key not in compiled.names:
+                clean[key] = value
+        out[section] = clean
+    if errors:
+        raise ConfigError(errors)
+    return out
+
+
+def normalize_section(section: str, values: dict) -> dict:
+    """Every field of a section from `values`, coerced; missing or invalid values become the default."""
+    out = {}
+    for field, (name, coerce, _) in zip(SCHEMA[section], _COMPILED[section].fields):
+        if name in values:
+            try:
+                out[name] = coerce(values[name])
+                continue
+            except ValueError:
+                pass
+        out[name] = list(field.default) if field.type == "list" else field.default
+    return out
+
+
+def render_config(config: dict) -> dict:
+    """
+    section -> source of config/<section>.py for a full config, validated and rendered in one pass.
+    Missing fields are written with their defaults; raises ConfigError listing every invalid field.
+    """
+    rendered, errors = {}, {}
+    for section, compiled in _COMPILED.items():
+        data = config.get(section) or {}
+        sources = []
+        for name, coerce, to_source in compiled.fields:
+            if name not in data:
+                sources.append(compiled.default_sources[name])
+                continue
+            try:
+                sources.append(to_source(coerce(data[name])))
+            except ValueError as e:
+                errors[f"{section}.{name}"] = str(e)
+        rendered[section] = compiled.template % tuple(sources) if len(sources) == len(compiled.fields) else None
+    if errors:
+        raise ConfigError(errors)
+    return rendered
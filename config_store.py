@@ -0,0 +1,287 @@
+"""
+Per-user config storage helpers: a read-through cache and a write-behind buffer for saves.
+
+Reads keep the serialized body and its hash, so unchanged configs are answered without a database
+query or re-encoding (and with a 304 when the client sends the ETag back).
+Section patches are merged in memory and answered immediately; the merged config is flushed to
+storage at most once per interval (or on demand, e.g. before a pipeline start). Storage writes are
+conditional on the version they were based on, so a concurrent writer is detected and our pending
+patches are re-applied on top of its data instead of overwriting it.
+"""
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from config_schema import SECTIONS as CONFIG_SECTIONS
+
+log = logging.getLogger(__name__)
+
+
+class ConfigConflict(Exception):
+    """The stored config (or the client's view of it) is at a different version than expected."""
+
+    def __init__(self, message: str = "Config was modified concurrently", current=None, version=None):
+        super().__init__(message)
+        self.current = current
+        self.version = version
+
+
+def merge_sections(config: dict, patch: dict) -> dict:
+    """Update config in place with the known sections of patch (each section merged key by key)."""
+    for section in CONFIG_SECTIONS:
+        if section in patch and isinstance(patch[section], dict):
+            config.setdefault(section, {}).update(patch[section])
+    return config
+
+
+def serialize_config(config: dict):
+    """(JSON body bytes, strong ETag) for a config; the ETag is a hash of the canonical body."""
+    body = json.dumps(config, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return body, hashlib.sha256(body).hexdigest()[:32]
+
+
+class ConfigReadCache:
+    """
+    LRU of user_id -> (config, version, body, etag). Entries expire after `ttl` seconds so edits made
+    by another server instance are picked up; writes through this instance invalidate immediately.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str):
+        """(config, version, body, etag) or None. The config dict is shared; do not mutate it."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1:]
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def put(self, user_id: str, config: dict, version):
+        """Cache a config and return its (config, version, body, etag)."""
+        body, etag = serialize_config(config)
+        value = (config, version, body, etag)
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, *value)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, user_id: str = None) -> None:
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+class _Entry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.config = None
+        self.version = 0
+        self.base_version = None  # version of the stored row our config is based on (None = no row)
+        self.patches = []
+        self.dirty = False
+        self.flushing = False
+        self.timer = None
+        self.removed = False
+
+
+class ConfigWriteBehind:
+    """
+    fetch(user_id) -> (config or None, version or None)
+    store(user_id, config, base_version, new_version) writes only if the stored version is still
+    base_version (no row when None) and raises ConfigConflict otherwise.
+    interval <= 0 flushes synchronously on every apply (e.g. serverless, where timers may never fire).
+    """
+
+    def __init__(self, fetch, store, default_config, interval: float = 2.0):
+        self.fetch = fetch
+        self.store = store
+        self.default_config = default_config
+        self.interval = interval
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.stats = {"applied": 0, "flushes": 0, "conflicts": 0, "flush_errors": 0}
+
+    def _entry(self, user_id: str) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                entry = self._entries[user_id] = _Entry()
+            return entry
+
+    def _load(self, user_id: str, entry: _Entry) -> None:
+        """Populate entry from storage on first use. Caller holds entry.lock."""
+        if entry.loaded:
+            return
+        config, version = self.fetch(user_id)
+        entry.config = config if config else self.default_config()
+        entry.base_version = version
+        entry.version = version or 0
+        entry.loaded = True
+
+    def pending(self, user_id: str):
+        """(config copy, version) if this user has unflushed changes, else None."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        with entry.lock:
+            if not entry.dirty:
+                return None
+            return copy.deepcopy(entry.config), entry.version
+
+    def apply(self, user_id: str, patch: dict, if_match=None):
+        """
+        Merge a section patch and return (merged config copy, version).
+        if_match (e.g. werkzeug's request.if_match) is checked against the ETag of the current config
+        (serialize_config); raises ConfigConflict if it is given and does not contain it.
+        """
+        entry = self._entry(user_id)
+        with entry.lock:
+            if entry.removed:
+                # Dropped by a concurrent flush after we looked it up; start from a fresh entry
+                return self.apply(user_id, patch, if_match)
+            self._load(user_id, entry)
+            if if_match and not if_match.contains(serialize_config(entry.config)[1]):
+                raise ConfigConflict(current=copy.deepcopy(entry.config), version=entry.version)
+            merge_sections(entry.config, patch)
+            entry.patches.append(copy.deepcopy(patch))
+            entry.version += 1
+            entry.dirty = True
+            self.stats["applied"] += 1
+            result = copy.deepcopy(entry.config), entry.version
+            if self.interval > 0 and entry.timer is None:
+                entry.timer = threading.Timer(self.interval, self.flush, args=(user_id,))
+                entry.timer.daemon = True
+                entry.timer.start()
+        if self.interval <= 0:
+            self.flush(user_id)
+        return result
+
+    def flush(self, user_id: str, _attempts: int = 3, strict: bool = False) -> bool:
+        """
+        Write this user's pending config now. Returns True when nothing is left pending. A failed
+        write is retried later; with strict, its error (ConfigConflict once the re-applies are
+        exhausted) is also raised to the caller.
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is None:
+            return True
+        with entry.lock:
+            if entry.timer is not None:
+                entry.timer.cancel()
+                entry.timer = None
+            if not entry.dirty:
+                return True
+            if entry.flushing:
+                return False
+            entry.flushing = True
+            config = copy.deepcopy(entry.config)
+            base, version, n = entry.base_version, entry.version, len(entry.patches)
+        try:
+            self.store(user_id, config, base, version)
+        except ConfigConflict:
+            self.stats["conflicts"] += 1
+            log.warning("Config for %s changed concurrently (expected version %s); re-applying pending edits", user_id, base)
+            try:
+                remote, remote_version = self.fetch(user_id)
+            except Exception:
+                remote, remote_version = None, base
+            with entry.lock:
+                rebased = copy.deepcopy(remote) if remote else self.default_config()
+                for patch in entry.patches:
+                    merge_sections(rebased, patch)
+                entry.config = rebased
+                entry.base_version = remote_version
+                entry.version = max(entry.version, remote_version or 0) + 1
+                entry.flushing = False
+            if _attempts > 1:
+                return self.flush(user_id, _attempts - 1, strict)
+            self._reschedule(user_id, entry)
+            if strict:
+                raise
+            return False
+        except Exception:
+            self.stats["flush_errors"] += 1
+            log.exception("Config flush for %s failed; will retry", user_id)
+            with entry.lock:
+                entry.flushing = False
+            self._reschedule(user_id, entry)
+            if strict:
+                raise
+            return False
+        self.stats["flushes"] += 1
+        with entry.lock:
+            entry.flushing = False
+            entry.base_version = version
+            del entry.patches[:n]
+            entry.dirty = bool(entry.patches)
+            if entry.dirty:
+                return self._reschedule(user_id, entry, locked=True)
+        with self._lock, entry.lock:
+            # Clean entries are dropped so memory only holds users with unsaved edits
+            if not entry.dirty and self._entries.get(user_id) is entry:
+                del self._entries[user_id]
+                entry.removed = True
+        return True
+
+    def _reschedule(self, user_id: str, entry: _Entry, locked: bool = False) -> bool:
+        def arm():
+            if entry.timer is None and self.interval > 0:
+                entry.timer = threading.Timer(self.interval, self.flush, args=(user_id,))
+                entry.timer.daemon = True
+                entry.timer.start()
+        if locked:
+            arm()
+        else:
+            with entry.lock:
+                arm()
+        return False
+
+    def flush_all(self) -> None:
+        with self._lock:
+            users = list(self._entries)
+        for user_id in users:
+            self.flush(user_id)
+
+    def forget(self, user_id: str) -> None:
+        """Discard pending edits (after an explicit full replace has been written)."""
+        with self._lock:
+            entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            with entry.lock:
+                entry.removed = True
+                if entry.timer is not None:
+                    entry.timer.cancel()
+                    entry.timer = None
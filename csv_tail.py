@@ -0,0 +1,162 @@
+"""
+Incremental reading of the bot's append-only CSV histories.
+A watermark (inode, byte offset, header, hash of the bytes before the offset) remembers how far
+a previous read got; the next read parses only rows appended since then, or starts over when the
+file was truncated, rotated or rewritten.
+"""
+import csv
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+# Bytes before the watermark offset that must be unchanged for an incremental read
+_CHECK_BYTES = 512
+# Window scanned backwards from EOF to find the last complete line
+_TAIL_WINDOW = 64 * 1024
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _last_newline_end(f, start: int, size: int) -> int:
+    """Return the offset just past the last b"\\n" in [start, size), or start if there is none."""
+    pos = size
+    while pos > start:
+        lo = max(start, pos - _TAIL_WINDOW)
+        f.seek(lo)
+        chunk = f.read(pos - lo)
+        i = chunk.rfind(b"\n")
+        if i != -1:
+            return lo + i + 1
+        pos = lo
+    return start
+
+
+class CsvTail:
+    """
+    One pass over the rows appended to a CSV since `watermark`; a context manager that owns the open file.
+    Iterate rows() (dicts keyed by header) to the end, then persist `watermark`.
+    A trailing partial line (bot mid-write) is left for the next pass.
+    """
+
+    def __init__(self, path: str, watermark: dict = None, force_full: bool = False):
+        self.path = path
+        self.resync_reason = None
+        self._f = open(path, "rb")
+        try:
+            self._scan(watermark or {}, force_full)
+        except BaseException:
+            self._f.close()
+            raise
+
+    def _scan(self, wm: dict, force_full: bool) -> None:
+        st = os.fstat(self._f.fileno())
+        header_line = self._f.readline()
+        header_end = self._f.tell()
+        self.header = next(csv.reader([header_line.decode("utf-8-sig")]), []) if header_line.endswith(b"\n") else []
+        if force_full:
+            self.resync_reason = "requested"
+        elif not wm:
+            self.resync_reason = "no watermark"
+        elif wm.get("inode") != st.st_ino:
+            self.resync_reason = "file rotated"
+        elif wm.get("offset", 0) > st.st_size:
+            self.resync_reason = "file truncated"
+        elif wm.get("header") != self.header:
+            self.resync_reason = "header changed"
+        elif not self._check_matches(wm):
+            self.resync_reason = "file rewritten"
+        self.full = self.resync_reason is not None
+        self.start = header_end if self.full else max(int(wm["offset"]), header_end)
+        self.end = _last_newline_end(self._f, self.start, st.st_size) if self.header else self.start
+        self.watermark = {
+            "inode": st.st_ino,
+            "offset": self.end,
+            "header": self.header,
+            "check_from": max(header_end, self.end - _CHECK_BYTES),
+            "check_hash": None,
+            "last_job_id": None if self.full else wm.get("last_job_id"),
+        }
+        self.watermark["check_hash"] = self._hash_range(self.watermark["check_from"], self.end)
+
+    def _hash_range(self, lo: int, hi: int) -> str:
+        self._f.seek(lo)
+        return _digest(self._f.read(hi - lo))
+
+    def _check_matches(self, wm: dict) -> bool:
+        lo, hi = wm.get("check_from"), wm.get("offset")
+        if lo is None or hi is None or not wm.get("check_hash"):
+            return False
+        return self._hash_range(lo, hi) == wm["check_hash"]
+
+    def _lines(self):
+        self._f.seek(self.start)
+        remaining = self.end - self.start
+        while remaining > 0:
+            line = self._f.readline(remaining)
+            if not line:
+                break
+            remaining -= len(line)
+            yield line.decode("utf-8", errors="replace")
+
+    def rows(self):
+        """Yield appended rows as dicts; updates watermark["last_job_id"] as it goes."""
+        if self.end > self.start:
+            for row in csv.DictReader(self._lines(), fieldnames=self.header):
+                job_id = (row.get("Job ID") or "").strip()
+                if job_id:
+                    self.watermark["last_job_id"] = job_id
+                yield row
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SyncStateStore:
+    """Per-user watermarks persisted as one small JSON file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _key(user_id: str, csv_path: str) -> str:
+        return f"{user_id}:{os.path.abspath(csv_path)}"
+
+    def get(self, user_id: str, csv_path: str) -> dict:
+        with self._lock:
+            return self._load().get(self._key(user_id, csv_path)) or {}
+
+    def set(self, user_id: str, csv_path: str, watermark: dict) -> None:
+        with self._lock:
+            state = self._load()
+            state[self._key(user_id, csv_path)] = watermark
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)),
+                                       prefix="." + os.path.basename(self.path) + ".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(state, f)
+                os.replace(tmp, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
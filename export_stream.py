@@ -0,0 +1,84 @@
+"""
+Streaming export of applied jobs as NDJSON or CSV.
+Rows are produced lazily (range-paged from Supabase or read line by line from the bot CSV)
+and encoded in small chunks, so memory stays flat regardless of history size.
+"""
+import csv
+import io
+import json
+import zlib
+
+from applied_index import csv_row_to_job, supabase_row_to_job
+
+EXPORT_PAGE_SIZE = 1000
+# Flush encoded output once this many bytes are buffered
+CHUNK_BYTES = 64 * 1024
+JOB_FIELDS = ["Job_ID", "Title", "Company", "HR_Name", "HR_Link", "Job_Link", "External_Job_link", "Date_Applied"]
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def iter_supabase_jobs(sb, user_id: str, page_size: int = EXPORT_PAGE_SIZE):
+    """Yield a user's jobs oldest first (like the bot CSV), fetching one range page at a time."""
+    start = 0
+    while True:
+        r = sb.table("applied_jobs").select(
+            "job_id, title, company, hr_name, hr_link, job_link, external_job_link, date_applied"
+        ).eq("user_id", user_id).order("created_at").order("id").range(
+            start, start + page_size - 1
+        ).execute()
+        rows = r.data or []
+        for row in rows:
+            yield supabase_row_to_job(row)
+        if len(rows) < page_size:
+            return
+        start += page_size
+
+
+def iter_csv_jobs(path: str):
+    """Yield jobs from the bot CSV in file order without loading it all."""
+    with open(path, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield csv_row_to_job(row)
+
+
+def _chunked(pieces):
+    buf, size = [], 0
+    for piece in pieces:
+        buf.append(piece)
+        size += len(piece)
+        if size >= CHUNK_BYTES:
+            yield b"".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield b"".join(buf)
+
+
+def encode_ndjson(jobs):
+    return _chunked(json.dumps(job, ensure_ascii=False).encode("utf-8") + b"\n" for job in jobs)
+
+
+def encode_csv(jobs):
+    def lines():
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=JOB_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        yield out.getvalue().encode("utf-8")
+        for job in jobs:
+            out.seek(0)
+            out.truncate()
+            writer.writerow(job)
+            yield out.getvalue().encode("utf-8")
+    return _chunked(lines())
+
+
+ENCODERS = {"ndjson": encode_ndjson, "csv": encode_csv}
+
+
+def gzip_stream(chunks, level: int = 6):
+    """Gzip-compress an iterable of byte chunks on the fly."""
+    comp = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = comp.compress(chunk)
+        if data:
+            yield data
+    yield comp.flush()
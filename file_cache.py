@@ -0,0 +1,92 @@
+"""
+In-memory cache for parsed files, keyed by (path, mtime_ns, size).
+A cached value is reused until the file changes on disk or is explicitly invalidated.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from request_metrics import timed
+
+
+class FileCache:
+    """
+    Bounded LRU cache of loader(path) results.
+    Entries are evicted least-recently-used first once max_entries or max_bytes
+    (sum of cached file sizes) is exceeded. Cached values are shared: callers must not mutate them.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # path -> (stamp, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _stamp(path: str):
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, path: str, loader):
+        """Return loader(path), reusing the cached result while the file is unchanged. Raises OSError if missing."""
+        path = os.path.abspath(path)
+        stamp = self._stamp(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+        with timed("disk"):
+            value = loader(path)
+        # Re-stat so a write that raced the load is not cached under the newer stamp
+        if self._stamp(path) != stamp:
+            return value
+        size = stamp[1]
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size <= self.max_bytes:
+                self._entries[path] = (stamp, size, value)
+                self._bytes += size
+                self._evict()
+        return value
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def invalidate(self, path: str = None) -> None:
+        """Drop one path, or everything when path is None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            old = self._entries.pop(os.path.abspath(path), None)
+            if old is not None:
+                self._bytes -= old[1]
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+# Shared by config_io (reference/config/*.py) and app (config.json, applied jobs CSV)
+file_cache = FileCache()
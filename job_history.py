@@ -0,0 +1,243 @@
+"""
+The bot's two CSV histories side by side: applications (all_applied_applications_history.csv) and
+failed attempts (all_failed_applications_history.csv).
+HISTORIES describes how each maps to its Supabase table and to the API job shape. A HistoryIndex
+keeps both in memory, fed only the rows appended since the last read (CsvTail watermark), with a
+job_id map so "was this job already attempted?" is a dict lookup; listings serve either history or
+both merged newest first.
+"""
+import heapq
+import os
+import threading
+from collections import namedtuple
+
+from applied_index import AppliedJobsIndex, csv_row_to_job, encode_cursor, supabase_row_to_job
+from csv_tail import CsvTail
+
+FAILED_CSV_NAME = "all_failed_applications_history.csv"
+# Cursor keys of each history inside a merged (source=all) cursor
+MERGED_KEYS = (("a", "applied"), ("f", "failed"))
+
+
+def failed_csv_row_to_job(row: dict) -> dict:
+    """Map a failed-applications CSV row to the API job shape (the stack trace is left out)."""
+    return {
+        "Job_ID": row.get("Job ID"),
+        "Job_Link": row.get("Job Link"),
+        "External_Job_link": row.get("External Job link"),
+        "Resume_Tried": row.get("Resume Tried"),
+        "Date_Listed": row.get("Date listed"),
+        "Date_Tried": row.get("Date Tried"),
+        "Reason": row.get("Assumed Reason"),
+        "Screenshot_Name": row.get("Screenshot Name"),
+    }
+
+
+def supabase_failed_row_to_job(row: dict) -> dict:
+    """Map a failed_jobs table row to the API job shape."""
+    return {
+        "Job_ID": row.get("job_id"),
+        "Job_Link": row.get("job_link"),
+        "External_Job_link": row.get("external_job_link"),
+        "Resume_Tried": row.get("resume_tried"),
+        "Date_Listed": row.get("date_listed"),
+        "Date_Tried": row.get("date_tried"),
+        "Reason": row.get("reason"),
+        "Screenshot_Name": row.get("screenshot_name"),
+    }
+
+
+def _clean(row: dict, column: str) -> str:
+    return (row.get(column) or "").strip()
+
+
+def applied_record(user_id: str, row: dict):
+    """applied_jobs row for a bot CSV row, or None when it has no Job ID."""
+    job_id = _clean(row, "Job ID")
+    if not job_id:
+        return None
+    return {
+        "user_id": user_id,
+        "job_id": job_id,
+        "title": _clean(row, "Title"),
+        "company": _clean(row, "Company"),
+        "hr_name": _clean(row, "HR Name"),
+        "hr_link": _clean(row, "HR Link"),
+        "job_link": _clean(row, "Job Link"),
+        "external_job_link": _clean(row, "External Job link"),
+        "date_applied": _clean(row, "Date Applied"),
+    }
+
+
+def failed_record(user_id: str, row: dict):
+    """failed_jobs row for a failed-applications CSV row, or None when it has no Job ID."""
+    job_id = _clean(row, "Job ID")
+    if not job_id:
+        return None
+    return {
+        "user_id": user_id,
+        "job_id": job_id,
+        "job_link": _clean(row, "Job Link"),
+        "external_job_link": _clean(row, "External Job link"),
+        "resume_tried": _clean(row, "Resume Tried"),
+        "date_listed": _clean(row, "Date listed"),
+        "date_tried": _clean(row, "Date Tried"),
+        "reason": _clean(row, "Assumed Reason"),
+        "stack_trace": row.get("Stack Trace") or "",
+        "screenshot_name": _clean(row, "Screenshot Name"),
+    }
+
+
+History = namedtuple("History", [
+    "table",  # Supabase table
+    "conflict",  # upsert conflict key
+    "columns",  # columns selected for listings
+    "date_column",  # column filtered by date_from/date_to
+    "search_columns",  # columns matched by q
+    "has_company",  # whether rows have a company (filtered by ?company=)
+    "date_key",  # job field holding the date, in the API shape
+    "text_keys",  # job fields matched by q, in the API shape
+    "from_csv",  # bot CSV row -> API job
+    "from_row",  # table row -> API job
+    "to_record",  # (user_id, bot CSV row) -> table row or None
+])
+
+HISTORIES = {
+    "applied": History(
+        table="applied_jobs",
+        conflict="user_id,job_id",
+        columns="id, created_at, job_id, title, company, hr_name, hr_link, job_link, external_job_link, date_applied",
+        date_column="date_applied",
+        search_columns=("title", "company"),
+        has_company=True,
+        date_key="Date_Applied",
+        text_keys=("Title", "Company"),
+        from_csv=csv_row_to_job,
+        from_row=supabase_row_to_job,
+        to_record=applied_record,
+    ),
+    # A job can fail on several runs, so attempts are keyed by when they happened too
+    "failed": History(
+        table="failed_jobs",
+        conflict="user_id,job_id,date_tried",
+        columns="id, created_at, job_id, job_link, external_job_link, resume_tried, date_listed, date_tried, "
+                "reason, screenshot_name",
+        date_column="date_tried",
+        search_columns=("reason",),
+        has_company=False,
+        date_key="Date_Tried",
+        text_keys=("Reason",),
+        from_csv=failed_csv_row_to_job,
+        from_row=supabase_failed_row_to_job,
+        to_record=failed_record,
+    ),
+}
+
+
+def tag(job: dict, source: str) -> dict:
+    """The job with its history recorded as Source, so merged listings can tell them apart."""
+    job["Source"] = source
+    return job
+
+
+class HistoryIndex:
+    """
+    Listing indexes and a job_id map for both CSV histories, brought up to date on refresh() with
+    only the appended rows (a rewritten or rotated file is re-read from the start).
+    """
+
+    def __init__(self, applied_path: str, failed_path: str):
+        self.paths = {"applied": applied_path, "failed": failed_path}
+        self.indexes = {}
+        self._watermarks = {}
+        self._stamps = {}
+        self._lock = threading.Lock()
+        for source in self.paths:
+            self._reset(source)
+
+    def _reset(self, source: str) -> None:
+        history = HISTORIES[source]
+        self.indexes[source] = AppliedJobsIndex(date_key=history.date_key, text_keys=history.text_keys)
+        self._watermarks[source] = None
+
+    def refresh(self) -> None:
+        with self._lock:
+            for source, path in self.paths.items():
+                self._refresh(source, path)
+
+    def _refresh(self, source: str, path: str) -> None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            if self._watermarks[source] is not None:
+                self._reset(source)
+            self._stamps[source] = None
+            return
+        stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+        if stamp == self._stamps.get(source):
+            return
+        try:
+            tail = CsvTail(path, self._watermarks[source])
+        except FileNotFoundError:
+            self._reset(source)
+            return
+        history = HISTORIES[source]
+        with tail:
+            if tail.full:
+                # Built aside and swapped in, so readers keep the old index until the new one is complete
+                index = AppliedJobsIndex(date_key=history.date_key, text_keys=history.text_keys)
+            else:
+                index = self.indexes[source]
+            index.extend(tag(history.from_csv(row), source) for row in tail.rows())
+            self.indexes[source] = index
+            self._watermarks[source] = tail.watermark
+            self._stamps[source] = stamp
+
+    def attempts(self, job_id: str) -> dict:
+        """Every recorded application and failed attempt of a job, oldest first."""
+        return {source: index.find(job_id) for source, index in self.indexes.items()}
+
+    def attempted(self, job_id: str) -> bool:
+        return any(index.find(job_id) for index in self.indexes.values())
+
+    def query(self, source: str, limit: int, cursor: dict = None, q: str = None, company: str = None,
+              date_from: str = None, date_to: str = None) -> dict:
+        if source != "all":
+            return self.indexes[source].query(limit, cursor, q, company, date_from, date_to)
+        cursor = cursor or {}
+        bounds, streams = {}, []
+        for key, name in MERGED_KEYS:
+            index = self.indexes[name]
+            bounds[key] = min(int(cursor.get(key, len(index))), len(index))
+            streams.append(self._stream(key, index, index.matches(bounds[key], q, company, date_from, date_to)))
+        page = []
+        more = False
+        # Each stream is newest first by position; merge on the date so both histories interleave
+        for _, key, pos, job in heapq.merge(*streams, reverse=True):
+            if len(page) == limit:
+                more = True
+                break
+            page.append(job)
+            bounds[key] = pos
+        return {"jobs": page, "next_cursor": encode_cursor(bounds) if more else None}
+
+    @staticmethod
+    def _stream(key: str, index: AppliedJobsIndex, positions):
+        for pos in positions:
+            job = index.jobs[pos]
+            yield (job.get(index.date_key) or ""), key, pos, job
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def history_index(applied_path: str, failed_path: str) -> HistoryIndex:
+    """Process-wide, refreshed index for a pair of CSV paths."""
+    key = (os.path.abspath(applied_path), os.path.abspath(failed_path))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = HistoryIndex(applied_path, failed_path)
+    index.refresh()
+    return index
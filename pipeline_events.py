@@ -0,0 +1,51 @@
+"""
+Versioned pipeline state with change notification.
+Every transition (starting, running, exited, stopped, failed) bumps a version counter so clients
+can long-poll or stream updates instead of polling on a timer.
+"""
+import threading
+import time
+
+
+class PipelineState:
+    """Current pipeline state plus a monotonically increasing version; waiters wake on each change."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._version = 0
+        self._state = {"state": "stopped", "running": False}
+
+    def publish(self, state: str, **fields) -> dict:
+        """Replace the state (running is derived from it) and wake all waiters."""
+        with self._cond:
+            self._version += 1
+            self._state = {
+                "state": state,
+                "running": state in ("starting", "running"),
+                "changed_at": time.time(),
+                **fields,
+            }
+            self._cond.notify_all()
+            return self._snapshot()
+
+    def _snapshot(self) -> dict:
+        return {**self._state, "version": self._version}
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return self._snapshot()
+
+    def wait(self, version: int, timeout: float) -> dict:
+        """Return the state once its version differs from `version`, or the unchanged state after `timeout`."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._version != version, timeout)
+            return self._snapshot()
+
+
+def watch_process(proc, on_exit) -> threading.Thread:
+    """Call on_exit(proc, returncode) from a daemon thread as soon as proc exits."""
+    def run():
+        on_exit(proc, proc.wait())
+    t = threading.Thread(target=run, name=f"bot-watch-{proc.pid}", daemon=True)
+    t.start()
+    return t
@@ -0,0 +1,82 @@
+"""
+Bounded log capture for the bot process.
+Reader threads drain the child's stdout/stderr (so it never blocks on a full pipe) into a
+fixed-size ring buffer of lines; clients read or stream lines after a sequence offset.
+"""
+import threading
+import time
+from collections import deque
+
+DEFAULT_MAX_LINES = 2000
+# Longer lines (e.g. progress output without newlines) are split into pieces of this size
+MAX_LINE_BYTES = 4096
+
+
+class LogBuffer:
+    """
+    Ring buffer of (seq, stream, text, ts) entries. seq increases by one per line for the whole run,
+    so a reader can resume from the last seq it saw; lines older than the buffer are reported as dropped.
+    """
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES):
+        self._lines = deque(maxlen=max_lines)
+        self._cond = threading.Condition()
+        self._next_seq = 0
+        self._open_streams = 0
+        self.finished = False
+
+    def append(self, stream: str, text: str) -> None:
+        with self._cond:
+            self._lines.append((self._next_seq, stream, text, time.time()))
+            self._next_seq += 1
+            self._cond.notify_all()
+
+    def read(self, offset: int = 0, limit: int = 500) -> dict:
+        """Lines with seq >= offset (at most `limit`), the offset to resume from, and how many were dropped."""
+        with self._cond:
+            first = self._lines[0][0] if self._lines else self._next_seq
+            dropped = max(0, first - offset)
+            start = max(offset, first) - first
+            lines = [
+                {"seq": seq, "stream": stream, "text": text, "ts": ts}
+                for seq, stream, text, ts in list(self._lines)[start:start + limit]
+            ]
+            next_offset = lines[-1]["seq"] + 1 if lines else max(offset, first)
+            return {
+                "lines": lines,
+                "next_offset": next_offset,
+                "dropped": dropped,
+                "finished": self.finished and next_offset >= self._next_seq,
+            }
+
+    def wait(self, offset: int, timeout: float) -> bool:
+        """Block until a line with seq >= offset exists or the run finished; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._next_seq > offset or self.finished, timeout)
+
+    def _drain(self, pipe, stream: str) -> None:
+        try:
+            for raw in iter(lambda: pipe.readline(MAX_LINE_BYTES), b""):
+                self.append(stream, raw.decode("utf-8", errors="replace").rstrip("\r\n"))
+        except (OSError, ValueError):
+            pass
+        finally:
+            try:
+                pipe.close()
+            except OSError:
+                pass
+            with self._cond:
+                self._open_streams -= 1
+                if self._open_streams <= 0:
+                    self.finished = True
+                self._cond.notify_all()
+
+    def attach(self, proc) -> None:
+        """Start daemon threads draining proc.stdout and proc.stderr into this buffer."""
+        pipes = [(p, name) for p, name in ((proc.stdout, "stdout"), (proc.stderr, "stderr")) if p is not None]
+        with self._cond:
+            self._open_streams = len(pipes)
+            if not pipes:
+                self.finished = True
+        for pipe, name in pipes:
+            threading.Thread(target=self._drain, args=(pipe, name), name=f"bot-{name}", daemon=True).start()
@@ -0,0 +1,365 @@
+"""
+Per-user bot pipelines: isolated working directories, a concurrency cap, and a FIFO start queue.
+Each user has their own state channel and log buffer; when a run ends the next queued user starts.
+Every run's process tree is sampled for CPU, memory, threads and children (bot_telemetry).
+With warm start on, runs are handed to a standby interpreter that has already imported the bot's
+dependencies (bot_standby), and a new standby is started in the background for the next run.
+"""
+import json
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+
+from auth_supabase import LOCAL_USER
+from bot_telemetry import TelemetrySampler
+from config_io import write_all_config
+from pipeline_events import PipelineState, watch_process
+from pipeline_logs import LogBuffer, DEFAULT_MAX_LINES
+from request_metrics import timed
+
+# Used when no user is signed in: runs directly in the shared reference checkout
+# Directories each user gets a private copy of; other directories link back to the reference repo
+PRIVATE_DIRS = ("config", "all excels", "logs")
+# Rough footprint of one bot run (Python + Chrome) used to size the default concurrency cap
+BOT_CPUS = 1
+BOT_RAM_MB = 1536
+# PIPELINE_WARM_START=1 keeps one standby interpreter ready for the next start
+WARM_START = os.environ.get("PIPELINE_WARM_START") == "1"
+STANDBY_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bot_standby.py")
+
+
+def _total_ram_mb() -> int:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return 0
+
+
+def default_max_concurrent() -> int:
+    """PIPELINE_MAX_CONCURRENT if set, else what CPU count and RAM allow (at least 1)."""
+    env = os.environ.get("PIPELINE_MAX_CONCURRENT")
+    if env and env.isdigit() and int(env) > 0:
+        return int(env)
+    limit = max(1, (os.cpu_count() or 1) // BOT_CPUS)
+    ram = _total_ram_mb()
+    if ram:
+        limit = min(limit, ram // BOT_RAM_MB)
+    return max(1, limit)
+
+
+class UserPipeline:
+    """Pipeline slot for one user: state channel, latest log buffer, process, and pending config."""
+
+    def __init__(self, user_id: str, workdir: str):
+        self.user_id = user_id
+        self.workdir = workdir
+        self.state = PipelineState()
+        self.logs = None
+        self.proc = None
+        self.config = None
+        self.queued_at = None
+        # Slot reserved while the workdir is prepared and the bot spawned outside the scheduler lock
+        self.launching = False
+        self.stop_requested = False
+
+
+class PipelineScheduler:
+    """Starts, queues and stops bot runs keyed by user_id."""
+
+    def __init__(self, reference_dir: str, workdirs_root: str, max_concurrent: int = None,
+                 run_script: str = "runAiBot.py", warm_start: bool = None):
+        self.reference_dir = reference_dir
+        self.workdirs_root = workdirs_root
+        self.max_concurrent = max_concurrent or default_max_concurrent()
+        self.run_script = run_script
+        self.warm_start = WARM_START if warm_start is None else warm_start
+        self._lock = threading.RLock()
+        self._users = {}
+        self._queue = deque()
+        self._standby = None
+        self.telemetry = TelemetrySampler()
+        if self.warm_start:
+            self._respawn_standby()
+
+    # Working directories
+
+    def workdir_for(self, user_id: str) -> str:
+        if user_id == LOCAL_USER:
+            return self.reference_dir
+        safe = re.sub(r"[^A-Za-z0-9_-]", "_", user_id)
+        return os.path.join(self.workdirs_root, safe)
+
+    def prepare_workdir(self, user_id: str) -> str:
+        """
+        Create or refresh the user's workdir: private config/, all excels/ and logs/; other directories
+        are symlinked (copied where symlinks are unavailable) to the reference repo. Top-level files are
+        copied, because Python puts the real directory of the script on sys.path and a symlinked
+        runAiBot.py would import the shared config/.
+        """
+        workdir = self.workdir_for(user_id)
+        if workdir == self.reference_dir:
+            return workdir
+        os.makedirs(workdir, exist_ok=True)
+        for name in os.listdir(self.reference_dir):
+            if name in (".git", "__pycache__"):
+                continue
+            src, dst = os.path.join(self.reference_dir, name), os.path.join(workdir, name)
+            if not os.path.isdir(src):
+                if not os.path.exists(dst) or os.path.getmtime(src) > os.path.getmtime(dst):
+                    shutil.copy2(src, dst)
+                continue
+            if os.path.lexists(dst):
+                continue
+            if name in PRIVATE_DIRS:
+                if name == "config":
+                    shutil.copytree(src, dst, ignore=shutil.ignore_patterns("__pycache__"))
+                else:
+                    os.makedirs(dst)
+                continue
+            try:
+                os.symlink(src, dst, target_is_directory=True)
+            except (OSError, NotImplementedError):
+                shutil.copytree(src, dst)
+        for name in PRIVATE_DIRS:
+            os.makedirs(os.path.join(workdir, name), exist_ok=True)
+        return workdir
+
+    # Lookup
+
+    def _user(self, user_id: str) -> UserPipeline:
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                user = self._users[user_id] = UserPipeline(user_id, self.workdir_for(user_id))
+            return user
+
+    def state(self, user_id: str) -> PipelineState:
+        return self._user(user_id).state
+
+    def logs(self, user_id: str):
+        return self._user(user_id).logs
+
+    def running_count(self) -> int:
+        with self._lock:
+            return sum(1 for u in self._users.values() if u.proc is not None or u.launching)
+
+    def queue_position(self, user_id: str):
+        """1-based position in the start queue, or None if not queued."""
+        with self._lock:
+            try:
+                return self._queue.index(user_id) + 1
+            except ValueError:
+                return None
+
+    def status(self, user_id: str) -> dict:
+        snapshot = self.state(user_id).snapshot()
+        position = self.queue_position(user_id)
+        if position is not None:
+            snapshot["queue_position"] = position
+        return snapshot
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "running": self.running_count(),
+                "queued": len(self._queue),
+                "telemetry": self.telemetry.reader_name,
+                "warm_start": self.warm_start,
+                "standby_pid": self._standby.pid if self._standby is not None else None,
+            }
+
+    # Start / stop
+
+    def start(self, user_id: str, config: dict) -> dict:
+        """
+        Start the user's bot with `config`, or queue it when the concurrency cap is reached.
+        Raises RuntimeError if the user already has a running or queued pipeline.
+        """
+        with self._lock:
+            user = self._user(user_id)
+            if user.proc is not None or user.launching or user_id in self._queue:
+                raise RuntimeError("Pipeline already running")
+            user.config = config
+            if self.running_count() >= self.max_concurrent:
+                user.queued_at = time.time()
+                self._queue.append(user_id)
+                user.state.publish("queued", queue_position=len(self._queue))
+                return self.status(user_id)
+            user.launching = True
+        return self._launch(user)
+
+    def _launch(self, user: UserPipeline) -> dict:
+        """
+        Write config into the user's workdir and spawn the bot. The caller has reserved the slot
+        (user.launching) and released the lock; it is taken again only to publish the run.
+        """
+        user.state.publish("starting")
+        try:
+            with timed("disk"):
+                workdir = self.prepare_workdir(user.user_id)
+                changed = write_all_config(user.config, os.path.join(workdir, "config"))
+        except Exception as e:
+            return self._launch_failed(user, f"Failed to write config: {e}")
+        run_script = os.path.join(workdir, self.run_script)
+        if not os.path.exists(run_script):
+            return self._launch_failed(user, f"{self.run_script} not found")
+        try:
+            with timed("subprocess"):
+                proc = self._take_standby(workdir, run_script) if self.warm_start else None
+                warm = proc is not None
+                if proc is None:
+                    proc = self._spawn([sys.executable, run_script], workdir)
+        except Exception as e:
+            return self._launch_failed(user, str(e))
+        finally:
+            if self.warm_start:
+                self._respawn_standby()
+        with self._lock:
+            user.workdir = workdir
+            user.launching = False
+            user.proc = proc
+            user.config = None
+            user.logs = LogBuffer(int(os.environ.get("PIPELINE_LOG_LINES", DEFAULT_MAX_LINES)))
+            user.logs.attach(proc)
+            snapshot = user.state.publish(
+                "running", pid=proc.pid, warm=warm, config_changed=[section for section, c in changed.items() if c]
+            )
+            stop_requested, user.stop_requested = user.stop_requested, False
+        self.telemetry.track(user.user_id, proc.pid, warm=warm)
+        watch_process(proc, lambda p, code: self._on_exit(user, p, code))
+        if stop_requested:
+            self.stop(user.user_id)
+        return snapshot
+
+    def _launch_failed(self, user: UserPipeline, error: str) -> dict:
+        """Publish a failed start and hand the reserved slot to the next queued user."""
+        with self._lock:
+            user.launching = user.stop_requested = False
+            snapshot = user.state.publish("failed", error=error)
+        self._dispatch()
+        return snapshot
+
+    @staticmethod
+    def _spawn(args: list, cwd: str, stdin=None):
+        return subprocess.Popen(
+            args,
+            cwd=cwd,
+            stdin=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env={**os.environ, "PYTHONUNBUFFERED": "1"},
+            creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == "nt" else 0,
+        )
+
+    # Warm start
+
+    def _start_standby(self) -> None:
+        try:
+            proc = self._spawn([sys.executable, STANDBY_SCRIPT], self.reference_dir, stdin=subprocess.PIPE)
+        except Exception:
+            # Starts fall back to a fresh interpreter
+            return
+        with self._lock:
+            if self._standby is None:
+                self._standby = proc
+                return
+        # Another standby is already waiting; closing stdin makes this one exit
+        proc.stdin.close()
+
+    def _respawn_standby(self) -> None:
+        """Start a standby interpreter in the background, unless one is already waiting."""
+        if self._standby is None:
+            threading.Thread(target=self._start_standby, name="bot-standby", daemon=True).start()
+
+    def close_standby(self) -> None:
+        """Let the waiting standby exit (it sees stdin close) and start no more."""
+        with self._lock:
+            self.warm_start = False
+            proc, self._standby = self._standby, None
+        if proc is not None:
+            proc.stdin.close()
+
+    def _take_standby(self, workdir: str, run_script: str):
+        """Hand a run to the waiting standby; returns its process, or None when there is none."""
+        with self._lock:
+            proc, self._standby = self._standby, None
+        if proc is None:
+            return None
+        try:
+            if proc.poll() is not None:
+                raise OSError(f"standby exited with {proc.returncode}")
+            proc.stdin.write(json.dumps({"cwd": workdir, "script": run_script}).encode("utf-8") + b"\n")
+            proc.stdin.close()
+        except OSError:
+            proc.kill()
+            proc.wait()
+            return None
+        return proc
+
+    def _on_exit(self, user: UserPipeline, proc, returncode: int) -> None:
+        with self._lock:
+            if user.proc is proc:
+                user.proc = None
+            state = "stopped" if getattr(proc, "stop_requested", False) else "exited"
+            self.telemetry.finish(user.user_id, proc.pid, state, returncode)
+            user.state.publish(state, pid=proc.pid, exit_code=returncode)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Start queued users while there is capacity. Called without the lock held, as _launch does IO."""
+        with self._lock:
+            reserved = []
+            while self._queue and self.running_count() < self.max_concurrent:
+                user = self._users[self._queue.popleft()]
+                user.launching = True
+                reserved.append(user)
+            for i, user_id in enumerate(self._queue):
+                user = self._users[user_id]
+                if user.state.snapshot().get("queue_position") != i + 1:
+                    user.state.publish("queued", queue_position=i + 1)
+        for user in reserved:
+            self._launch(user)
+
+    def stop(self, user_id: str, timeout: float = 10) -> bool:
+        """Stop the user's running bot or drop it from the queue. Returns False if there was nothing to stop."""
+        with self._lock:
+            user = self._user(user_id)
+            if user_id in self._queue:
+                self._queue.remove(user_id)
+                user.config = None
+                user.state.publish("stopped")
+                dequeued = True
+            elif user.launching:
+                # _launch stops the bot as soon as it is published
+                user.stop_requested = True
+                return True
+            else:
+                dequeued = False
+            proc = user.proc
+        if dequeued:
+            self._dispatch()
+            return True
+        if proc is None:
+            return False
+        proc.stop_requested = True
+        try:
+            if os.name == "nt":
+                proc.terminate()
+            else:
+                os.kill(proc.pid, signal.SIGTERM)
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        except Exception:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+        return True
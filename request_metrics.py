@@ -0,0 +1,234 @@
+"""
+Request metrics and slow-request profiling for the Flask app.
+
+Every request is counted by route, method and status, timed into a per-route latency histogram, and
+split into phases (auth, supabase, disk, subprocess) reported by the code doing that work through
+add_phase()/timed(). The totals are rendered in Prometheus text format for GET /metrics.
+
+With PROFILE_SLOW_MS set, a sampler thread records the stacks of threads serving requests every
+PROFILE_INTERVAL_MS; requests slower than the threshold have their samples written as folded stacks
+(flamegraph.pl / speedscope input) to PROFILE_DIR.
+"""
+import contextvars
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+PHASES = ("auth", "supabase", "disk", "subprocess")
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Phase seconds of the request being served by this thread (None outside a request)
+_phases = contextvars.ContextVar("request_phases", default=None)
+
+
+def add_phase(phase: str, seconds: float) -> None:
+    """Attribute `seconds` of the current request to `phase`; a no-op outside a request."""
+    phases = _phases.get()
+    if phases is not None:
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed(phase: str):
+    """Time the enclosed block into `phase` of the current request."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_phase(phase, time.perf_counter() - t0)
+
+
+class _RouteStats:
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.seconds = 0.0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+
+
+class RequestMetrics:
+    """Counters and histograms keyed by route rule (not raw path, to keep label cardinality bounded)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = {}  # (method, route, status) -> count
+        self._routes = {}  # route -> _RouteStats
+        self._in_flight = 0
+
+    def started(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def record(self, method: str, route: str, status: int, seconds: float, phases: dict) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            key = (method, route, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = _RouteStats()
+            stats.count += 1
+            stats.seconds += seconds
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    stats.buckets[i] += 1
+                    break
+            for phase, value in phases.items():
+                stats.phases[phase] = stats.phases.get(phase, 0.0) + value
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        out = [
+            "# HELP http_requests_total Requests by method, route and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        with self._lock:
+            requests = sorted(self._requests.items())
+            routes = sorted(self._routes.items())
+            in_flight = self._in_flight
+        for (method, route, status), count in requests:
+            out.append(f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+        out += [
+            "# HELP http_request_errors_total Requests answered with a 5xx status, by route.",
+            "# TYPE http_request_errors_total counter",
+        ]
+        errors = {}
+        for (_, route, status), count in requests:
+            if status >= 500:
+                errors[route] = errors.get(route, 0) + count
+        for route, count in sorted(errors.items()):
+            out.append(f'http_request_errors_total{{route="{_escape(route)}"}} {count}')
+        out += [
+            "# HELP http_request_duration_seconds Time until the response object was returned, by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for route, stats in routes:
+            label = f'route="{_escape(route)}"'
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS, stats.buckets):
+                cumulative += n
+                out.append(f'http_request_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+            out.append(f'http_request_duration_seconds_bucket{{{label},le="+Inf"}} {stats.count}')
+            out.append(f"http_request_duration_seconds_sum{{{label}}} {stats.seconds:.6f}")
+            out.append(f"http_request_duration_seconds_count{{{label}}} {stats.count}")
+        out += [
+            "# HELP http_request_phase_seconds_total Time spent in auth, Supabase, disk and subprocess work, by route.",
+            "# TYPE http_request_phase_seconds_total counter",
+        ]
+        for route, stats in routes:
+            for phase, seconds in sorted(stats.phases.items()):
+                out.append(
+                    f'http_request_phase_seconds_total{{route="{_escape(route)}",phase="{phase}"}} {seconds:.6f}'
+                )
+        out += [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {in_flight}",
+        ]
+        return "\n".join(out) + "\n"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class SlowRequestProfiler:
+    """Samples the stacks of registered threads; dumps folded stacks for requests over the threshold."""
+
+    def __init__(self, threshold_ms: float, interval_ms: float = 5.0, out_dir: str = "profiles"):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.out_dir = out_dir
+        self._active = {}  # thread ident -> {folded stack: samples}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.dumped = 0
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    continue
+                frames = sys._current_frames()
+                for ident, samples in self._active.items():
+                    frame = frames.get(ident)
+                    if frame is None or ident == me:
+                        continue
+                    stack = _fold(frame)
+                    samples[stack] = samples.get(stack, 0) + 1
+
+    def begin(self) -> None:
+        with self._lock:
+            self._active[threading.get_ident()] = {}
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+
+    def end(self, route: str, seconds: float):
+        """Stop sampling this thread; returns the dump path when the request was slow, else None."""
+        with self._lock:
+            samples = self._active.pop(threading.get_ident(), None)
+        if not samples or seconds < self.threshold:
+            return None
+        os.makedirs(self.out_dir, exist_ok=True)
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", route).strip("_") or "root"
+        path = os.path.join(self.out_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{int(seconds * 1000)}ms.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(samples.items()):
+                f.write(f"{stack} {count}\n")
+        self.dumped += 1
+        return path
+
+
+def _fold(frame) -> str:
+    """Root-first 'file:function' frames joined by ';' (the folded stack format)."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def init_app(app, metrics: RequestMetrics, profiler: SlowRequestProfiler = None) -> None:
+    """Install before/after hooks on a Flask app that feed `metrics` (and `profiler`, if given)."""
+    from flask import g, request
+
+    @app.before_request
+    def _start_request_metrics():
+        g._metrics_token = _phases.set({})
+        g._metrics_t0 = time.perf_counter()
+        metrics.started()
+        if profiler is not None:
+            profiler.begin()
+
+    def finish(status: int) -> None:
+        t0 = g.pop("_metrics_t0", None)
+        if t0 is None:
+            return
+        seconds = time.perf_counter() - t0
+        route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+        metrics.record(request.method, route, status, seconds, _phases.get() or {})
+        if profiler is not None:
+            path = profiler.end(route, seconds)
+            if path:
+                app.logger.warning("Slow request %s %s took %.0f ms; stacks in %s",
+                                   request.method, request.path, seconds * 1000, path)
+
+    @app.after_request
+    def _record_request_metrics(response):
+        finish(response.status_code)
+        return response
+
+    @app.teardown_request
+    def _reset_request_phases(exc):
+        # after_request is skipped when a response could not be produced; count those as 500s
+        finish(500)
+        token = g.pop("_metrics_token", None)
+        if token is not None:
+            _phases.reset(token)
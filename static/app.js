@@ -0,0 +1,552 @@
+(function() {
+'use strict';
+const API = '/api';
+let config = { personals: {}, questions: {}, search: {}, secrets: {}, settings: {} };
+let statusSource = null;
+// Incremented by each watchPipelineStatus call, so an older long-poll loop stops
+let statusWatch = 0;
+let supabase = null;
+let authToken = null;
+// With the sqlite backend, signed-out users sync into the local database as well
+let localStorageBackend = false;
+
+async function initSupabase() {
+  try {
+    const r = await fetch(API + '/auth/env');
+    const env = await r.json();
+    localStorageBackend = env.STORAGE_BACKEND === 'sqlite';
+    if (env.SUPABASE_URL && env.SUPABASE_ANON_KEY && typeof window.supabase !== 'undefined') {
+      supabase = window.supabase.createClient(env.SUPABASE_URL, env.SUPABASE_ANON_KEY);
+      supabase.auth.onAuthStateChange((event, session) => {
+        authToken = session?.access_token || null;
+        updateAuthUI(session?.user);
+        if (event === 'SIGNED_IN' || event === 'TOKEN_REFRESHED') loadConfig();
+        if (event === 'SIGNED_IN' || event === 'TOKEN_REFRESHED') loadJobsPanel();
+        if (event === 'SIGNED_IN' || event === 'SIGNED_OUT') { watchPipelineStatus(); streamLogs(true); }
+        if (event === 'TOKEN_REFRESHED') reopenStreams();
+      });
+      const { data: { session } } = await supabase.auth.getSession();
+      authToken = session?.access_token || null;
+      updateAuthUI(session?.user);
+    } else {
+      updateAuthUI(null);
+    }
+  } catch (e) {
+    updateAuthUI(null);
+  }
+}
+
+function updateAuthUI(user) {
+  const status = document.getElementById('authStatus');
+  const btnIn = document.getElementById('btnSignIn');
+  const btnOut = document.getElementById('btnSignOut');
+  const btnSync = document.getElementById('btnSyncJobs');
+  if (!status || !btnIn) return;
+  if (user) {
+    status.textContent = 'Signed in as ' + (user.email || user.id);
+    btnIn.style.display = 'none';
+    if (btnOut) btnOut.style.display = 'inline-flex';
+    if (btnSync) btnSync.style.display = 'inline-flex';
+  } else {
+    status.textContent = 'Not signed in — config and jobs are local.';
+    btnIn.style.display = 'inline-flex';
+    if (btnOut) btnOut.style.display = 'none';
+    if (btnSync) btnSync.style.display = localStorageBackend ? 'inline-flex' : 'none';
+  }
+}
+
+// EventSource cannot send headers, so streams carry the token as a query parameter
+function streamUrl(path) {
+  return API + path + (authToken ? (path.indexOf('?') === -1 ? '?' : '&') + 'access_token=' + encodeURIComponent(authToken) : '');
+}
+
+// Streams carry the token in their URL, and the server refuses an expired one, so reconnect them
+// with the new token (logs resume where they left off); the long-poll fallback, which stops on a
+// 401, is restarted too
+function reopenStreams() {
+  if (statusSource || typeof EventSource === 'undefined') watchPipelineStatus();
+  if (logSource) streamLogs(false);
+}
+
+function authHeaders() {
+  const h = { 'Content-Type': 'application/json' };
+  if (authToken) h['Authorization'] = 'Bearer ' + authToken;
+  return h;
+}
+
+function showToast(msg, isError = false) {
+  const el = document.getElementById('toast');
+  el.textContent = msg;
+  el.classList.toggle('error', isError);
+  el.classList.add('show');
+  clearTimeout(el._t);
+  el._t = setTimeout(() => el.classList.remove('show'), 3000);
+}
+
+function parseList(val) {
+  if (Array.isArray(val)) return val;
+  if (typeof val !== 'string') return [];
+  return val.split(/[\n,]+/).map(s => s.trim()).filter(Boolean);
+}
+function formatList(arr) { return Array.isArray(arr) ? arr.join(', ') : ''; }
+
+// section -> {field: type} from /api/config/schema (str, int, number, bool, list)
+let configFieldTypes = {};
+
+async function loadConfigSchema() {
+  try {
+    const r = await fetch(API + '/config/schema');
+    if (r.ok) configFieldTypes = await r.json();
+  } catch (e) {
+    // Without types, values are sent as typed and the server coerces them
+  }
+}
+
+function fieldType(section, key) {
+  return (configFieldTypes[section] || {})[key];
+}
+
+function formToConfig() {
+  const out = { personals: {}, questions: {}, search: {}, secrets: {}, settings: {} };
+  document.querySelectorAll('[name^="personals."], [name^="questions."], [name^="search."], [name^="secrets."], [name^="settings."]').forEach(el => {
+    const [section, key] = el.name.split('.');
+    const type = fieldType(section, key);
+    let value = el.type === 'checkbox' ? el.checked : el.value;
+    if (type === 'list') value = parseList(value);
+    else if (type === 'int' || type === 'number') value = value === '' ? (key === 'current_experience' ? -1 : 0) : Number(value);
+    out[section][key] = value;
+  });
+  return out;
+}
+
+function configToForm(data) {
+  config = data;
+  document.querySelectorAll('[name^="personals."], [name^="questions."], [name^="search."], [name^="secrets."], [name^="settings."]').forEach(el => {
+    const [section, key] = el.name.split('.');
+    const val = data[section] && data[section][key];
+    if (el.type === 'checkbox') el.checked = !!val;
+    else if (fieldType(section, key) === 'list' || Array.isArray(val)) el.value = formatList(val);
+    else el.value = val == null ? '' : val;
+  });
+}
+
+async function loadConfig() {
+  try {
+    if (!Object.keys(configFieldTypes).length) await loadConfigSchema();
+    const r = await fetch(API + '/config', { headers: authHeaders() });
+    const data = await r.json();
+    if (data.error) throw new Error(data.error);
+    configToForm(data);
+  } catch (e) {
+    showToast('Failed to load config: ' + e.message, true);
+  }
+}
+
+async function saveConfig() {
+  const payload = formToConfig();
+  try {
+    const r = await fetch(API + '/config', { method: 'PUT', headers: authHeaders(), body: JSON.stringify(payload) });
+    const data = await r.json();
+    if (data.error) throw new Error(data.error);
+    configToForm(data);
+    showToast('Config saved.');
+  } catch (e) {
+    showToast('Save failed: ' + e.message, true);
+  }
+}
+
+async function loadFromReference() {
+  try {
+    const r = await fetch(API + '/config/load-from-reference', { method: 'POST', headers: authHeaders() });
+    const data = await r.json();
+    if (data.error) throw new Error(data.error);
+    configToForm(data);
+    showToast('Loaded from reference repo.');
+  } catch (e) {
+    showToast('Load failed: ' + e.message, true);
+  }
+}
+
+let jobsCursor = null;
+let jobsRows = [];
+const JOBS_PAGE_SIZE = 50;
+
+function jobsQuery(cursor) {
+  const params = new URLSearchParams({ limit: String(JOBS_PAGE_SIZE) });
+  const source = document.getElementById('jobsSource');
+  if (source && source.value !== 'applied') params.set('source', source.value);
+  const filters = { q: 'jobsQ', company: 'jobsCompany', date_from: 'jobsFrom', date_to: 'jobsTo' };
+  Object.keys(filters).forEach(k => {
+    const el = document.getElementById(filters[k]);
+    if (el && el.value.trim()) params.set(k, el.value.trim());
+  });
+  if (cursor) params.set('cursor', cursor);
+  return params.toString();
+}
+
+async function loadAppliedJobs(append = false) {
+  try {
+    const r = await fetch(API + '/applied-jobs?' + jobsQuery(append ? jobsCursor : null), { headers: authHeaders() });
+    const data = await r.json();
+    if (data.error) throw new Error(data.error);
+    jobsRows = append ? jobsRows.concat(data.jobs || []) : (data.jobs || []);
+    jobsCursor = data.next_cursor || null;
+    renderJobsList(jobsRows);
+  } catch (e) {
+    jobsCursor = null;
+    renderJobsList(append ? jobsRows : []);
+  }
+  const more = document.getElementById('btnJobsMore');
+  if (more) more.style.display = jobsCursor ? 'inline-flex' : 'none';
+}
+
+async function loadJobsStats() {
+  const el = document.getElementById('jobsStats');
+  if (!el) return;
+  try {
+    const r = await fetch(API + '/applied-jobs/stats?days=14&top=5', { headers: authHeaders() });
+    const s = await r.json();
+    if (s.error) throw new Error(s.error);
+    const max = Math.max(1, ...s.per_day.map(d => d.count));
+    el.innerHTML =
+      '<div class="stat"><span class="stat-value">' + s.total + '</span><span class="stat-label">Total</span></div>' +
+      '<div class="stat"><span class="stat-value">' + s.this_week + '</span><span class="stat-label">This week</span></div>' +
+      '<div class="stat"><span class="stat-value">' + s.today + '</span><span class="stat-label">Today</span></div>' +
+      '<div class="stat stat-days" title="Applications per day, last 14 days">' +
+        s.per_day.map(d => '<span class="bar" style="height:' + Math.round(100 * d.count / max) + '%" title="' + d.date + ': ' + d.count + '"></span>').join('') +
+      '</div>' +
+      '<div class="stat stat-companies">' + (s.top_companies.length
+        ? s.top_companies.map(c => escapeHtml(c.company) + ' <span class="stat-label">' + c.count + '</span>').join(' · ')
+        : '<span class="stat-label">No companies yet</span>') + '</div>';
+  } catch (e) {
+    el.innerHTML = '';
+  }
+}
+
+function loadJobsPanel() {
+  loadAppliedJobs();
+  loadJobsStats();
+}
+
+function renderJobsList(jobs) {
+  const el = document.getElementById('jobsList');
+  if (!jobs.length) {
+    el.innerHTML = '<p style="color: var(--textMuted);">No jobs found. Run the pipeline or Sync from bot CSV (when signed in).</p>';
+    return;
+  }
+  el.innerHTML = '<table class="jobs-table"><thead><tr><th>Title</th><th>Company</th><th>HR</th><th>Link</th><th>Applied</th></tr></thead><tbody>' +
+    jobs.map(j => {
+      if (j.Source === 'failed') return renderFailedJob(j);
+      const title = (j.Title || j.title || '').trim() || '—';
+      const company = (j.Company || j.company || '').trim() || '—';
+      const hr = (j.HR_Name || j.hr_name || '').trim() || '—';
+      const link = (j.External_Job_link || j.external_job_link || j.Job_Link || j.job_link || '').trim();
+      const applied = (j.Date_Applied || j.date_applied || '').trim() || '—';
+      const jobLink = (j.Job_Link || j.job_link || '').trim();
+      return '<tr><td>' + linkHtml(jobLink, title) +
+        '</td><td>' + escapeHtml(company) + '</td><td>' + linkHtml((j.HR_Link || j.hr_link || '').trim(), hr) +
+        '</td><td>' + externalLinkHtml(link) +
+        '</td><td>' + escapeHtml(applied) + '</td></tr>';
+    }).join('') + '</tbody></table>';
+}
+
+function renderFailedJob(j) {
+  const jobLink = (j.Job_Link || '').trim();
+  const label = 'Job ' + (j.Job_ID || '').trim();
+  const link = (j.External_Job_link || '').trim();
+  return '<tr class="job-failed"><td>' + linkHtml(jobLink, label) +
+    '</td><td>—</td><td><span class="job-failed-reason">Failed: ' + escapeHtml((j.Reason || '').trim() || 'unknown reason') + '</span>' +
+    '</td><td>' + externalLinkHtml(link) +
+    '</td><td>' + escapeHtml((j.Date_Tried || '').trim() || '—') + '</td></tr>';
+}
+
+function escapeHtml(s) {
+  const div = document.createElement('div');
+  div.textContent = s;
+  return div.innerHTML;
+}
+
+// Link cells come from the bot's CSVs (or rows synced from them), so only http(s) URLs become links,
+// and both the URL and the text are escaped
+function linkHtml(url, text) {
+  if (!/^https?:\/\//i.test(url || '')) return escapeHtml(text);
+  return '<a href="' + escapeHtml(url).replace(/"/g, '&quot;') + '" target="_blank" rel="noopener">' + escapeHtml(text) + '</a>';
+}
+
+// External job link column: a link, or the text the bot wrote instead (e.g. "Easy Applied")
+function externalLinkHtml(link) {
+  if (/^https?:\/\//i.test(link || '')) return linkHtml(link, 'External');
+  return escapeHtml(link || '—');
+}
+
+async function syncAppliedJobs() {
+  try {
+    let r = await fetch(API + '/applied-jobs/sync', { method: 'POST', headers: authHeaders() });
+    let data = await r.json();
+    // 202: the sync continues in the background; poll its status until it finishes
+    while (r.status === 202) {
+      showToast('Sync still running…');
+      await new Promise(resolve => setTimeout(resolve, 2000));
+      r = await fetch(API + '/applied-jobs/sync', { headers: authHeaders() });
+      data = await r.json();
+    }
+    if (data.error) throw new Error(data.error);
+    const failed = data.failed ? data.failed.synced : 0;
+    showToast((data.full_resync
+      ? 'Resynced ' + (data.resynced || 0) + ' jobs.'
+      : 'Synced ' + (data.new || 0) + ' new jobs.' + (data.skipped ? ' Skipped ' + data.skipped + '.' : '')) +
+      (failed ? ' ' + failed + ' failed attempts.' : ''));
+    loadJobsPanel();
+  } catch (e) {
+    showToast('Sync failed: ' + e.message, true);
+  }
+}
+
+async function exportAppliedJobs() {
+  try {
+    const r = await fetch(API + '/applied-jobs/export?format=csv', { headers: authHeaders() });
+    if (!r.ok) throw new Error((await r.json()).error || r.statusText);
+    const url = URL.createObjectURL(await r.blob());
+    const a = document.createElement('a');
+    a.href = url;
+    a.download = 'applied_jobs.csv';
+    a.click();
+    URL.revokeObjectURL(url);
+  } catch (e) {
+    showToast('Export failed: ' + e.message, true);
+  }
+}
+
+let lastPipelineState = null;
+
+function onPipelineState(status) {
+  const prev = lastPipelineState;
+  lastPipelineState = status.state || null;
+  updatePipelineUI(status);
+  if (status.state === 'running' && prev && prev !== 'running') streamLogs(true);
+  if (prev === 'running' && status.state === 'exited') {
+    showToast('Pipeline exited' + (status.exit_code != null ? ' with code ' + status.exit_code : '') + '.', status.exit_code !== 0);
+  }
+}
+
+// Push-based status: SSE when available, otherwise long-poll on the version counter
+function watchPipelineStatus() {
+  if (statusSource) statusSource.close();
+  if (typeof EventSource !== 'undefined') {
+    statusSource = new EventSource(streamUrl('/pipeline/events'));
+    statusSource.addEventListener('state', function(e) { onPipelineState(JSON.parse(e.data)); });
+    statusSource.addEventListener('end', function() { statusSource.close(); });
+    return;
+  }
+  const watch = ++statusWatch;
+  (async function longPoll() {
+    let version = '';
+    let delay = 0;
+    // Ends when a newer watch (sign-in/out) replaces this one
+    while (watch === statusWatch) {
+      let r = null;
+      try {
+        r = await fetch(API + '/pipeline/status?wait=30&version=' + version, { headers: authHeaders() });
+      } catch (e) {
+        // Network error: back off below
+      }
+      if (r && r.status === 200) {
+        const status = await r.json();
+        onPipelineState(status);
+        if (status.vercel) return;
+        version = String(status.version);
+        delay = 0;
+      } else if (r && r.status === 304) {
+        delay = 0;
+      } else if (r && r.status === 401) {
+        // Session expired: polling resumes when auth changes (watchPipelineStatus is called again)
+        return;
+      } else {
+        // Errors (5xx, 503 while storage is down, network) back off exponentially instead of re-requesting at once
+        delay = Math.min(delay ? delay * 2 : 1000, 60000);
+        await new Promise(function(res) { setTimeout(res, delay); });
+      }
+    }
+  })();
+}
+
+function updatePipelineUI(status) {
+  if (!status) return;
+  const wrap = document.getElementById('pipelineStatus');
+  const text = document.getElementById('pipelineStatusText');
+  const startBtn = document.getElementById('btnStart');
+  const stopBtn = document.getElementById('btnStop');
+  if (wrap) wrap.classList.remove('running');
+  if (text) text.textContent = 'Stopped';
+  if (startBtn) startBtn.disabled = false;
+  if (stopBtn) stopBtn.disabled = true;
+  if (status.vercel) {
+    if (text) text.textContent = 'Unavailable (run locally to use pipeline)';
+    if (startBtn) startBtn.disabled = true;
+    if (stopBtn) stopBtn.disabled = true;
+  } else if (status.state === 'queued') {
+    if (text) text.textContent = 'Queued' + (status.queue_position ? ' (position ' + status.queue_position + ')' : '');
+    if (startBtn) startBtn.disabled = true;
+    if (stopBtn) stopBtn.disabled = false;
+  } else if (status.running) {
+    if (wrap) wrap.classList.add('running');
+    if (text) text.textContent = status.state === 'starting' ? 'Starting…' : 'Running' + (status.pid ? ' (PID ' + status.pid + ')' : '');
+    if (startBtn) startBtn.disabled = true;
+    if (stopBtn) stopBtn.disabled = false;
+  } else {
+    if (text) text.textContent = status.state === 'exited'
+      ? 'Exited' + (status.exit_code != null ? ' (code ' + status.exit_code + ')' : '')
+      : status.state === 'failed' ? 'Failed to start' : 'Stopped';
+    if (startBtn) startBtn.disabled = false;
+    if (stopBtn) stopBtn.disabled = true;
+  }
+}
+
+let logSource = null;
+let logOffset = 0;
+const MAX_LOG_LINES = 1000;
+
+function appendLogLine(line) {
+  const el = document.getElementById('pipelineLogs');
+  if (!el) return;
+  const stick = el.scrollTop + el.clientHeight >= el.scrollHeight - 4;
+  const row = document.createElement('div');
+  if (line.stream === 'stderr') row.className = 'stderr';
+  row.textContent = line.text;
+  el.appendChild(row);
+  while (el.childNodes.length > MAX_LOG_LINES) el.removeChild(el.firstChild);
+  if (stick) el.scrollTop = el.scrollHeight;
+}
+
+function streamLogs(reset) {
+  if (typeof EventSource === 'undefined') return;
+  if (reset) {
+    logOffset = 0;
+    const el = document.getElementById('pipelineLogs');
+    if (el) el.innerHTML = '';
+  }
+  if (logSource) logSource.close();
+  logSource = new EventSource(streamUrl('/pipeline/logs/stream?offset=' + logOffset));
+  logSource.onmessage = function(e) {
+    const line = JSON.parse(e.data);
+    logOffset = line.seq + 1;
+    appendLogLine(line);
+  };
+  logSource.addEventListener('dropped', function(e) {
+    appendLogLine({ stream: 'stderr', text: '… ' + JSON.parse(e.data).count + ' earlier lines dropped' });
+  });
+  logSource.addEventListener('end', function() {
+    logSource.close();
+    logSource = null;
+  });
+}
+
+async function startPipeline() {
+  await saveConfig();
+  const payload = { config: formToConfig() };
+  try {
+    const r = await fetch(API + '/pipeline/start', { method: 'POST', headers: authHeaders(), body: JSON.stringify(payload) });
+    const data = await r.json();
+    if (data.error) throw new Error(data.error);
+    updatePipelineUI(data);
+    if (data.state === 'queued') {
+      showToast('Pipeline queued at position ' + data.queue_position + '.');
+    } else {
+      streamLogs(true);
+      showToast('Pipeline started.');
+    }
+  } catch (e) {
+    showToast('Start failed: ' + e.message, true);
+  }
+}
+
+async function stopPipeline() {
+  try {
+    const r = await fetch(API + '/pipeline/stop', { method: 'POST', headers: authHeaders() });
+    const data = await r.json();
+    updatePipelineUI(data);
+    showToast(data.message || 'Pipeline stopped.');
+  } catch (e) {
+    showToast('Stop failed: ' + e.message, true);
+  }
+}
+
+// Event delegation for tabs so clicks always work
+const tabsContainer = document.querySelector('.tabs');
+if (tabsContainer) {
+  tabsContainer.addEventListener('click', function(e) {
+    const t = e.target.closest('.tab');
+    if (!t || !t.dataset.tab) return;
+    document.querySelectorAll('.tab').forEach(x => x.classList.remove('active'));
+    document.querySelectorAll('.panel').forEach(x => x.classList.remove('active'));
+    t.classList.add('active');
+    const panel = document.getElementById('panel-' + t.dataset.tab);
+    if (panel) panel.classList.add('active');
+    if (t.dataset.tab === 'jobs') loadJobsPanel();
+  });
+}
+
+const btnSave = document.getElementById('btnSave');
+if (btnSave) btnSave.addEventListener('click', function() { saveConfig(); });
+const btnLoadRef = document.getElementById('btnLoadRef');
+if (btnLoadRef) btnLoadRef.addEventListener('click', function() { loadFromReference(); });
+const btnStart = document.getElementById('btnStart');
+if (btnStart) btnStart.addEventListener('click', function() { startPipeline(); });
+const btnStop = document.getElementById('btnStop');
+if (btnStop) {
+  btnStop.disabled = true;
+  btnStop.addEventListener('click', function() { stopPipeline(); });
+}
+const btnSync = document.getElementById('btnSyncJobs');
+if (btnSync) btnSync.addEventListener('click', function() { syncAppliedJobs(); });
+const btnExport = document.getElementById('btnExportJobs');
+if (btnExport) btnExport.addEventListener('click', function() { exportAppliedJobs(); });
+const btnJobsMore = document.getElementById('btnJobsMore');
+if (btnJobsMore) btnJobsMore.addEventListener('click', function() { loadAppliedJobs(true); });
+const jobsSource = document.getElementById('jobsSource');
+if (jobsSource) jobsSource.addEventListener('change', function() { loadAppliedJobs(); });
+let jobsFilterTimer = null;
+['jobsQ', 'jobsCompany', 'jobsFrom', 'jobsTo'].forEach(function(id) {
+  const el = document.getElementById(id);
+  if (el) el.addEventListener('input', function() {
+    clearTimeout(jobsFilterTimer);
+    jobsFilterTimer = setTimeout(function() { loadAppliedJobs(); }, 300);
+  });
+});
+
+const btnSignIn = document.getElementById('btnSignIn');
+if (btnSignIn) {
+  btnSignIn.addEventListener('click', function() {
+    if (!supabase) {
+      showToast('Supabase not configured. Set SUPABASE_URL and SUPABASE_ANON_KEY in Vercel.', true);
+      return;
+    }
+    var redirectTo = window.location.origin + window.location.pathname;
+    supabase.auth.signInWithOAuth({ provider: 'google', options: { redirectTo: redirectTo } }).catch(function(e) {
+      showToast('Sign in failed: ' + (e && e.message ? e.message : 'Unknown error'), true);
+    });
+  });
+}
+const btnSignOut = document.getElementById('btnSignOut');
+if (btnSignOut) {
+  btnSignOut.addEventListener('click', function() {
+    if (supabase) supabase.auth.signOut();
+    authToken = null;
+    updateAuthUI(null);
+    loadConfig();
+    loadJobsPanel();
+  });
+}
+
+(async function init() {
+  try {
+    await initSupabase();
+    await loadConfig();
+    loadJobsPanel();
+    streamLogs(false);
+    watchPipelineStatus();
+  } catch (err) {
+    if (typeof showToast === 'function') showToast('Page load error: ' + (err && err.message ? err.message : 'Unknown'), true);
+  }
+})();
+})();
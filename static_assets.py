@@ -0,0 +1,156 @@
+"""
+Precompressed, cache-busted serving of the dashboard's static assets.
+app.css and app.js are served at content-hashed URLs (/assets/app.<hash>.js) with immutable caching;
+index.html refers to them by those URLs and is served with an ETag and revalidated on every load.
+Every asset is compressed once per process (gzip, plus brotli when the brotli package is installed)
+and the encoding is picked from Accept-Encoding.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SHELL = "index.html"
+# Assets referenced from the shell as "/<name>" and rewritten to their hashed URL
+HASHED_ASSETS = ("app.css", "app.js")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+# Below this size compression does not pay for its headers
+MIN_COMPRESS_BYTES = 512
+
+
+class _Asset:
+    def __init__(self, name: str, body: bytes, digest: str, cache_control: str):
+        self.name = name
+        self.mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        self.digest = digest
+        self.cache_control = cache_control
+        self.variants = {"identity": body}
+        if len(body) >= MIN_COMPRESS_BYTES:
+            self.variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.variants["br"] = brotli.compress(body, quality=11)
+
+    def etag(self, encoding: str) -> str:
+        # Strong ETags must differ between encodings of the same content
+        return self.digest if encoding == "identity" else f"{self.digest}-{encoding}"
+
+
+def _choose_encoding(available) -> str:
+    """Best encoding the client accepts: brotli, then gzip, else identity."""
+    accept = request.accept_encodings
+    for encoding in ("br", "gzip"):
+        if encoding in available and accept.quality(encoding) > 0:
+            return encoding
+    return "identity"
+
+
+class StaticAssets:
+    """
+    Builds the asset table on first use and rebuilds it when a source file changes
+    (checked by mtime on each request, so local edits show up without a restart).
+    """
+
+    def __init__(self, static_dir: str, prefix: str = "/assets/"):
+        self.static_dir = static_dir
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._shell = None
+        self._hashed = {}  # "app.<hash>.js" -> _Asset
+        self._urls = {}  # "app.js" -> "/assets/app.<hash>.js"
+
+    def _sources_stamp(self):
+        stamp = []
+        for name in (SHELL,) + HASHED_ASSETS:
+            try:
+                stamp.append(os.stat(os.path.join(self.static_dir, name)).st_mtime_ns)
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _read(self, name: str):
+        try:
+            with open(os.path.join(self.static_dir, name), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _build(self) -> None:
+        hashed, urls = {}, {}
+        for name in HASHED_ASSETS:
+            body = self._read(name)
+            if body is None:
+                continue
+            digest = hashlib.sha256(body).hexdigest()[:12]
+            stem, ext = os.path.splitext(name)
+            hashed_name = f"{stem}.{digest}{ext}"
+            hashed[hashed_name] = _Asset(name, body, digest, IMMUTABLE)
+            urls[name] = self.prefix + hashed_name
+        shell = self._read(SHELL)
+        if shell is not None:
+            for name, url in urls.items():
+                shell = shell.replace(f'"/{name}"'.encode(), f'"{url}"'.encode())
+            shell = _Asset(SHELL, shell, hashlib.sha256(shell).hexdigest()[:16], REVALIDATE)
+        self._shell, self._hashed, self._urls = shell, hashed, urls
+
+    def _ensure(self) -> None:
+        stamp = self._sources_stamp()
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    self._build()
+                    self._stamp = stamp
+
+    def url_for(self, name: str) -> str:
+        """Hashed URL for a static asset name (the plain /name when it is not a hashed asset)."""
+        self._ensure()
+        return self._urls.get(name, "/" + name)
+
+    def shell_response(self):
+        """index.html with hashed asset URLs, or 404 if it is missing."""
+        self._ensure()
+        if self._shell is None:
+            return Response("Not found", status=404, mimetype="text/plain")
+        return self._respond(self._shell)
+
+    def asset_response(self, hashed_name: str):
+        """A hashed asset by its /assets/ file name; 404 for unknown or outdated hashes."""
+        self._ensure()
+        asset = self._hashed.get(hashed_name)
+        if asset is None:
+            return Response("Not found", status=404, mimetype="text/plain")
+        return self._respond(asset)
+
+    def _respond(self, asset: _Asset):
+        encoding = _choose_encoding(asset.variants)
+        etag = asset.etag(encoding)
+        if request.if_none_match.contains(etag):
+            resp = Response(status=304)
+        else:
+            resp = Response(asset.variants[encoding], mimetype=asset.mimetype)
+            if encoding != "identity":
+                resp.headers["Content-Encoding"] = encoding
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = asset.cache_control
+        resp.vary.add("Accept-Encoding")
+        return resp
+
+    def stats(self) -> dict:
+        """Sizes per asset and encoding (bytes)."""
+        self._ensure()
+        assets = dict(self._hashed)
+        if self._shell is not None:
+            assets[SHELL] = self._shell
+        return {
+            name: {encoding: len(body) for encoding, body in asset.variants.items()}
+            for name, asset in assets.items()
+        }
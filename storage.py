@@ -0,0 +1,114 @@
+"""
+Per-user storage behind the signed-in routes: config rows and the applied/failed job histories.
+
+Storage is the interface the app codes against; STORAGE_BACKEND picks the implementation:
+"supabase" (storage_supabase, the hosted tables of supabase/schema.sql) or "sqlite"
+(storage_sqlite, one local database file with the same tables and indexes). Listings are keyset
+pages, newest first (created_at desc, id desc); a merged source=all page is built here from the
+per-table pages, so both backends page and merge identically.
+"""
+from abc import ABC, abstractmethod
+
+from applied_index import encode_cursor
+from job_history import HISTORIES, MERGED_KEYS, tag
+
+BACKENDS = ("supabase", "sqlite")
+
+
+class Storage(ABC):
+    """Per-user config and job history storage. Implementations define every abstract method."""
+
+    name = None
+
+    def _gather(self, calls) -> list:
+        """Run independent zero-argument calls and return their results in order (serially by default)."""
+        return [call() for call in calls]
+
+    # Config
+
+    @abstractmethod
+    def fetch_config(self, user_id: str):
+        """(config, version) stored for user_id; (None, None) if there is no row."""
+
+    @abstractmethod
+    def store_config(self, user_id: str, config: dict, base_version, new_version: int) -> None:
+        """
+        Write config at new_version only if the stored row is still at base_version (no row when None);
+        raises ConfigConflict when another writer got there first.
+        """
+
+    # Job histories
+
+    @abstractmethod
+    def history_rows(self, user_id: str, source: str, params: dict, cursor: dict, limit: int) -> list:
+        """
+        Up to `limit` table rows of one history, newest first, below `cursor` ({"c": created_at, "i": id}).
+        history_page only passes a company filter for histories with has_company.
+        """
+
+    @abstractmethod
+    def job_rows(self, user_id: str, source: str, job_id: str) -> list:
+        """Table rows of one history for job_id, oldest first."""
+
+    @abstractmethod
+    def stats(self, user_id: str, days: int, top: int) -> dict:
+        """Dashboard aggregates in applied_stats.summarize's shape."""
+
+    @abstractmethod
+    def upsert_history(self, user_id: str, source: str, records) -> dict:
+        """
+        Insert or update an iterable of table rows (job_history.HISTORIES[source].to_record output) on the
+        history's conflict key. Returns counts: rows, duplicates (repeated keys, first one wins), batches.
+        """
+
+    @abstractmethod
+    def iter_applied(self, user_id: str):
+        """Yield the user's applied jobs oldest first, in the API job shape."""
+
+    # Built on the methods above
+
+    def history_page(self, user_id: str, params: dict) -> dict:
+        """
+        One keyset page of a user's applied jobs, failed attempts, or both (source=all: the newest rows
+        of the two tables merged, with a cursor position per table).
+        """
+        limit, source, cursor = params["limit"], params["source"], params["cursor"]
+        if source != "all":
+            rows = self._page_rows(user_id, source, params, cursor, limit + 1)
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = encode_cursor({"c": rows[-1]["created_at"], "i": rows[-1]["id"]})
+            return {"jobs": [tag(HISTORIES[source].from_row(row), source) for row in rows], "next_cursor": next_cursor}
+        cursor = cursor or {}
+        pages = self._gather([
+            (lambda name=name, key=key: self._page_rows(user_id, name, params, cursor.get(key), limit + 1))
+            for key, name in MERGED_KEYS
+        ])
+        merged = []
+        for (key, name), rows in zip(MERGED_KEYS, pages):
+            for row in rows:
+                merged.append((row["created_at"], row["id"], key, name, row))
+        merged.sort(key=lambda m: (m[0], m[1]), reverse=True)
+        bounds = {key: cursor[key] for key, _ in MERGED_KEYS if cursor.get(key)}
+        jobs = []
+        for created_at, row_id, key, name, row in merged[:limit]:
+            jobs.append(tag(HISTORIES[name].from_row(row), name))
+            bounds[key] = {"c": created_at, "i": row_id}
+        return {"jobs": jobs, "next_cursor": encode_cursor(bounds) if len(merged) > limit else None}
+
+    def _page_rows(self, user_id: str, source: str, params: dict, cursor: dict, limit: int) -> list:
+        if params["company"] and not HISTORIES[source].has_company:
+            # Rows without a company (failed attempts) never match a company filter
+            return []
+        return self.history_rows(user_id, source, params, cursor, limit)
+
+    def job_attempts(self, user_id: str, job_id: str) -> dict:
+        """source -> every recorded application / failed attempt of job_id, oldest first."""
+        results = self._gather([
+            (lambda source=source: self.job_rows(user_id, source, job_id)) for source in HISTORIES
+        ])
+        return {
+            source: [tag(HISTORIES[source].from_row(row), source) for row in rows]
+            for source, rows in zip(HISTORIES, results)
+        }
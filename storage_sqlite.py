@@ -0,0 +1,303 @@
+"""
+Storage in one local SQLite file (STORAGE_BACKEND=sqlite), for self-hosted and offline deployments.
+
+The tables and indexes mirror supabase/schema.sql: user_config, applied_jobs and failed_jobs with
+the same unique keys, keyset indexes on (user_id, created_at desc, id desc) and date indexes, and
+the applied_jobs_totals/daily/companies aggregates, updated with each upsert batch, so stats read
+a few rows. The database runs in WAL mode (readers never block the writer); connections are pooled,
+writers take turns on a lock, and history upserts are written in batches of one transaction each.
+"""
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from collections import Counter
+from datetime import datetime, timezone
+
+from applied_index import next_day, supabase_row_to_job
+from applied_stats import applied_day, summarize, window_start
+from bulk_upsert import unique_batches
+from config_store import ConfigConflict
+from job_history import HISTORIES
+from storage import Storage
+
+BATCH_SIZE = 1000
+# Idle connections kept for reuse; more are opened under load and closed when returned
+POOL_SIZE = 8
+EXPORT_PAGE_SIZE = 1000
+
+SCHEMA = """
+create table if not exists user_config (
+  user_id text primary key,
+  config text not null,
+  version integer not null default 0,
+  updated_at text not null
+);
+
+create table if not exists applied_jobs (
+  id integer primary key,
+  user_id text not null,
+  job_id text not null,
+  title text,
+  company text,
+  hr_name text,
+  hr_link text,
+  job_link text,
+  external_job_link text,
+  date_applied text,
+  created_at text not null,
+  unique(user_id, job_id)
+);
+create index if not exists applied_jobs_user_created_idx on applied_jobs (user_id, created_at desc, id desc);
+create index if not exists applied_jobs_user_date_applied_idx on applied_jobs (user_id, date_applied);
+-- Stands in for the trigram indexes: company filters are case-insensitive exact matches
+create index if not exists applied_jobs_user_company_idx on applied_jobs (user_id, company collate nocase);
+
+create table if not exists failed_jobs (
+  id integer primary key,
+  user_id text not null,
+  job_id text not null,
+  job_link text,
+  external_job_link text,
+  resume_tried text,
+  date_listed text,
+  date_tried text not null default '',
+  reason text,
+  stack_trace text,
+  screenshot_name text,
+  created_at text not null,
+  unique(user_id, job_id, date_tried)
+);
+create index if not exists failed_jobs_user_created_idx on failed_jobs (user_id, created_at desc, id desc);
+create index if not exists failed_jobs_user_date_tried_idx on failed_jobs (user_id, date_tried);
+
+create table if not exists applied_jobs_totals (
+  user_id text primary key,
+  total integer not null default 0
+);
+create table if not exists applied_jobs_daily (
+  user_id text not null,
+  day text not null,
+  count integer not null default 0,
+  primary key (user_id, day)
+);
+create table if not exists applied_jobs_companies (
+  user_id text not null,
+  company text not null,
+  count integer not null default 0,
+  primary key (user_id, company)
+);
+create index if not exists applied_jobs_companies_top_idx on applied_jobs_companies (user_id, count desc);
+"""
+
+# Aggregate deltas of one upsert batch, applied in its transaction (as applied_jobs_stats_trigger does
+# per statement in Postgres); rows that reach zero are kept, as there
+_ADD_TOTAL = ("insert into applied_jobs_totals (user_id, total) values (?, ?) "
+              "on conflict (user_id) do update set total = total + excluded.total")
+_ADD_DAY = ("insert into applied_jobs_daily (user_id, day, count) values (?, ?, ?) "
+            "on conflict (user_id, day) do update set count = count + excluded.count")
+_ADD_COMPANY = ("insert into applied_jobs_companies (user_id, company, count) values (?, ?, ?) "
+                "on conflict (user_id, company) do update set count = count + excluded.count")
+
+
+def _columns(history) -> list:
+    return [c.strip() for c in history.columns.split(",")]
+
+
+def _like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class SQLiteStorage(Storage):
+    name = "sqlite"
+
+    def __init__(self, path: str, batch_size: int = BATCH_SIZE, pool_size: int = POOL_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._pool = queue.LifoQueue(pool_size)
+        # SQLite has one writer at a time; queueing here avoids its busy-wait backoff between writers
+        self._write_lock = threading.Lock()
+        self._upserts = {}
+        for source, history in HISTORIES.items():
+            keys = [c.strip() for c in history.conflict.split(",")]
+            columns = [c for c in _columns(history) if c not in ("id", "created_at") and c not in keys]
+            if source == "failed":
+                columns.append("stack_trace")
+            insert = keys + columns + ["created_at"]
+            # created_at keeps the first import's time, like the Supabase upsert (which does not send it)
+            self._upserts[source] = (
+                insert,
+                f"insert into {history.table} ({', '.join(insert)}) values ({', '.join('?' * len(insert))}) "
+                f"on conflict ({', '.join(keys)}) do update set "
+                + ", ".join(f"{c} = excluded.{c}" for c in columns),
+            )
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("pragma journal_mode = wal")
+        # Durable at checkpoints rather than every commit; WAL keeps the database consistent either way
+        conn.execute("pragma synchronous = normal")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    # Config
+
+    def fetch_config(self, user_id: str):
+        with self._connection() as conn:
+            row = conn.execute("select config, version from user_config where user_id = ?", (user_id,)).fetchone()
+        if row is None:
+            return None, None
+        return json.loads(row["config"]), row["version"]
+
+    def store_config(self, user_id: str, config: dict, base_version, new_version: int) -> None:
+        body = json.dumps(config)
+        now = datetime.now(timezone.utc).isoformat()
+        with self._connection() as conn, self._write_lock:
+            if base_version is None:
+                try:
+                    conn.execute(
+                        "insert into user_config (user_id, config, version, updated_at) values (?, ?, ?, ?)",
+                        (user_id, body, new_version, now),
+                    )
+                except sqlite3.IntegrityError as e:
+                    raise ConfigConflict() from e
+            else:
+                cur = conn.execute(
+                    "update user_config set config = ?, version = ?, updated_at = ? where user_id = ? and version = ?",
+                    (body, new_version, now, user_id, base_version),
+                )
+                if cur.rowcount == 0:
+                    raise ConfigConflict()
+
+    # Job histories
+
+    def history_rows(self, user_id: str, source: str, params: dict, cursor: dict, limit: int) -> list:
+        history = HISTORIES[source]
+        where, args = ["user_id = ?"], [user_id]
+        if params["company"]:
+            where.append("company = ? collate nocase")
+            args.append(params["company"])
+        if params["date_from"]:
+            where.append(f"{history.date_column} >= ?")
+            args.append(params["date_from"])
+        if params["date_to"]:
+            where.append(f"{history.date_column} < ?")
+            args.append(next_day(params["date_to"]))
+        if params["q"]:
+            # like is case-insensitive (for ASCII), as ilike is
+            where.append("(" + " or ".join(f"{c} like ? escape '\\'" for c in history.search_columns) + ")")
+            args += ["%" + _like(params["q"]) + "%"] * len(history.search_columns)
+        if cursor:
+            if not cursor.get("c") or not cursor.get("i"):
+                raise ValueError("Invalid cursor")
+            where.append("(created_at, id) < (?, ?)")
+            args += [cursor["c"], cursor["i"]]
+        sql = (f"select {history.columns} from {history.table} where {' and '.join(where)} "
+               f"order by created_at desc, id desc limit ?")
+        with self._connection() as conn:
+            return [dict(row) for row in conn.execute(sql, (*args, limit))]
+
+    def job_rows(self, user_id: str, source: str, job_id: str) -> list:
+        history = HISTORIES[source]
+        sql = f"select {history.columns} from {history.table} where user_id = ? and job_id = ? order by created_at, id"
+        with self._connection() as conn:
+            return [dict(row) for row in conn.execute(sql, (user_id, job_id))]
+
+    def stats(self, user_id: str, days: int, top: int) -> dict:
+        with self._connection() as conn:
+            total = conn.execute("select total from applied_jobs_totals where user_id = ?", (user_id,)).fetchone()
+            daily = conn.execute(
+                "select day, count from applied_jobs_daily where user_id = ? and day >= ?",
+                (user_id, window_start(days).isoformat()),
+            ).fetchall()
+            companies = conn.execute(
+                "select company, count from applied_jobs_companies where user_id = ? and count > 0 "
+                "order by count desc limit ?",
+                (user_id, top),
+            ).fetchall()
+        return summarize(
+            total["total"] if total else 0,
+            {r["day"]: r["count"] for r in daily},
+            [(r["company"], r["count"]) for r in companies],
+            days,
+        )
+
+    def upsert_history(self, user_id: str, source: str, records) -> dict:
+        history = HISTORIES[source]
+        columns, sql = self._upserts[source]
+        key_columns = tuple(c.strip() for c in history.conflict.split(","))
+        stats = {"rows": 0, "duplicates": 0, "batches": 0}
+        created_at = datetime.now(timezone.utc).isoformat()
+        with self._connection() as conn:
+            for batch in unique_batches(records, key_columns, self.batch_size, stats):
+                values = [tuple(created_at if c == "created_at" else r.get(c) for c in columns) for r in batch]
+                with self._write_lock:
+                    conn.execute("begin immediate")
+                    if source == "applied":
+                        self._add_stats(conn, user_id, batch)
+                    conn.executemany(sql, values)
+                    conn.execute("commit")
+                stats["rows"] += len(batch)
+                stats["batches"] += 1
+        return stats
+
+    @staticmethod
+    def _add_stats(conn, user_id: str, batch: list) -> None:
+        """Move the aggregates by what this batch adds or changes; call in its transaction, before the upsert."""
+        existing = {
+            row["job_id"]: row for row in conn.execute(
+                f"select job_id, date_applied, company from applied_jobs "
+                f"where user_id = ? and job_id in ({', '.join('?' * len(batch))})",
+                (user_id, *(r["job_id"] for r in batch)),
+            )
+        }
+        total, days, companies = 0, Counter(), Counter()
+        for record in batch:
+            old = existing.get(record["job_id"])
+            if old is None:
+                total += 1
+            else:
+                days[applied_day(old["date_applied"])] -= 1
+                companies[(old["company"] or "").strip()] -= 1
+            days[applied_day(record["date_applied"])] += 1
+            companies[(record["company"] or "").strip()] += 1
+        if total:
+            conn.execute(_ADD_TOTAL, (user_id, total))
+        conn.executemany(_ADD_DAY, [(user_id, day, n) for day, n in days.items() if day and n])
+        conn.executemany(_ADD_COMPANY, [(user_id, company, n) for company, n in companies.items() if company and n])
+
+    def iter_applied(self, user_id: str):
+        """Keyset pages, so no connection is held while the client reads the export."""
+        sql = ("select id, created_at, job_id, title, company, hr_name, hr_link, job_link, external_job_link, "
+               "date_applied from applied_jobs where user_id = ? and (created_at, id) > (?, ?) "
+               "order by created_at, id limit ?")
+        last = ("", 0)
+        while True:
+            with self._connection() as conn:
+                rows = conn.execute(sql, (user_id, *last, EXPORT_PAGE_SIZE)).fetchall()
+            for row in rows:
+                yield supabase_row_to_job(dict(row))
+            if len(rows) < EXPORT_PAGE_SIZE:
+                return
+            last = (rows[-1]["created_at"], rows[-1]["id"])
@@ -0,0 +1,109 @@
+"""
+Storage on the Supabase tables of supabase/schema.sql (user_config, applied_jobs, failed_jobs and
+the trigger-maintained applied_jobs_* summary tables), through the shared supabase-py client.
+Independent queries of one request are issued concurrently on the I/O loop (aio.gather_io).
+"""
+from datetime import datetime, timezone
+
+from aio import gather_io
+from applied_index import next_day
+from applied_stats import summarize, window_start
+from bulk_upsert import bulk_upsert
+from config_store import ConfigConflict
+from export_stream import iter_supabase_jobs
+from job_history import HISTORIES
+from storage import Storage
+
+
+def _pg_quote(value) -> str:
+    """Quote a value for use inside a PostgREST or=(...) filter."""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class SupabaseStorage(Storage):
+    name = "supabase"
+
+    def __init__(self, sb):
+        self.sb = sb
+
+    def _gather(self, calls) -> list:
+        return gather_io(*calls)
+
+    def fetch_config(self, user_id: str):
+        r = self.sb.table("user_config").select("config, version").eq("user_id", user_id).execute()
+        if r.data and r.data[0].get("config"):
+            return r.data[0]["config"], r.data[0].get("version") or 0
+        return None, None
+
+    def store_config(self, user_id: str, config: dict, base_version, new_version: int) -> None:
+        row = {"config": config, "version": new_version, "updated_at": datetime.now(timezone.utc).isoformat()}
+        if base_version is None:
+            try:
+                self.sb.table("user_config").insert({"user_id": user_id, **row}).execute()
+            except Exception as e:
+                if "23505" in str(getattr(e, "code", "") or "") or "duplicate key" in str(e):
+                    raise ConfigConflict() from e
+                raise
+        else:
+            r = self.sb.table("user_config").update(row).eq("user_id", user_id).eq("version", base_version).execute()
+            if not r.data:
+                raise ConfigConflict()
+
+    def history_rows(self, user_id: str, source: str, params: dict, cursor: dict, limit: int) -> list:
+        history = HISTORIES[source]
+        query = self.sb.table(history.table).select(history.columns).eq("user_id", user_id)
+        if params["company"]:
+            # Case-insensitive exact match, like the local index
+            escaped = params["company"].replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            query = query.ilike("company", escaped)
+        if params["date_from"]:
+            query = query.gte(history.date_column, params["date_from"])
+        if params["date_to"]:
+            query = query.lt(history.date_column, next_day(params["date_to"]))
+        conditions = []
+        if params["q"]:
+            pattern = _pg_quote("*" + params["q"] + "*")
+            conditions.append("or(" + ",".join(f"{c}.ilike.{pattern}" for c in history.search_columns) + ")")
+        if cursor:
+            if not cursor.get("c") or not cursor.get("i"):
+                raise ValueError("Invalid cursor")
+            ts, row_id = _pg_quote(cursor["c"]), _pg_quote(cursor["i"])
+            conditions.append(f"or(created_at.lt.{ts},and(created_at.eq.{ts},id.lt.{row_id}))")
+        if conditions:
+            query = query.or_(f"and({','.join(conditions)})")
+        r = query.order("created_at", desc=True).order("id", desc=True).limit(limit).execute()
+        return r.data or []
+
+    def job_rows(self, user_id: str, source: str, job_id: str) -> list:
+        history = HISTORIES[source]
+        r = self.sb.table(history.table).select(history.columns).eq("user_id", user_id).eq(
+            "job_id", job_id
+        ).order("created_at").execute()
+        return r.data or []
+
+    def stats(self, user_id: str, days: int, top: int) -> dict:
+        """From the trigger-maintained summary tables (a few rows each, no scans)."""
+        # Independent queries: awaited together, so the request waits for the slowest, not the sum
+        daily, companies, totals = gather_io(
+            self.sb.table("applied_jobs_daily").select("day, count").eq("user_id", user_id).gte(
+                "day", window_start(days).isoformat()
+            ).execute,
+            self.sb.table("applied_jobs_companies").select("company, count").eq("user_id", user_id).order(
+                "count", desc=True
+            ).limit(top).execute,
+            self.sb.table("applied_jobs_totals").select("total").eq("user_id", user_id).execute,
+        )
+        return summarize(
+            totals.data[0]["total"] if totals.data else 0,
+            {str(r["day"]): r["count"] for r in daily.data or []},
+            [(r["company"], r["count"]) for r in companies.data or []],
+            days,
+        )
+
+    def upsert_history(self, user_id: str, source: str, records) -> dict:
+        """Chunked, pipelined upsert; raises BulkUpsertError when a batch could not be written."""
+        history = HISTORIES[source]
+        return bulk_upsert(self.sb, history.table, records, on_conflict=history.conflict)
+
+    def iter_applied(self, user_id: str):
+        return iter_supabase_jobs(self.sb, user_id)
@@ -10,6 +10,9 @@ create table if not exists public.user_config (
   unique(user_id)
 );
 
+-- Incremented on every config write; the server updates only "where version = <version it read>"
+alter table public.user_config add column if not exists version bigint not null default 0;
+
 -- Applied jobs: one row per application per user
 create table if not exists public.applied_jobs (
   id uuid primary key default gen_random_uuid(),
@@ -26,6 +29,18 @@ create table if not exists public.applied_jobs (
   unique(user_id, job_id)
 );
 
+-- Indexes for GET /api/applied-jobs: keyset pages (created_at desc, id desc) per user,
+-- optionally narrowed by date_applied range, and case-insensitive title/company matching (trigram).
+create extension if not exists pg_trgm;
+create index if not exists applied_jobs_user_created_idx
+  on public.applied_jobs (user_id, created_at desc, id desc);
+create index if not exists applied_jobs_user_date_applied_idx
+  on public.applied_jobs (user_id, date_applied);
+create index if not exists applied_jobs_title_trgm_idx
+  on public.applied_jobs using gin (title gin_trgm_ops);
+create index if not exists applied_jobs_company_trgm_idx
+  on public.applied_jobs using gin (company gin_trgm_ops);
+
 -- RLS: users can only access their own rows
 alter table public.user_config enable row level security;
 alter table public.applied_jobs enable row level security;
@@ -41,3 +56,151 @@ create policy "applied_jobs_delete" on public.applied_jobs for delete using (aut
 
 -- Optional: allow service role to insert applied_jobs for a user (used by backend sync)
 -- Service role bypasses RLS by default, so no extra policy needed for sync.
+
+-- Dashboard aggregates for GET /api/applied-jobs/stats, kept up to date by statement-level triggers
+-- on applied_jobs so stats are read from a handful of rows instead of scanning the history.
+-- No foreign keys: the triggers still run while an auth user's rows are being cascade-deleted.
+create table if not exists public.applied_jobs_totals (
+  user_id uuid primary key,
+  total bigint not null default 0
+);
+create table if not exists public.applied_jobs_daily (
+  user_id uuid not null,
+  day date not null,
+  count bigint not null default 0,
+  primary key (user_id, day)
+);
+create table if not exists public.applied_jobs_companies (
+  user_id uuid not null,
+  company text not null,
+  count bigint not null default 0,
+  primary key (user_id, company)
+);
+create index if not exists applied_jobs_companies_top_idx
+  on public.applied_jobs_companies (user_id, count desc);
+
+-- Day of a 'YYYY-MM-DD HH:MM:SS' date_applied value; null for empty or malformed values
+create or replace function public.applied_job_day(value text) returns date
+language plpgsql immutable as $$
+begin
+  if value ~ '^\d{4}-\d{2}-\d{2}' then
+    return substr(value, 1, 10)::date;
+  end if;
+  return null;
+exception when others then
+  return null;
+end $$;
+
+-- Apply [{user_id, date_applied, company, n}] deltas (n = +1 per added row, -1 per removed row)
+create or replace function public.applied_jobs_stats_add(deltas jsonb) returns void
+language sql security definer set search_path = public as $$
+  with delta as (
+    select user_id, public.applied_job_day(date_applied) as day, nullif(trim(company), '') as company, n
+    from jsonb_to_recordset(coalesce(deltas, '[]'::jsonb)) as x(user_id uuid, date_applied text, company text, n int)
+  ), totals as (
+    insert into public.applied_jobs_totals as t (user_id, total)
+    select user_id, sum(n) from delta group by user_id having sum(n) <> 0
+    on conflict (user_id) do update set total = t.total + excluded.total
+  ), daily as (
+    insert into public.applied_jobs_daily as d (user_id, day, count)
+    select user_id, day, sum(n) from delta where day is not null group by user_id, day having sum(n) <> 0
+    on conflict (user_id, day) do update set count = d.count + excluded.count
+  )
+  insert into public.applied_jobs_companies as c (user_id, company, count)
+  select user_id, company, sum(n) from delta where company is not null group by user_id, company having sum(n) <> 0
+  on conflict (user_id, company) do update set count = c.count + excluded.count;
+$$;
+-- Security definer in an exposed schema: without this, PostgREST would serve it as /rpc/applied_jobs_stats_add
+-- to anyone holding the anon key. Only the trigger below (running as the owner) calls it.
+revoke execute on function public.applied_jobs_stats_add(jsonb) from public, anon, authenticated;
+
+create or replace function public.applied_jobs_stats_trigger() returns trigger
+language plpgsql security definer set search_path = public as $$
+begin
+  if TG_OP = 'INSERT' then
+    perform public.applied_jobs_stats_add((
+      select jsonb_agg(jsonb_build_object('user_id', user_id, 'date_applied', date_applied, 'company', company, 'n', 1))
+      from new_rows));
+  elsif TG_OP = 'DELETE' then
+    perform public.applied_jobs_stats_add((
+      select jsonb_agg(jsonb_build_object('user_id', user_id, 'date_applied', date_applied, 'company', company, 'n', -1))
+      from old_rows));
+  else
+    -- Upserts that hit an existing row land here: move the row from its old day/company to the new one
+    perform public.applied_jobs_stats_add((
+      select jsonb_agg(d) from (
+        select jsonb_build_object('user_id', user_id, 'date_applied', date_applied, 'company', company, 'n', -1) as d from old_rows
+        union all
+        select jsonb_build_object('user_id', user_id, 'date_applied', date_applied, 'company', company, 'n', 1) from new_rows
+      ) changes));
+  end if;
+  return null;
+end $$;
+revoke execute on function public.applied_jobs_stats_trigger() from public, anon, authenticated;
+
+drop trigger if exists applied_jobs_stats_insert on public.applied_jobs;
+create trigger applied_jobs_stats_insert after insert on public.applied_jobs
+  referencing new table as new_rows for each statement execute function public.applied_jobs_stats_trigger();
+drop trigger if exists applied_jobs_stats_update on public.applied_jobs;
+create trigger applied_jobs_stats_update after update on public.applied_jobs
+  referencing old table as old_rows new table as new_rows for each statement execute function public.applied_jobs_stats_trigger();
+drop trigger if exists applied_jobs_stats_delete on public.applied_jobs;
+create trigger applied_jobs_stats_delete after delete on public.applied_jobs
+  referencing old table as old_rows for each statement execute function public.applied_jobs_stats_trigger();
+
+-- Backfill (or repair) the aggregates from existing rows; safe to re-run
+insert into public.applied_jobs_totals (user_id, total)
+  select user_id, count(*) from public.applied_jobs group by user_id
+  on conflict (user_id) do update set total = excluded.total;
+insert into public.applied_jobs_daily (user_id, day, count)
+  select user_id, public.applied_job_day(date_applied), count(*) from public.applied_jobs
+  where public.applied_job_day(date_applied) is not null group by 1, 2
+  on conflict (user_id, day) do update set count = excluded.count;
+insert into public.applied_jobs_companies (user_id, company, count)
+  select user_id, trim(company), count(*) from public.applied_jobs
+  where nullif(trim(company), '') is not null group by 1, 2
+  on conflict (user_id, company) do update set count = excluded.count;
+
+alter table public.applied_jobs_totals enable row level security;
+alter table public.applied_jobs_daily enable row level security;
+alter table public.applied_jobs_companies enable row level security;
+drop policy if exists "applied_jobs_totals_select" on public.applied_jobs_totals;
+create policy "applied_jobs_totals_select" on public.applied_jobs_totals for select using (auth.uid() = user_id);
+drop policy if exists "applied_jobs_daily_select" on public.applied_jobs_daily;
+create policy "applied_jobs_daily_select" on public.applied_jobs_daily for select using (auth.uid() = user_id);
+drop policy if exists "applied_jobs_companies_select" on public.applied_jobs_companies;
+create policy "applied_jobs_companies_select" on public.applied_jobs_companies for select using (auth.uid() = user_id);
+
+-- Failed applications (the bot's all_failed_applications_history.csv): one row per failed attempt,
+-- since a job can fail on several runs. Synced by POST /api/applied-jobs/sync alongside applied_jobs.
+create table if not exists public.failed_jobs (
+  id uuid primary key default gen_random_uuid(),
+  user_id uuid not null references auth.users(id) on delete cascade,
+  job_id text not null,
+  job_link text,
+  external_job_link text,
+  resume_tried text,
+  date_listed text,
+  date_tried text not null default '',
+  reason text,
+  stack_trace text,
+  screenshot_name text,
+  created_at timestamptz not null default now(),
+  unique(user_id, job_id, date_tried)
+);
+
+-- Keyset pages (source=failed|all) and date_tried ranges; the unique key also serves job_id lookups
+create index if not exists failed_jobs_user_created_idx
+  on public.failed_jobs (user_id, created_at desc, id desc);
+create index if not exists failed_jobs_user_date_tried_idx
+  on public.failed_jobs (user_id, date_tried);
+
+alter table public.failed_jobs enable row level security;
+drop policy if exists "failed_jobs_select" on public.failed_jobs;
+create policy "failed_jobs_select" on public.failed_jobs for select using (auth.uid() = user_id);
+drop policy if exists "failed_jobs_insert" on public.failed_jobs;
+create policy "failed_jobs_insert" on public.failed_jobs for insert with check (auth.uid() = user_id);
+drop policy if exists "failed_jobs_update" on public.failed_jobs;
+create policy "failed_jobs_update" on public.failed_jobs for update using (auth.uid() = user_id);
+drop policy if exists "failed_jobs_delete" on public.failed_jobs;
+create policy "failed_jobs_delete" on public.failed_jobs for delete using (auth.uid() = user_id);
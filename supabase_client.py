@@ -1,26 +1,249 @@
 """
 Supabase client for server-side operations (sync applied jobs, optional config).
 Uses SERVICE_ROLE_KEY so it can act on behalf of any user when given user_id.
+
+The client is created once under a lock, with a keep-alive HTTP connection pool and timeouts.
+Every query's execute() is timed per table operation and goes through a circuit breaker, so
+when Supabase is down requests fail fast instead of each waiting for a timeout.
 """
+import itertools
+import logging
 import os
+import threading
+import time
+
+from request_metrics import add_phase
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
+if os.environ.get("VERCEL") != "1":
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
 
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_SERVICE_ROLE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+# Keep-alive connections; size to the number of request threads that may call Supabase at once
+SUPABASE_POOL_SIZE = int(os.environ.get("SUPABASE_POOL_SIZE") or os.environ.get("WEB_THREADS") or 16)
+SUPABASE_TIMEOUT = float(os.environ.get("SUPABASE_TIMEOUT", "10"))
+SUPABASE_CONNECT_TIMEOUT = float(os.environ.get("SUPABASE_CONNECT_TIMEOUT", "3"))
+# Consecutive outage errors before the breaker opens, and seconds before a trial call is let through
+BREAKER_THRESHOLD = int(os.environ.get("SUPABASE_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET = float(os.environ.get("SUPABASE_BREAKER_RESET", "30"))
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+log = logging.getLogger(__name__)
+
 _supabase = None
+_init_lock = threading.Lock()
+
+
+class SupabaseUnavailable(Exception):
+    """Supabase is configured but cannot be used now: the circuit breaker is open or the client failed to start."""
+
+
+class CircuitBreaker:
+    """closed -> open after `threshold` consecutive failures; one trial call allowed after `reset` seconds."""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, reset: float = BREAKER_RESET):
+        self.threshold = threshold
+        self.reset = reset
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half_open" if time.monotonic() - self._opened_at >= self.reset else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+
+_breaker = CircuitBreaker()
+_metrics_lock = threading.Lock()
+_op_metrics = {}  # "table.op" -> {count, errors, seconds, max_seconds, buckets}
+
+
+def _record(key: str, seconds: float, error: bool) -> None:
+    with _metrics_lock:
+        m = _op_metrics.get(key)
+        if m is None:
+            m = _op_metrics[key] = {
+                "count": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0,
+                "buckets": [0] * len(LATENCY_BUCKETS),
+            }
+        m["count"] += 1
+        m["errors"] += int(error)
+        m["seconds"] += seconds
+        m["max_seconds"] = max(m["max_seconds"], seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                m["buckets"][i] += 1
+                break
+
+
+def _is_outage(exc: Exception) -> bool:
+    """Transport errors and timeouts mean Supabase is unreachable; API errors (4xx, constraint) do not."""
+    try:
+        import httpx
+        if isinstance(exc, (httpx.TransportError, httpx.TimeoutException)):
+            return True
+    except ImportError:
+        pass
+    if isinstance(exc, (OSError, TimeoutError)):
+        return True
+    code = str(getattr(exc, "code", "") or "")
+    return code.startswith("5")
+
+
+_OPERATIONS = ("select", "insert", "upsert", "update", "delete")
+
+
+class _InstrumentedQuery:
+    """Wraps a postgrest request builder; chained calls stay wrapped and execute() is timed."""
+
+    def __init__(self, builder, table: str, op: str = None):
+        self._builder = builder
+        self._table = table
+        self._op = op
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+        op = self._op or (name if name in _OPERATIONS else None)
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, "execute"):
+                return _InstrumentedQuery(result, self._table, op)
+            return result
+        return call
+
+    def execute(self):
+        key = f"{self._table}.{self._op or 'query'}"
+        if not _breaker.allow():
+            _record(key, 0.0, True)
+            raise SupabaseUnavailable("Supabase unavailable (circuit open)")
+        t0 = time.perf_counter()
+        try:
+            result = self._builder.execute()
+        except Exception as e:
+            elapsed = time.perf_counter() - t0
+            _record(key, elapsed, True)
+            add_phase("supabase", elapsed)
+            if _is_outage(e):
+                _breaker.record_failure()
+            else:
+                _breaker.record_success()
+            raise
+        elapsed = time.perf_counter() - t0
+        _record(key, elapsed, False)
+        add_phase("supabase", elapsed)
+        _breaker.record_success()
+        return result
+
+
+class _InstrumentedClient:
+    """Proxy for the supabase Client whose table()/rpc() builders are instrumented."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, name: str):
+        return _InstrumentedQuery(self._client.table(name), name)
+
+    def rpc(self, fn: str, *args, **kwargs):
+        return _InstrumentedQuery(self._client.rpc(fn, *args, **kwargs), "rpc:" + fn, "call")
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def _create_client():
+    from supabase import create_client
+    try:
+        import httpx
+        from supabase import ClientOptions
+    except ImportError:
+        return create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+    timeout = httpx.Timeout(SUPABASE_TIMEOUT, connect=SUPABASE_CONNECT_TIMEOUT)
+    http = httpx.Client(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=SUPABASE_POOL_SIZE,
+            max_keepalive_connections=SUPABASE_POOL_SIZE,
+            keepalive_expiry=30,
+        ),
+    )
+    try:
+        # supabase-py >= 2.11 accepts a shared httpx client
+        options = ClientOptions(postgrest_client_timeout=timeout, httpx_client=http)
+    except TypeError:
+        http.close()
+        options = ClientOptions(postgrest_client_timeout=timeout)
+    return create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY, options=options)
 
 
 def get_supabase():
+    """
+    Return the shared (instrumented) client, or None if Supabase is not configured. Raises
+    SupabaseUnavailable if the client could not be initialised or the circuit breaker is open, so
+    callers do not mistake an outage for "no Supabase" (and e.g. serve or save default config).
+    """
     global _supabase
-    if _supabase is None and SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY:
-        try:
-            from supabase import create_client
-            _supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-        except Exception:
-            pass
+    if not (SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY):
+        return None
+    if _supabase is None:
+        with _init_lock:
+            if _supabase is None and _breaker.allow():
+                try:
+                    _supabase = _InstrumentedClient(_create_client())
+                    _breaker.record_success()
+                except Exception:
+                    log.exception("Supabase client initialisation failed")
+                    _breaker.record_failure()
+    if _supabase is None:
+        raise SupabaseUnavailable("Supabase unavailable (client could not be initialised)")
+    if _breaker.state == "open":
+        raise SupabaseUnavailable("Supabase unavailable (circuit open)")
     return _supabase
+
+
+def get_supabase_metrics() -> dict:
+    """Circuit breaker state and per table-operation latency metrics."""
+    with _metrics_lock:
+        ops = {
+            key: {
+                **{k: v for k, v in m.items() if k != "buckets"},
+                "avg_ms": round(m["seconds"] * 1000 / m["count"], 3) if m["count"] else 0.0,
+                # Stored per bucket; reported cumulatively (requests at or under each bound)
+                "buckets": dict(zip((str(b) for b in LATENCY_BUCKETS), itertools.accumulate(m["buckets"]))),
+            }
+            for key, m in _op_metrics.items()
+        }
+    return {"breaker": _breaker.state, "pool_size": SUPABASE_POOL_SIZE, "operations": ops}
@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+JWT_SECRET = "test-secret-" + "x" * 32
+
+
+@pytest.fixture
+def web(tmp_path, monkeypatch):
+    """The Flask app on a fresh SQLite store and config file, with saves buffered (not flushed on a timer)."""
+    import app as web
+    from config_store import ConfigReadCache, ConfigWriteBehind
+    from storage_sqlite import SQLiteStorage
+    monkeypatch.setattr(web, "STORAGE_BACKEND", "sqlite")
+    monkeypatch.setattr(web, "_storage", SQLiteStorage(str(tmp_path / "app.db")))
+    monkeypatch.setattr(web, "CONFIG_JSON", str(tmp_path / "config.json"))
+    monkeypatch.setattr(web, "_config_cache", ConfigReadCache())
+    monkeypatch.setattr(web, "_config_writes", ConfigWriteBehind(
+        web._fetch_config_row, web._upsert_config_for_user, web.get_default_config, interval=3600,
+    ))
+    return web
+
+
+@pytest.fixture
+def auth_headers(monkeypatch):
+    """Authorization headers for user "u1", signed with a test JWT secret."""
+    import jwt
+    import auth_supabase
+    monkeypatch.setattr(auth_supabase, "SUPABASE_JWT_SECRET", JWT_SECRET)
+    token = jwt.encode({"sub": "u1", "exp": int(time.time()) + 600}, JWT_SECRET, algorithm="HS256")
+    return {"Authorization": "Bearer " + token}
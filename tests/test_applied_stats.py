@@ -0,0 +1,38 @@
+import csv
+from datetime import date
+
+from applied_stats import AppliedStats, LocalStatsTracker
+
+HEADER = ["Job ID", "Title", "Company", "Date Applied"]
+
+
+def write_rows(path, rows, mode="w"):
+    with open(path, mode, newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        if mode == "w":
+            w.writerow(HEADER)
+        w.writerows(rows)
+
+
+def test_repeated_job_id_counts_once_first_row_wins():
+    stats = AppliedStats()
+    stats.add({"Job ID": "1", "Company": "Acme", "Date Applied": "2026-10-01 10:00:00"})
+    stats.add({"Job ID": " 1 ", "Company": "Other", "Date Applied": "2026-10-02 10:00:00"})
+    stats.add({"Job ID": "", "Company": "Acme", "Date Applied": "2026-10-02 10:00:00"})
+    summary = stats.summary(days=7, today=date(2026, 10, 2))
+    assert summary["total"] == 1
+    assert stats.duplicates == 1
+    assert summary["top_companies"] == [{"company": "Acme", "count": 1}]
+    assert [d["count"] for d in summary["per_day"] if d["count"]] == [1]
+    assert summary["per_day"][-2] == {"date": "2026-10-01", "count": 1}
+
+
+def test_repeat_in_appended_rows_is_skipped(tmp_path):
+    path = tmp_path / "applied.csv"
+    write_rows(path, [["1", "t", "Acme", "2026-10-01 10:00:00"], ["2", "t", "Beta", "2026-10-01 11:00:00"]])
+    tracker = LocalStatsTracker(str(path))
+    assert tracker.summary()["total"] == 2
+    write_rows(path, [["2", "t", "Beta", "2026-10-03 09:00:00"], ["3", "t", "Acme", "2026-10-03 09:30:00"]], mode="a")
+    summary = tracker.summary(top=5)
+    assert summary["total"] == 3
+    assert {c["company"]: c["count"] for c in summary["top_companies"]} == {"Acme": 2, "Beta": 1}
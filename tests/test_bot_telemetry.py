@@ -0,0 +1,29 @@
+from bot_telemetry import TelemetrySampler, user_hash
+
+
+def sampler_reading(cpu_by_pid):
+    """A sampler whose tree reader reports each root as one process using cpu_by_pid[root] seconds."""
+    sampler = TelemetrySampler(interval=3600)
+    sampler._reader = lambda roots: {root: {root: (cpu_by_pid[root], 100 << 20, 4)} for root in roots}
+    return sampler
+
+
+def test_warm_run_excludes_standby_preload_cpu():
+    cpu = {1: 5.0, 2: 5.0}
+    sampler = sampler_reading(cpu)
+    warm = sampler.track("warm", 1, warm=True)
+    cold = sampler.track("cold", 2)
+    cpu[1] = cpu[2] = 5.5
+    sampler.sample()
+    assert round(warm.cpu_seconds, 3) == 0.5
+    assert round(cold.cpu_seconds, 3) == 5.5
+
+
+def test_render_reports_latest_sample_per_running_bot():
+    sampler = sampler_reading({1: 1.0})
+    sampler.track("u1", 1)
+    assert "user_hash" not in sampler.render()
+    sampler.sample()
+    out = sampler.render()
+    assert f'bot_rss_bytes{{user_hash="{user_hash("u1")}"}} {100 << 20}' in out
+    assert "u1" not in out
@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+
+from bulk_upsert import BulkUpsertError, bulk_upsert, unique_batches
+
+
+class FlakySupabase:
+    """Records upserted batches; the first `failures` execute() calls raise."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def table(self, name):
+        return self
+
+    def upsert(self, batch, on_conflict):
+        self._batch = list(batch)
+        return self
+
+    def execute(self):
+        with self._lock:
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("reset by peer")
+            self.batches.append(self._batch)
+
+
+def rows(*keys):
+    return [{"user_id": "u1", "job_id": k, "n": i} for i, k in enumerate(keys)]
+
+
+def test_unique_batches_drops_repeated_keys_first_wins():
+    stats = {"duplicates": 0}
+    batches = list(unique_batches(rows("a", "b", "a", "c", "b", "d"), ("user_id", "job_id"), 2, stats))
+    assert [[r["job_id"] for r in b] for b in batches] == [["a", "b"], ["c", "d"]]
+    assert batches[0][0]["n"] == 0
+    assert stats["duplicates"] == 2
+
+
+def test_bulk_upsert_counts_rows_batches_and_duplicates():
+    sb = FlakySupabase()
+    result = bulk_upsert(sb, "applied_jobs", iter(rows("a", "b", "a", "c")), "user_id,job_id", batch_size=2, max_in_flight=1)
+    assert (result["rows"], result["duplicates"], result["batches"], result["retries"]) == (3, 1, 2, 0)
+    assert sorted(r["job_id"] for b in sb.batches for r in b) == ["a", "b", "c"]
+
+
+def test_bulk_upsert_retries_a_failed_batch():
+    sb = FlakySupabase(failures=2)
+    result = bulk_upsert(sb, "applied_jobs", rows("a", "b"), "user_id,job_id", max_in_flight=1, backoff=0)
+    assert (result["rows"], result["retries"], result["failed_batches"]) == (2, 2, 0)
+
+
+def test_bulk_upsert_raises_with_counts_when_retries_run_out():
+    sb = FlakySupabase(failures=10)
+    with pytest.raises(BulkUpsertError) as e:
+        bulk_upsert(sb, "applied_jobs", rows("a", "b", "c"), "user_id,job_id", batch_size=2, max_in_flight=1,
+                    retries=1, backoff=0)
+    assert (e.value.result["rows"], e.value.result["failed_batches"]) == (0, 2)
+    assert "reset by peer" in str(e.value)
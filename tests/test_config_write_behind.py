@@ -0,0 +1,69 @@
+import pytest
+
+from config_store import ConfigConflict, ConfigWriteBehind
+
+
+class VersionedStore:
+    """In-memory config rows with the compare-and-set semantics ConfigWriteBehind expects."""
+
+    def __init__(self):
+        self.rows = {}  # user_id -> (config, version)
+        self.writes = 0
+
+    def fetch(self, user_id):
+        return self.rows.get(user_id, (None, None))
+
+    def store(self, user_id, config, base_version, new_version):
+        if self.fetch(user_id)[1] != base_version:
+            raise ConfigConflict()
+        self.rows[user_id] = (config, new_version)
+        self.writes += 1
+
+
+def write_behind(store):
+    return ConfigWriteBehind(store.fetch, store.store, lambda: {"personals": {}}, interval=3600)
+
+
+def test_conflicting_flush_rebases_pending_edits_onto_the_stored_config():
+    store = VersionedStore()
+    writes = write_behind(store)
+    writes.apply("u1", {"personals": {"first_name": "A"}})
+    # Another instance saves version 5 with a different field in the meantime
+    store.rows["u1"] = ({"personals": {"last_name": "B"}, "search": {"city": "X"}}, 5)
+    assert writes.flush("u1")
+    config, version = store.rows["u1"]
+    assert config == {"personals": {"first_name": "A", "last_name": "B"}, "search": {"city": "X"}}
+    assert version > 5
+    assert writes.stats["conflicts"] == 1
+    assert writes.pending("u1") is None
+
+
+def test_pending_edit_wins_over_the_concurrent_value_of_the_same_key():
+    store = VersionedStore()
+    store.rows["u1"] = ({"personals": {"first_name": "Old"}}, 1)
+    writes = write_behind(store)
+    writes.apply("u1", {"personals": {"first_name": "Mine"}})
+    store.rows["u1"] = ({"personals": {"first_name": "Theirs", "phone": "1"}}, 2)
+    assert writes.flush("u1")
+    assert store.rows["u1"][0]["personals"] == {"first_name": "Mine", "phone": "1"}
+
+
+class AlwaysRacedStore(VersionedStore):
+    """Another writer saves a new version just before each of ours."""
+
+    def store(self, user_id, config, base_version, new_version):
+        version = self.fetch(user_id)[1] or 0
+        self.rows[user_id] = ({"personals": {}}, version + 100)
+        super().store(user_id, config, base_version, new_version)
+
+
+def test_conflicts_that_never_settle_keep_the_edits_pending():
+    store = AlwaysRacedStore()
+    writes = write_behind(store)
+    writes.apply("u1", {"personals": {"first_name": "A"}})
+    with pytest.raises(ConfigConflict):
+        writes.flush("u1", strict=True)
+    assert store.writes == 0
+    assert writes.stats["conflicts"] == 3
+    assert writes.pending("u1")[0]["personals"] == {"first_name": "A"}
+    writes.forget("u1")
@@ -0,0 +1,82 @@
+import json
+import os
+
+from csv_tail import CsvTail, SyncStateStore
+
+HEADER = b"Job ID,Title\r\n"
+
+
+def read(path, watermark=None, **kwargs):
+    with CsvTail(str(path), watermark, **kwargs) as tail:
+        rows = [row["Job ID"] for row in tail.rows()]
+    return tail, rows
+
+
+def test_watermark_resumes_after_appended_rows(tmp_path):
+    path = tmp_path / "applied.csv"
+    path.write_bytes(HEADER + b"1,a\r\n2,b\r\n")
+    tail, rows = read(path)
+    assert (rows, tail.full, tail.resync_reason) == (["1", "2"], True, "no watermark")
+    assert tail.watermark["last_job_id"] == "2"
+
+    with open(path, "ab") as f:
+        f.write(b"3,c\r\n4,d")  # the bot is mid-write on row 4
+    tail, rows = read(path, tail.watermark)
+    assert (rows, tail.full) == (["3"], False)
+    assert tail.watermark["last_job_id"] == "3"
+
+    with open(path, "ab") as f:
+        f.write(b"\r\n")
+    tail, rows = read(path, tail.watermark)
+    assert rows == ["4"]
+    tail, rows = read(path, tail.watermark)
+    assert (rows, tail.full, tail.watermark["last_job_id"]) == ([], False, "4")
+
+
+def test_rotated_file_is_read_in_full(tmp_path):
+    path = tmp_path / "applied.csv"
+    path.write_bytes(HEADER + b"1,a\r\n")
+    tail, _ = read(path)
+    rotated = tmp_path / "applied.new"
+    rotated.write_bytes(HEADER + b"1,a\r\n2,b\r\n")
+    os.replace(rotated, path)
+    tail, rows = read(path, tail.watermark)
+    assert (rows, tail.resync_reason) == (["1", "2"], "file rotated")
+
+
+def test_truncated_or_rewritten_file_is_read_in_full(tmp_path):
+    path = tmp_path / "applied.csv"
+    path.write_bytes(HEADER + b"1,a\r\n2,b\r\n")
+    first, _ = read(path)
+
+    with open(path, "r+b") as f:
+        f.truncate(len(HEADER) + 5)
+    tail, rows = read(path, first.watermark)
+    assert (rows, tail.resync_reason) == (["1"], "file truncated")
+
+    with open(path, "r+b") as f:
+        f.truncate(0)
+        f.write(HEADER + b"9,a\r\n8,b\r\n")
+    tail, rows = read(path, first.watermark)
+    assert (rows, tail.resync_reason) == (["9", "8"], "file rewritten")
+
+
+def test_force_full_and_unread_tail_closes_file(tmp_path):
+    path = tmp_path / "applied.csv"
+    path.write_bytes(HEADER + b"1,a\r\n")
+    first, _ = read(path)
+    tail, rows = read(path, first.watermark, force_full=True)
+    assert (rows, tail.resync_reason) == (["1"], "requested")
+    with CsvTail(str(path), first.watermark) as tail:
+        pass  # rows() never iterated
+    assert tail._f.closed
+
+
+def test_sync_state_store_round_trip(tmp_path):
+    store = SyncStateStore(str(tmp_path / "sync_state.json"))
+    assert store.get("u1", "a.csv") == {}
+    store.set("u1", "a.csv", {"offset": 10})
+    store.set("u2", "a.csv", {"offset": 20})
+    assert store.get("u1", "a.csv") == {"offset": 10}
+    assert len(json.loads((tmp_path / "sync_state.json").read_text())) == 2
+    assert os.listdir(tmp_path) == ["sync_state.json"]
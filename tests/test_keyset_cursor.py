@@ -0,0 +1,69 @@
+import pytest
+
+from applied_index import AppliedJobsIndex, decode_cursor, encode_cursor, parse_query
+from job_history import HISTORIES
+from storage_sqlite import SQLiteStorage
+
+
+def test_cursor_round_trip_is_url_safe():
+    data = {"c": "2026-10-01T10:00:00+00:00", "i": 42, "a": {"c": "x/y+z", "i": 1}}
+    cursor = encode_cursor(data)
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+    assert decode_cursor(cursor) == data
+
+
+# Not base64, truncated JSON ('{"c'), and JSON that is not an object ('[]')
+@pytest.mark.parametrize("cursor", ["not base64!", "eyJj", "W10"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_parse_query_bounds():
+    assert parse_query({"limit": "0"})["limit"] == 1
+    assert parse_query({"limit": "100000"})["limit"] == parse_query({"limit": "100000000"})["limit"]
+    with pytest.raises(ValueError):
+        parse_query({"limit": "ten"})
+    with pytest.raises(ValueError):
+        parse_query({"date_to": "10/01/2026"})
+    with pytest.raises(ValueError):
+        parse_query({"cursor": "!!"})
+    assert parse_query({"date_from": "2026-10-01T12:00:00"})["date_from"] == "2026-10-01"
+
+
+def pages(fetch, limit):
+    """Follow next_cursor until the end; returns the pages of Job_IDs."""
+    out, cursor = [], None
+    while True:
+        page = fetch(limit, cursor)
+        out.append([job["Job_ID"] for job in page["jobs"]])
+        if page["next_cursor"] is None:
+            return out
+        cursor = decode_cursor(page["next_cursor"])
+
+
+@pytest.mark.parametrize("limit, expected", [
+    (2, [["5", "4"], ["3", "2"], ["1"]]),
+    (5, [["5", "4", "3", "2", "1"]]),
+    (6, [["5", "4", "3", "2", "1"]]),
+])
+def test_local_index_pages_have_no_gaps_or_repeats(limit, expected):
+    index = AppliedJobsIndex([{"Job_ID": str(i), "Title": "t", "Company": "c"} for i in range(1, 6)])
+    assert pages(lambda n, cursor: index.query(n, cursor), limit) == expected
+
+
+def test_sqlite_keyset_pages_break_created_at_ties_by_id(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "jobs.db"))
+    # One upsert: every row gets the same created_at, so the id decides the order
+    records = [HISTORIES["applied"].to_record("u1", {"Job ID": str(i), "Title": "t", "Company": "c",
+                                                      "Date Applied": "2026-10-01 10:00:00"}) for i in range(1, 6)]
+    storage.upsert_history("u1", "applied", records)
+    base = parse_query({})
+
+    def fetch(limit, cursor):
+        return storage.history_page("u1", {**base, "limit": limit, "cursor": cursor})
+
+    assert pages(fetch, 2) == [["5", "4"], ["3", "2"], ["1"]]
+    assert pages(fetch, 5) == [["5", "4", "3", "2", "1"]]
+    with pytest.raises(ValueError):
+        fetch(2, {"c": "2026-10-01"})
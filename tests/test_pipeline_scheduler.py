@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from pipeline_scheduler import PipelineScheduler
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    ref = tmp_path / "ref"
+    (ref / "config").mkdir(parents=True)
+    (ref / "runAiBot.py").write_text("import time\ntime.sleep(30)\n")
+    return PipelineScheduler(str(ref), str(tmp_path / "workdirs"), max_concurrent=1, warm_start=False)
+
+
+def blocking_prepare(scheduler, monkeypatch):
+    """Hold prepare_workdir until released; reports whether the scheduler lock was free meanwhile."""
+    entered, release, lock_free = threading.Event(), threading.Event(), []
+    prepare = scheduler.prepare_workdir
+
+    def prepare_workdir(user_id):
+        def probe():
+            if scheduler._lock.acquire(timeout=2):
+                scheduler._lock.release()
+                lock_free.append(True)
+
+        t = threading.Thread(target=probe)
+        t.start()
+        t.join()
+        entered.set()
+        release.wait(5)
+        return prepare(user_id)
+
+    monkeypatch.setattr(scheduler, "prepare_workdir", prepare_workdir)
+    return entered, release, lock_free
+
+
+def test_launch_io_runs_outside_the_lock_with_the_slot_reserved(scheduler, monkeypatch):
+    entered, release, lock_free = blocking_prepare(scheduler, monkeypatch)
+    starter = threading.Thread(target=scheduler.start, args=("ua", {}))
+    starter.start()
+    assert entered.wait(5)
+    assert lock_free == [True]
+    # The slot is taken while ua launches: ub queues and ua cannot start twice
+    assert scheduler.running_count() == 1
+    assert scheduler.start("ub", {})["state"] == "queued"
+    with pytest.raises(RuntimeError):
+        scheduler.start("ua", {})
+    release.set()
+    starter.join(5)
+    assert scheduler.status("ua")["state"] == "running"
+    assert scheduler.stop("ub") and scheduler.stop("ua")
+
+
+def test_stop_during_launch_stops_the_bot_once_published(scheduler, monkeypatch):
+    entered, release, _ = blocking_prepare(scheduler, monkeypatch)
+    starter = threading.Thread(target=scheduler.start, args=("ua", {}))
+    starter.start()
+    assert entered.wait(5)
+    assert scheduler.stop("ua")
+    release.set()
+    starter.join(10)
+    deadline = time.monotonic() + 10
+    snapshot = scheduler.status("ua")
+    while snapshot["state"] != "stopped" and time.monotonic() < deadline:
+        snapshot = scheduler.state("ua").wait(snapshot["version"], 1)
+    assert snapshot["state"] == "stopped"
+    assert scheduler.running_count() == 0
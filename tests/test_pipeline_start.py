@@ -0,0 +1,47 @@
+import pytest
+
+from config_store import ConfigConflict
+
+
+class FakeScheduler:
+    """Records what start() saw in storage at launch time instead of running the bot."""
+
+    def __init__(self, web, user_id):
+        self.web = web
+        self.user_id = user_id
+        self.stored_at_start = None
+
+    def start(self, owner, config):
+        self.stored_at_start = self.web.get_storage().fetch_config(self.user_id)[0]
+        return {"state": "running", "pid": 1, "config_changed": []}
+
+
+@pytest.mark.parametrize("signed_in", [True, False])
+def test_start_flushes_buffered_config(web, auth_headers, monkeypatch, signed_in):
+    headers, user_id = (auth_headers, "u1") if signed_in else ({}, web.LOCAL_USER)
+    scheduler = FakeScheduler(web, user_id)
+    monkeypatch.setattr(web, "_scheduler", scheduler)
+    client = web.app.test_client()
+
+    r = client.put("/api/config", headers=headers, json={"personals": {"first_name": "Ada"}})
+    assert r.status_code == 200
+    assert web.get_storage().fetch_config(user_id)[0] is None  # still buffered
+
+    # The dashboard always sends the form's config with the start request
+    r = client.post("/api/pipeline/start", headers=headers, json={"config": {"personals": {"first_name": "Ada"}}})
+    assert r.status_code == 200
+    assert scheduler.stored_at_start["personals"]["first_name"] == "Ada"
+    assert web._config_writes.pending(user_id) is None
+
+
+def test_start_refused_when_flush_conflicts(web, monkeypatch):
+    monkeypatch.setattr(web, "_scheduler", FakeScheduler(web, web.LOCAL_USER))
+    client = web.app.test_client()
+    client.put("/api/config", json={"personals": {"first_name": "Ada"}})
+
+    def conflict(*args):
+        raise ConfigConflict()
+    monkeypatch.setattr(web._config_writes, "store", conflict)
+    r = client.post("/api/pipeline/start", json={"config": {}})
+    assert r.status_code == 409
+    assert web._scheduler.stored_at_start is None
@@ -0,0 +1,15 @@
+import supabase_client
+
+
+def test_latency_buckets_are_stored_per_bucket_and_reported_cumulatively(monkeypatch):
+    monkeypatch.setattr(supabase_client, "_op_metrics", {})
+    for seconds in (0.005, 0.02, 0.02, 3.0, 60.0):
+        supabase_client._record("applied_jobs.select", seconds, error=False)
+    assert sum(supabase_client._op_metrics["applied_jobs.select"]["buckets"]) == 4
+    op = supabase_client.get_supabase_metrics()["operations"]["applied_jobs.select"]
+    assert op["count"] == 5
+    assert op["buckets"]["0.01"] == 1
+    assert op["buckets"]["0.025"] == 3
+    assert op["buckets"]["2.5"] == 3
+    assert op["buckets"]["5.0"] == 4
+    assert op["buckets"]["10.0"] == 4
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+
+import pytest
+
+from aio import BackgroundJobs, JobBusy
+
+
+@pytest.fixture
+def gate():
+    return threading.Event()
+
+
+def blocked_until(gate, result):
+    async def run():
+        while not gate.is_set():
+            await asyncio.sleep(0.01)
+        return result
+    return run
+
+
+def test_running_job_is_joined(gate):
+    jobs = BackgroundJobs()
+    first = jobs.start("k", blocked_until(gate, 1))
+    assert jobs.start("k", blocked_until(gate, 2))["id"] == first["id"]
+    gate.set()
+    assert jobs.wait("k", 5)["result"] == 1
+
+
+def test_running_job_that_cannot_serve_the_request_raises(gate):
+    jobs = BackgroundJobs()
+    jobs.start("k", blocked_until(gate, "incremental"), {"full": False})
+    with pytest.raises(JobBusy) as e:
+        jobs.start("k", blocked_until(gate, "full"), {"full": True}, joins=lambda running: running["full"])
+    assert e.value.job["full"] is False
+    gate.set()
+    assert jobs.wait("k", 5)["result"] == "incremental"
+    # Once it has finished, the full run starts
+    assert jobs.start("k", blocked_until(gate, "full"), {"full": True}, joins=lambda running: running["full"])["full"]
+    assert jobs.wait("k", 5)["result"] == "full"
+
+
+def test_full_sync_is_not_joined_to_a_running_incremental_one(web, tmp_path, monkeypatch, gate):
+    csv_path = tmp_path / "applied.csv"
+    csv_path.write_text("Job ID,Title\n1,t\n", encoding="utf-8")
+    monkeypatch.setattr(web, "APPLIED_CSV", str(csv_path))
+    monkeypatch.setattr(web, "FAILED_CSV", str(tmp_path / "missing.csv"))
+    monkeypatch.setattr(web, "_sync_jobs", BackgroundJobs())
+    calls = []
+
+    async def sync_all(storage, user_id, paths, force_full):
+        calls.append(force_full)
+        await blocked_until(gate, None)()
+        return 200, {"full_resync": force_full}
+    monkeypatch.setattr(web, "_sync_all", sync_all)
+    client = web.app.test_client()
+
+    assert client.post("/api/applied-jobs/sync?wait=0").status_code == 202
+    r = client.post("/api/applied-jobs/sync?full=1&wait=0")
+    assert r.status_code == 409
+    # An incremental request still joins the running sync
+    assert client.post("/api/applied-jobs/sync?wait=0").status_code == 202
+    gate.set()
+    assert web._sync_jobs.wait(("sync", web.LOCAL_USER), 5)["state"] == "done"
+    assert client.post("/api/applied-jobs/sync?full=1").json["full_resync"] is True
+    assert calls == [False, True]